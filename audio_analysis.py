@@ -0,0 +1,96 @@
+"""Audio helpers shared by the take analyses (pronunciation and intonation).
+
+Both work on 16 kHz mono int16 audio cut into 10 ms frames. The original
+audio's per-frame values are computed once per project for the whole track
+and saved next to the video as a ``.npy`` file; ``ReferenceTrack`` memory-maps
+it and slices it by time, so it stays valid after a re-split.
+"""
+
+import os
+import subprocess
+
+import numpy as np
+
+ANALYSIS_RATE = 16000
+HOP = 160  # 10 ms
+FRAMES_PER_SECOND = ANALYSIS_RATE // HOP
+MIN_LEVEL_DB = -45.0  # 10 ms of audio quieter than this (dBFS) counts as silence
+
+
+def resample(samples, from_rate, to_rate):
+    """Polyphase resampling of int16 ``samples`` (anti-aliased when downsampling)."""
+    if from_rate == to_rate:
+        return samples
+    from scipy.signal import resample_poly
+
+    g = np.gcd(int(from_rate), int(to_rate))
+    out = resample_poly(samples.astype(np.float32), to_rate // g, from_rate // g)
+    return np.clip(out, -32768, 32767).astype(np.int16)
+
+
+def load_media_audio(path, samplerate=ANALYSIS_RATE):
+    """Decode the audio track of ``path`` to mono int16 at ``samplerate`` with ffmpeg."""
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-nostdin",
+            "-loglevel",
+            "error",
+            "-i",
+            path,
+            "-vn",
+            "-ac",
+            "1",
+            "-ar",
+            str(samplerate),
+            "-f",
+            "s16le",
+            "-",
+        ],
+        capture_output=True,
+        check=True,
+    )
+    return np.frombuffer(result.stdout, dtype=np.int16)
+
+
+class ReferenceTrack:
+    """Per-frame values of a project's whole audio track, looked up by time.
+
+    Subclasses name their ``FILE`` and how ``compute`` turns the track's
+    16 kHz samples into one row per 10 ms frame.
+    """
+
+    FILE = None
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    @staticmethod
+    def compute(samples):
+        raise NotImplementedError
+
+    @classmethod
+    def path(cls, project_folder):
+        return os.path.join(project_folder, cls.FILE)
+
+    @classmethod
+    def load(cls, project_folder):
+        """Memory-map the project's array; None if it hasn't been computed."""
+        try:
+            return cls(np.load(cls.path(project_folder), mmap_mode="r"))
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def build(cls, project_folder, samples):
+        """Compute and save the array of a project's 16 kHz audio track."""
+        path = cls.path(project_folder)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, cls.compute(samples))
+        os.replace(tmp_path, path)
+        return cls.load(project_folder)
+
+    def span(self, start_ms, end_ms):
+        """The frames between two times of the track."""
+        return self.frames[start_ms * FRAMES_PER_SECOND // 1000 : end_ms * FRAMES_PER_SECOND // 1000]
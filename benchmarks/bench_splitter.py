@@ -0,0 +1,163 @@
+"""Benchmark the subtitle splitter on synthetic multi-hour word streams.
+
+    python benchmarks/bench_splitter.py --hours 1 10
+
+For each transcript length it reports words/sec and peak traced memory for:
+  - legacy:  the original string-concatenating split_subtitles (reference)
+  - batch:   split_subtitles(word_dict) on the engine (dict must be built first)
+  - table:   split_subtitles(WordTable) on the columnar word store
+  - stream:  iter_subtitles over a word generator (nothing materialized)
+and checks that legacy and engine output are identical. Timings are taken
+under tracemalloc, which penalises paths that allocate per word.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from get_video_and_srt import WordTable, iter_subtitles, split_subtitles  # noqa: E402
+
+WORDS_PER_SECOND = 2.5  # ~150 wpm of speech
+VOCAB = ["the", "shadow", "practice", "listen", "speak", "video", "word", "again"]
+
+
+def legacy_split_subtitles(word_dict, max_words=15):
+    subtitles = []
+    current_sentence = ""
+    sentence_start = None
+    last_end = None
+    for (start, end), word in sorted(word_dict.items()):
+        if sentence_start is None:
+            sentence_start = start
+        current_sentence += " " + word
+        last_end = end
+        strong_punct = r"[.?!]$"
+        soft_punct = r"[,;:]$"
+        words_count = len(current_sentence.split())
+        end_sentence = False
+        if re.search(strong_punct, word) and words_count >= 3:
+            end_sentence = True
+        elif re.search(soft_punct, word) and words_count >= max_words:
+            end_sentence = True
+        if end_sentence:
+            subtitles.append(
+                {"start": sentence_start, "end": last_end, "text": current_sentence.strip()}
+            )
+            current_sentence = ""
+            sentence_start = None
+    if current_sentence:
+        subtitles.append(
+            {"start": sentence_start, "end": last_end, "text": current_sentence.strip()}
+        )
+    return subtitles
+
+
+def synthetic_words(hours, seed=0, sentence_words=(4, 30), run_on_every=0):
+    """Yield ``(start, end, word)`` for ``hours`` of speech.
+
+    ``run_on_every`` > 0 makes every n-th sentence a long unpunctuated run,
+    the worst case for the legacy splitter.
+    """
+    rng = random.Random(seed)
+    n_words = int(hours * 3600 * WORDS_PER_SECOND)
+    t = 0.0
+    emitted = 0
+    sentence = 0
+    while emitted < n_words:
+        sentence += 1
+        length = rng.randint(*sentence_words)
+        if run_on_every and sentence % run_on_every == 0:
+            length *= 100
+        for i in range(min(length, n_words - emitted)):
+            word = rng.choice(VOCAB)
+            if i == length - 1:
+                word += rng.choice(".?!")
+            elif rng.random() < 0.08:
+                word += rng.choice(",;:")
+            duration = rng.uniform(0.15, 0.6)
+            yield round(t, 3), round(t + duration, 3), word
+            t += duration + 0.05
+            emitted += 1
+
+
+def measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def count_stream(hours, max_words, **kwargs):
+    return sum(1 for _ in iter_subtitles(synthetic_words(hours, **kwargs), max_words))
+
+
+def run(hours, max_words, skip_legacy, **kwargs):
+    word_dict = {(s, e): w for s, e, w in synthetic_words(hours, **kwargs)}
+    n_words = len(word_dict)
+    rows = []
+    if not skip_legacy:
+        legacy, elapsed, peak = measure(lambda: legacy_split_subtitles(word_dict, max_words))
+        rows.append(("legacy", elapsed, peak))
+    batch, elapsed, peak = measure(lambda: split_subtitles(word_dict, max_words))
+    rows.append(("batch", elapsed, peak))
+    if not skip_legacy and legacy != batch:
+        raise AssertionError("engine output differs from the legacy splitter")
+    dict_bytes = sys.getsizeof(word_dict) + sum(
+        sys.getsizeof(key) + sum(map(sys.getsizeof, key)) + sys.getsizeof(word)
+        for key, word in word_dict.items()
+    )
+    starts, ends, words = zip(*((s, e, w) for (s, e), w in sorted(word_dict.items())))
+    del word_dict
+    table = WordTable.from_rows(starts, ends, words)
+    del starts, ends, words
+    table_bytes = sum(getattr(table, name).nbytes for name in WordTable.COLUMNS)
+    tabled, elapsed, peak = measure(lambda: split_subtitles(table, max_words))
+    rows.append(("table", elapsed, peak))
+    if [sub["text"] for sub in tabled] != [sub["text"] for sub in batch]:
+        raise AssertionError("WordTable output differs from batch")
+    del table
+    streamed, elapsed, peak = measure(lambda: count_stream(hours, max_words, **kwargs))
+    rows.append(("stream*", elapsed, peak))
+    if streamed != len(batch):
+        raise AssertionError("streamed subtitle count differs from batch")
+
+    label = f"{hours:g} h, {n_words:,} words, {len(batch):,} subtitles"
+    if kwargs.get("run_on_every"):
+        label += " (run-on sentences)"
+    print(label)
+    for name, elapsed, peak in rows:
+        print(
+            f"  {name:<8} {n_words / elapsed:>12,.0f} words/s "
+            f"{elapsed:>8.3f} s  peak {peak / 1024**2:>8.1f} MB"
+        )
+    print(
+        f"  storage: dict {dict_bytes / 1024**2:.1f} MB, "
+        f"WordTable {table_bytes / 1024**2:.1f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 10])
+    parser.add_argument("--max_words", type=int, default=15)
+    parser.add_argument(
+        "--skip_legacy", action="store_true", help="Only time the new engine"
+    )
+    args = parser.parse_args()
+    print("(* stream timing includes generating the synthetic words)")
+    for hours in args.hours:
+        run(hours, args.max_words, args.skip_legacy)
+    run(min(args.hours), args.max_words, args.skip_legacy, run_on_every=50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark what the GUI pays at startup for importing the transcription backend.
+
+    python benchmarks/bench_startup.py --runs 5
+
+Each run imports get_video_and_srt in a fresh interpreter and reports the
+median import time and which heavy modules (whisper, torch, yt_dlp) ended up
+loaded. ``eager`` additionally imports whisper and yt_dlp the way the module
+used to at import time, i.e. the time-to-window cost before lazy imports.
+The GUI itself logs "🚀 Window ready in ..." on every start.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+if {eager}:
+    import whisper, yt_dlp
+import get_video_and_srt
+print(json.dumps({{
+    "seconds": time.perf_counter() - started,
+    "loaded": [m for m in ("whisper", "torch", "yt_dlp") if m in sys.modules],
+}}))
+"""
+
+
+def time_import(eager):
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(eager=eager)],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, eager in [("lazy", False), ("eager", True)]:
+        try:
+            results = [time_import(eager) for _ in range(args.runs)]
+        except subprocess.CalledProcessError as e:
+            print(f"{label:>5}: failed ({e.stderr.strip().splitlines()[-1]})")
+            continue
+        median = statistics.median(r["seconds"] for r in results)
+        loaded = ", ".join(results[-1]["loaded"]) or "none"
+        print(f"{label:>5}: {median * 1000:8.1f} ms  heavy modules loaded: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
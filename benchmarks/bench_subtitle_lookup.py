@@ -0,0 +1,87 @@
+"""Benchmark "which subtitle is active at t" on long subtitle files.
+
+    python benchmarks/bench_subtitle_lookup.py --subtitles 3000 10000
+
+For each size it times, per lookup at random playback positions:
+  - linear: the old sync_with_video scan over every pysrt item
+  - index:  SubtitleIndex.active_at (bisect over sorted start/end arrays)
+plus the one-off cost of building the index, and checks that both agree.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pysrt  # noqa: E402
+
+from subtitle_index import SubtitleIndex, SubtitleTrack  # noqa: E402
+
+
+def synthetic_subtitles(count, seed=0):
+    """``count`` back-to-back subtitles of 1-6 s with small gaps, as pysrt items."""
+    rng = random.Random(seed)
+    subtitles = pysrt.SubRipFile()
+    t = 0
+    for i in range(count):
+        start = t + rng.randint(0, 400)
+        end = start + rng.randint(1000, 6000)
+        subtitles.append(
+            pysrt.SubRipItem(
+                i + 1,
+                pysrt.SubRipTime.from_ordinal(start),
+                pysrt.SubRipTime.from_ordinal(end),
+                f"line {i}",
+            )
+        )
+        t = end
+    return subtitles
+
+
+def linear_lookup(subtitles, ms):
+    for i, sub in enumerate(subtitles):
+        if sub.start.ordinal <= ms < sub.end.ordinal:
+            return i
+    return -1
+
+
+def per_call_us(func, positions):
+    started = time.perf_counter()
+    results = [func(ms) for ms in positions]
+    return (time.perf_counter() - started) / len(positions) * 1e6, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subtitles", type=int, nargs="+", default=[3000, 10000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    for count in args.subtitles:
+        subtitles = synthetic_subtitles(count)
+        rng = random.Random(1)
+        last_end = subtitles[-1].end.ordinal
+        positions = [rng.randint(0, last_end + 1000) for _ in range(args.lookups)]
+
+        track = SubtitleTrack.from_rows(
+            [(sub.start.ordinal, sub.end.ordinal, sub.text) for sub in subtitles]
+        )
+        started = time.perf_counter()
+        index = SubtitleIndex.from_track(track)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        linear_us, expected = per_call_us(lambda ms: linear_lookup(subtitles, ms), positions)
+        index_us, actual = per_call_us(index.active_at, positions)
+        print(
+            f"{count:>6} subtitles: linear {linear_us:9.1f} us/lookup | "
+            f"index {index_us:6.2f} us/lookup (build {build_ms:.1f} ms) | "
+            f"speedup x{linear_us / index_us:,.0f} | "
+            f"{'match' if actual == expected else 'MISMATCH'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
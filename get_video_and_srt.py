@@ -14,9 +14,23 @@ if getattr(sys, "frozen", False):
 
 import os
 import re
-import yt_dlp
+import json
+import time
+import queue
+import types
+import importlib
+import multiprocessing
+import hashlib
+import threading
+import shutil
+import tempfile
 import traceback
-import whisper
+import numpy as np
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+from subtitle_index import SubtitleTrack
 
 
 # === Handle PyInstaller Frozen Mode ===
@@ -39,226 +53,1522 @@ os.environ["WHISPER_ASSETS_DIR"] = os.path.join(exe_dir, "whisper", "assets")
 VIDEO_FORMAT = "mp4"
 AUDIO_FORMAT = "m4a"
 
+# How Whisper gets its audio:
+#   pcm      - decode 16 kHz mono PCM from video.mp4 straight into memory (default)
+#   download - legacy second yt-dlp fetch + 128k m4a re-encode
+INGEST_MODES = ("pcm", "download")
+
+# Parallel (CPU) transcription: audio is cut into overlapping windows and each
+# overlap is split down the middle, so every word is owned by exactly one window.
+SAMPLE_RATE = 16000  # whisper.audio.SAMPLE_RATE
+WINDOW_SECONDS = 600
+WINDOW_OVERLAP_SECONDS = 10
+FIRST_WINDOW_SECONDS = 30  # short first window -> first subtitles within seconds
+
+# Present in a project folder while subtitle.srt is still growing
+TRANSCRIBING_MARKER = ".transcribing"
+
+# Word-level timestamps kept next to subtitle.srt so max_words can be changed later
+WORDS_FILE = "words.npz"
+
+# Finished pipeline stages are recorded in each project's manifest.json, and the
+# words of every finished transcription window in .checkpoint/, so a rerun
+# resumes where the last attempt stopped.
+MANIFEST_FILE = "manifest.json"
+CHECKPOINT_DIR = ".checkpoint"
+PIPELINE_STAGES = ("info", "video", "audio", "transcription", "splitting", "srt")
+
+# Resolved yt-dlp info dicts are cached per video ID under <output_folder>/.cache/info.
+# YouTube signs format URLs for ~6 h, so older entries are resolved again.
+INFO_CACHE_TTL = 5 * 3600
+
+# Memory budget (GB) for warm Whisper models kept between runs
+MODEL_POOL_BUDGET_GB = float(os.environ.get("WHISPER_POOL_BUDGET_GB", "8"))
+
+# Disk budget (MB) for finished transcripts cached under <output_folder>/.cache/transcripts,
+# keyed by the decoded audio + model + decode options (0 disables the cache)
+TRANSCRIPT_CACHE_BUDGET_MB = float(os.environ.get("TRANSCRIPT_CACHE_BUDGET_MB", "512"))
+
+
+# === Progress events ===
+# stage:     "info", "download", "audio", "model", "transcribe", "subtitles" or "done"
+# processed: work done so far in ``unit`` ("s" of audio or "B" downloaded)
+# rtf:       wall-clock seconds per second of audio (transcribe stage only)
+# eta:       estimated seconds left in this stage, or None
+ProgressEvent = namedtuple(
+    "ProgressEvent", ["stage", "processed", "total", "unit", "rtf", "eta"]
+)
 
-# === Real-time logger ===
-class StreamLogger:
-    def __init__(self, write_callback=None, total_duration=0):
-        self.write_callback = write_callback or (
-            lambda x: sys.__stdout__.write(x + "\n")
-        )
-        self.total_duration = total_duration
 
-    def _format_time(self, seconds: float) -> str:
-        h = int(seconds // 3600)
-        m = int((seconds % 3600) // 60)
-        s = int(seconds % 60)
-        return f"{h:02}:{m:02}:{s:02}"
+def format_hms(seconds):
+    h = int(seconds // 3600)
+    m = int((seconds % 3600) // 60)
+    s = int(seconds % 60)
+    return f"{h:02}:{m:02}:{s:02}"
 
-    def write(self, text):
-        if not text.strip():
+
+STAGE_LABELS = {
+    "info": "🔎 Resolving video",
+    "download": "📥 Downloading",
+    "audio": "🔊 Extracting audio",
+    "model": "🧠 Loading model",
+    "transcribe": "📄 Transcribing",
+    "subtitles": "✂️ Writing subtitles",
+    "done": "✅ Done",
+}
+
+
+def format_progress(event):
+    """One-line human-readable rendering of a ProgressEvent."""
+    label = STAGE_LABELS.get(event.stage, event.stage)
+    if not event.total:
+        return label
+    if event.unit == "B":
+        done = f"{event.processed / 1024**2:.1f} / {event.total / 1024**2:.1f} MB"
+    else:
+        done = f"{format_hms(event.processed)} / {format_hms(event.total)}"
+    text = f"{label}: {done} ({event.processed / event.total * 100:.1f}%)"
+    if event.rtf is not None:
+        text += f"  RTF {event.rtf:.2f}"
+    if event.eta is not None:
+        text += f"  ETA {format_hms(event.eta)}"
+    return text
+
+
+class ProgressReporter:
+    """Turn raw progress updates into ProgressEvents for ``callback``.
+
+    Within a stage, events are sent at most once per ``min_interval`` seconds.
+    Stage changes and completed stages are always sent.
+    """
+
+    def __init__(self, callback=None, min_interval=0.5):
+        self.callback = callback
+        self.min_interval = min_interval
+        self.stage = None
+        self._stage_started = 0.0
+        self._last_sent = 0.0
+
+    def __call__(self, stage, processed=0, total=0, unit="s"):
+        if not self.callback:
             return
-        text = text.strip()
-        if self.total_duration and text.startswith("[") and "-->" in text:
-            match = re.search(r"-->\s*(\d+:\d+\.\d+|\d+:\d+:\d+\.\d+)", text)
-            if match:
-                ts = match.group(1)
-                ts_parts = ts.split(":")
-                if len(ts_parts) == 3:
-                    h, m, s = ts_parts
-                    end_sec = int(h) * 3600 + int(m) * 60 + float(s)
-                elif len(ts_parts) == 2:
-                    m, s = ts_parts
-                    end_sec = int(m) * 60 + float(s)
-                else:
-                    end_sec = float(ts_parts[0])
-                progress = min(end_sec, self.total_duration)
-                percent = progress / self.total_duration * 100
-                progress_msg = (
-                    f"⏳ {self._format_time(progress)} / {self._format_time(self.total_duration)} "
-                    f"({percent:.1f}%)"
-                )
-                try:
-                    self.write_callback(progress_msg)
-                except Exception:
-                    sys.__stdout__.write("❌ Logging failed.\n")
-        try:
-            self.write_callback(text)
-        except Exception:
-            sys.__stdout__.write("❌ Logging failed.\n")
+        now = time.perf_counter()
+        if stage != self.stage:
+            self.stage = stage
+            self._stage_started = now
+        elif now - self._last_sent < self.min_interval and (not total or processed < total):
+            # With an unknown total (0), only stage changes bypass the throttle
+            return
+        self._last_sent = now
 
-    def flush(self):
+        elapsed = now - self._stage_started
+        rtf = eta = None
+        if processed > 0 and elapsed > 0:
+            if stage == "transcribe":
+                rtf = elapsed / processed
+            if total:
+                eta = max(total - processed, 0) * elapsed / processed
+        self.callback(ProgressEvent(stage, processed, total, unit, rtf, eta))
+
+    def ydl_hook(self, d):
+        """yt-dlp ``progress_hooks`` adapter for the download stage."""
+        if d.get("status") in ("downloading", "finished"):
+            total = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
+            self("download", d.get("downloaded_bytes") or 0, total, unit="B")
+
+
+# === Whisper progress ===
+WHISPER_FRAMES_PER_SECOND = 100  # whisper.audio.FRAMES_PER_SECOND: 10 ms mel frames
+
+_whisper_progress = threading.local()
+
+
+class _WhisperProgressBar:
+    """Stands in for the tqdm bar ``whisper.transcribe`` advances after every
+    30 s segment (it does so even with ``verbose=None``, when nothing is drawn)."""
+
+    def __init__(self, total=None, **kwargs):
+        self.callback = getattr(_whisper_progress, "callback", None)
+        self.seconds = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def update(self, n=1):
+        self.seconds += n / WHISPER_FRAMES_PER_SECOND
+        if self.callback:
+            self.callback(self.seconds)
+
+    def close(self):
         pass
 
 
+@contextmanager
+def whisper_progress(callback):
+    """Call ``callback(seconds)`` with how far Whisper has got into the audio,
+    for ``model.transcribe`` calls made by this thread inside the block."""
+    try:
+        module = importlib.import_module("whisper.transcribe")
+        module.tqdm = types.SimpleNamespace(tqdm=_WhisperProgressBar)
+    except ImportError:
+        pass  # A whisper build without the module: only start/end are reported
+    _whisper_progress.callback = callback
+    try:
+        yield
+    finally:
+        _whisper_progress.callback = None
+
+
+# === Whisper model pool ===
+class ModelPool:
+    """Keep loaded Whisper models warm across runs, keyed by (model_size, device).
+
+    When the summed weight size exceeds the budget, the least-recently-used
+    models are dropped. The model that was just requested is never evicted.
+    """
+
+    def __init__(self, budget_gb=MODEL_POOL_BUDGET_GB):
+        self.budget_bytes = int(budget_gb * 1024**3)
+        self._models = OrderedDict()  # (model_size, device) -> (model, lock, nbytes)
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def default_device():
+        import torch
+
+        return "cuda" if torch.cuda.is_available() else "cpu"
+
+    @staticmethod
+    def _model_bytes(model):
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+
+    def set_budget(self, budget_gb):
+        with self._lock:
+            self.budget_bytes = int(budget_gb * 1024**3)
+            self._evict(keep=None)
+
+    def get(self, model_size, device=None, log=None):
+        """Return ``(model, lock)``; hold ``lock`` while transcribing with ``model``."""
+        key = (model_size, device or self.default_device())
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.hits += 1
+                if log:
+                    log(f"♻️ Reusing warm Whisper model ({model_size}, {key[1]})")
+                model, lock, _ = self._models[key]
+                return model, lock
+
+            if log:
+                log(f"🧠 Loading Whisper model ({model_size}, {key[1]})...")
+            import whisper
+
+            model = whisper.load_model(model_size, device=key[1])
+            self.loads += 1
+            entry = (model, threading.Lock(), self._model_bytes(model))
+            self._models[key] = entry
+            self._evict(keep=key, log=log)
+            return entry[0], entry[1]
+
+    def _evict(self, keep, log=None):
+        freed_cuda = False
+        while self._resident_bytes() > self.budget_bytes:
+            victim = next((k for k in self._models if k != keep), None)
+            if victim is None:
+                break
+            # In-flight runs keep their own reference; we only drop the warm copy.
+            del self._models[victim]
+            self.evictions += 1
+            freed_cuda = freed_cuda or victim[1].startswith("cuda")
+            if log:
+                log(f"🧹 Evicted Whisper model ({victim[0]}, {victim[1]}) from pool")
+        if freed_cuda:
+            import torch
+
+            torch.cuda.empty_cache()
+
+    def _resident_bytes(self):
+        return sum(nbytes for _, _, nbytes in self._models.values())
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loads": self.loads,
+                "hits": self.hits,
+                "evictions": self.evictions,
+                "resident": [f"{size}@{device}" for size, device in self._models],
+                "resident_gb": round(self._resident_bytes() / 1024**3, 2),
+                "budget_gb": round(self.budget_bytes / 1024**3, 2),
+            }
+
+    def format_stats(self):
+        st = self.stats()
+        return (
+            f"🧠 Model pool: loads={st['loads']} hits={st['hits']} "
+            f"evictions={st['evictions']} resident={st['resident_gb']}/{st['budget_gb']} GB "
+            f"[{', '.join(st['resident']) or 'empty'}]"
+        )
+
+
+MODEL_POOL = ModelPool()
+
+
 # === Subtitle-splitting logic ===
-def split_subtitles(word_dict, max_words=15):
-    """Split recognized words into subtitle segments.
+_STRONG_PUNCT = re.compile(r"[.?!]$")
+_SOFT_PUNCT = re.compile(r"[,;:]$")
+
+
+class SubtitleSplitter:
+    """Incremental subtitle splitter: feed words in time order, get subtitles out.
 
     Logic:
-      - Always split at strong punctuation (. ? !)
-      - Optionally split at soft punctuation (, ; :) if sentence is long enough
+      - Always split at strong punctuation (. ? !) once the sentence has 3+ words
+      - Split at soft punctuation (, ; :) only if the sentence has max_words+ words
       - Never split by word count alone (no punctuation → no split)
+
+    Only the open sentence is buffered and its word count is kept as a running
+    total, so each word costs O(1).
     """
-    subtitles = []
-    current_sentence = ""
-    sentence_start = None
-    last_end = None
-
-    for (start, end), word in sorted(word_dict.items()):
-        if sentence_start is None:
-            sentence_start = start
-        current_sentence += " " + word
-        last_end = end
-
-        # === punctuation rules ===
-        strong_punct = r"[.?!]$"
-        soft_punct = r"[,;:]$"
-        words_count = len(current_sentence.split())
-        end_sentence = False
-
-        # Strong punctuation → always end
-        if re.search(strong_punct, word) and words_count >= 3:
-            end_sentence = True
-        # Soft punctuation → end only if sentence already long enough
-        elif re.search(soft_punct, word) and words_count >= max_words:
-            end_sentence = True
-
-        if end_sentence:
-            subtitles.append(
-                {
-                    "start": sentence_start,
-                    "end": last_end,
-                    "text": current_sentence.strip(),
-                }
-            )
-            current_sentence = ""
-            sentence_start = None
 
-    # Add final leftover
-    if current_sentence:
-        subtitles.append(
+    def __init__(self, max_words=15):
+        self.max_words = max_words
+        self._words = []
+        self._words_count = 0
+        self._start = None
+        self._end = None
+
+    def feed(self, start, end, word):
+        """Add one word; return the finished subtitle dict, or None."""
+        if self._start is None:
+            self._start = start
+        self._words.append(word)
+        self._words_count += len(word.split())
+        self._end = end
+
+        if (self._words_count >= 3 and _STRONG_PUNCT.search(word)) or (
+            self._words_count >= self.max_words and _SOFT_PUNCT.search(word)
+        ):
+            return self._emit()
+        return None
+
+    def flush(self):
+        """Return the leftover (unpunctuated) sentence, or None."""
+        return self._emit() if self._words else None
+
+    def _emit(self):
+        subtitle = {
+            "start": self._start,
+            "end": self._end,
+            "text": " ".join(self._words).strip(),
+        }
+        self._words = []
+        self._words_count = 0
+        self._start = None
+        return subtitle
+
+
+def iter_subtitles(words, max_words=15):
+    """Yield subtitles from an iterable of ``(start, end, word)`` in time order."""
+    splitter = SubtitleSplitter(max_words)
+    for start, end, word in words:
+        subtitle = splitter.feed(start, end, word)
+        if subtitle is not None:
+            yield subtitle
+    leftover = splitter.flush()
+    if leftover is not None:
+        yield leftover
+
+
+def split_subtitles(words, max_words=15):
+    """Split recognized words into subtitle segments.
+
+    ``words`` is a ``WordTable`` or a legacy ``{(start, end): word}`` dict.
+    """
+    if isinstance(words, dict):
+        rows = ((start, end, word) for (start, end), word in sorted(words.items()))
+    else:
+        rows = words.rows()
+    return list(iter_subtitles(rows, max_words))
+
+
+# === Video info (resolved once per video) ===
+def default_ydl_factory():
+    # yt-dlp (and whisper/torch) are imported on first use so that importing this
+    # module stays cheap for the GUI, which only transcribes in a worker process
+    import yt_dlp
+
+    return yt_dlp.YoutubeDL
+
+
+def cache_root(output_folder):
+    return os.path.join(output_folder, ".cache")
+
+
+def video_cache_key(youtube_url, ydl):
+    """Offline cache key for a URL: ``<extractor>_<video id>`` when one of
+    ``ydl``'s extractors recognises it (so different URL forms share an entry),
+    else a URL hash. Nothing is fetched."""
+    # _ies: the extractors registered on this YoutubeDL, in the order it tries them
+    for ie in ydl._ies.values():
+        if ie.ie_key() != "Generic" and ie.suitable(youtube_url):
+            video_id = ie.get_temp_id(youtube_url)
+            if video_id:
+                return f"{ie.ie_key()}_{video_id}"
+    return "url_" + hashlib.sha1(youtube_url.encode("utf-8")).hexdigest()[:16]
+
+
+def resolve_info(youtube_url, cache_dir, ydl_factory=None, log=None):
+    """Run the extractor at most once per video and cache the info dict on disk.
+
+    Returns ``(info, info_path)``. Every later download is driven from
+    ``info_path`` via ``download_with_info_file``, so it costs no extractor call.
+    ``ydl_factory`` builds the ``YoutubeDL`` used (default: yt_dlp.YoutubeDL)
+    for both the cache key and the extraction, which lets a local stand-in
+    extractor replace YouTube.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    ydl_factory = ydl_factory or default_ydl_factory()
+    with ydl_factory({"quiet": True, "noplaylist": True}) as ydl:
+        key = video_cache_key(youtube_url, ydl)
+        info_path = os.path.join(cache_dir, f"{key}.info.json")
+        if (
+            os.path.exists(info_path)
+            and time.time() - os.path.getmtime(info_path) < INFO_CACHE_TTL
+        ):
+            with open(info_path, encoding="utf-8") as f:
+                info = json.load(f)
+            if log:
+                log(f"📦 Using cached video info ({key})")
+            return info, info_path
+
+        info = ydl.sanitize_info(ydl.extract_info(youtube_url, download=False))
+    tmp_path = info_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(info, f)
+    os.replace(tmp_path, info_path)
+    return info, info_path
+
+
+def download_from_info(info_path, ydl_opts, ydl_factory=None):
+    """Download using a cached info dict; yt-dlp only re-extracts if its URLs have expired."""
+    ydl_factory = ydl_factory or default_ydl_factory()
+    with ydl_factory(ydl_opts) as ydl:
+        return ydl.download_with_info_file(info_path)
+
+
+# === Audio ingest ===
+def _audio_format_bytes(info):
+    """Size of the audio-only format a separate audio download would fetch,
+    as reported by yt-dlp (``filesize_approx`` when the exact size is unknown)."""
+    for fmt in info.get("requested_formats") or []:
+        if fmt.get("vcodec") == "none":
+            return fmt.get("filesize") or fmt.get("filesize_approx") or 0
+    return 0
+
+
+def download_audio(info_path, folder_path, ydl_factory=None):
+    """Legacy path: fetch the audio again with yt-dlp and re-encode it to m4a."""
+    audio_path_template = os.path.join(folder_path, "audio.%(ext)s")
+    ydl_opts_audio = {
+        "format": "bestaudio/best",
+        "outtmpl": audio_path_template,
+        "quiet": True,
+        "postprocessors": [
             {
-                "start": sentence_start,
-                "end": last_end,
-                "text": current_sentence.strip(),
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": AUDIO_FORMAT,
+                "preferredquality": "128",
             }
+        ],
+    }
+    download_from_info(info_path, ydl_opts_audio, ydl_factory)
+    return audio_path_template.replace("%(ext)s", AUDIO_FORMAT)
+
+
+def ingest_audio(
+    mode,
+    info,
+    info_path,
+    video_path,
+    folder_path,
+    download_rate=0,
+    ydl_factory=None,
+):
+    """Prepare Whisper input according to ``mode``.
+
+    Returns ``(audio, audio_file, stats)``: ``audio`` is what goes into
+    ``model.transcribe`` (a path or a float32 16 kHz array), ``audio_file`` is a
+    temporary file to delete afterwards (or None), and ``stats`` records an
+    estimate of what the single-fetch mode saved compared to a second download:
+    the audio format's reported size, and that size at the video's download rate.
+    """
+    if mode not in INGEST_MODES:
+        raise ValueError(f"Unknown ingest mode: {mode} (expected one of {INGEST_MODES})")
+
+    stats = {"mode": mode, "bytes_saved_est": 0, "seconds_saved_est": 0.0}
+    started = time.perf_counter()
+    if mode == "download":
+        audio_file = download_audio(info_path, folder_path, ydl_factory)
+        audio = audio_file
+    else:
+        import whisper
+
+        audio_file = None
+        audio = whisper.load_audio(video_path)
+    stats["ingest_seconds"] = round(time.perf_counter() - started, 3)
+
+    if mode != "download":
+        stats["bytes_saved_est"] = _audio_format_bytes(info)
+        if download_rate > 0:
+            stats["seconds_saved_est"] = round(stats["bytes_saved_est"] / download_rate, 2)
+    return audio, audio_file, stats
+
+
+# === Parallel transcription ===
+def plan_windows(
+    n_samples,
+    window_seconds=WINDOW_SECONDS,
+    overlap_seconds=WINDOW_OVERLAP_SECONDS,
+    first_window_seconds=None,
+):
+    """Cut ``[0, n_samples)`` into overlapping windows.
+
+    Returns ``(win_start, win_end, own_start, own_end)`` sample indices. The
+    ``own`` ranges tile the whole audio exactly; each boundary sits in the middle
+    of an overlap so both neighbours see context around it. A shorter
+    ``first_window_seconds`` gets the first subtitles out sooner.
+    """
+    window = int(window_seconds * SAMPLE_RATE)
+    first_window = int((first_window_seconds or window_seconds) * SAMPLE_RATE)
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    half = overlap // 2
+    windows = []
+    win_start = 0
+    while True:
+        win_end = min(win_start + (window if windows else first_window), n_samples)
+        own_start = 0 if not windows else windows[-1][3]
+        own_end = n_samples if win_end >= n_samples else win_end - overlap + half
+        windows.append((win_start, win_end, own_start, own_end))
+        if win_end >= n_samples:
+            return windows
+        win_start = win_end - overlap
+
+
+_worker_progress_queue = None  # set in each CPU pool worker
+
+
+def _init_transcribe_worker(threads, progress_queue=None):
+    global _worker_progress_queue
+    import torch
+
+    torch.set_num_threads(threads)
+    _worker_progress_queue = progress_queue
+
+
+def _transcribe_window(
+    model, model_lock, audio_window, offset_seconds, fp16=False, on_progress=None
+):
+    """Transcribe one window and shift its timestamps to absolute time.
+    ``on_progress(seconds)`` reports how far into the window Whisper has got."""
+    with model_lock, whisper_progress(on_progress):
+        result = model.transcribe(audio_window, word_timestamps=True, verbose=None, fp16=fp16)
+    for segment in result["segments"]:
+        segment["start"] += offset_seconds
+        segment["end"] += offset_seconds
+        for word in segment.get("words", []):
+            word["start"] += offset_seconds
+            word["end"] += offset_seconds
+    return result["segments"]
+
+
+def _transcribe_window_on_worker(model_size, audio_window, offset_seconds, index):
+    """Pool entry point: each worker process keeps its own warm CPU model, and
+    sends ``(index, seconds)`` progress to the parent."""
+    model, model_lock = MODEL_POOL.get(model_size, device="cpu")
+    on_progress = None
+    if _worker_progress_queue is not None:
+        on_progress = lambda seconds: _worker_progress_queue.put((index, seconds))  # noqa: E731
+    return _transcribe_window(
+        model, model_lock, audio_window, offset_seconds, on_progress=on_progress
+    )
+
+
+def stitch_window(segments, own_start, own_end):
+    """Keep the words whose midpoint falls in this window's owned range."""
+    lo, hi = own_start / SAMPLE_RATE, own_end / SAMPLE_RATE
+    stitched = []
+    for segment in segments:
+        words = [
+            w
+            for w in segment.get("words", [])
+            if lo <= (w["start"] + w["end"]) / 2 < hi
+        ]
+        if not words:
+            continue
+        segment = dict(segment, words=words, start=words[0]["start"], end=words[-1]["end"])
+        segment["text"] = "".join(w["word"] for w in words)
+        stitched.append(segment)
+    return stitched
+
+
+def iter_transcribed_windows(
+    model_size, audio, workers=1, log=print, progress=None, start_window=0
+):
+    """Transcribe ``audio`` window by window, yielding each window's stitched
+    segments in playback order, beginning at window ``start_window``.
+
+    With ``workers > 1`` the windows run on a pool of CPU processes; otherwise
+    they run here on the default device. Window offsets come from integer
+    sample positions, so timestamps do not drift across boundaries.
+    ``progress(stage, processed, total)`` is called as audio is transcribed.
+    """
+    if isinstance(audio, str):
+        import whisper
+
+        audio = whisper.load_audio(audio)
+    windows = plan_windows(len(audio), first_window_seconds=FIRST_WINDOW_SECONDS)
+    total = len(audio) / SAMPLE_RATE
+    progress = progress or (lambda *args, **kwargs: None)
+    done = windows[start_window - 1][3] / SAMPLE_RATE if start_window else 0
+    windows = windows[start_window:]
+    if not windows:
+        return
+
+    # Owned seconds transcribed per window; the overlap a window re-reads
+    # before its owned range doesn't count, so the sum never passes ``total``
+    owned = {}
+
+    def advance(index, seconds):
+        win_start, _, own_start, own_end = windows[index]
+        position = min(max(win_start + seconds * SAMPLE_RATE, own_start), own_end)
+        owned[index] = max(owned.get(index, 0.0), (position - own_start) / SAMPLE_RATE)
+        progress("transcribe", done + sum(owned.values()), total)
+
+    if workers <= 1:
+        device = MODEL_POOL.default_device()
+        progress("model")
+        # One pool lookup per run, so the pool's hits count reused models, not windows
+        model, model_lock = MODEL_POOL.get(model_size, device=device, log=log)
+        log(f"📄 Transcribing {len(windows)} window(s)...")
+        progress("transcribe", done, total)
+        for index, (win_start, win_end, own_start, own_end) in enumerate(windows):
+            segments = _transcribe_window(
+                model,
+                model_lock,
+                audio[win_start:win_end],
+                win_start / SAMPLE_RATE,
+                fp16=device != "cpu",
+                on_progress=lambda seconds, index=index: advance(index, seconds),
+            )
+            yield stitch_window(segments, own_start, own_end)
+            advance(index, (win_end - win_start) / SAMPLE_RATE)
+        log(MODEL_POOL.format_stats())
+        return
+
+    workers = min(workers, len(windows))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    log(f"🧩 Transcribing {len(windows)} window(s) on {workers} CPU worker(s)...")
+    progress("transcribe", done, total)
+    progress_queue = multiprocessing.Queue()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_transcribe_worker,
+        initargs=(threads, progress_queue),
+    ) as pool:
+        futures = [
+            pool.submit(
+                _transcribe_window_on_worker,
+                model_size,
+                audio[win_start:win_end],
+                win_start / SAMPLE_RATE,
+                index,
+            )
+            for index, (win_start, win_end, _, _) in enumerate(windows)
+        ]
+        for index, (future, (win_start, win_end, own_start, own_end)) in enumerate(
+            zip(futures, windows)
+        ):
+            # Windows run side by side; report all of them while waiting for this one
+            while not future.done():
+                try:
+                    advance(*progress_queue.get(timeout=0.5))
+                except queue.Empty:
+                    pass
+            yield stitch_window(future.result(), own_start, own_end)
+            advance(index, (win_end - win_start) / SAMPLE_RATE)
+
+
+# === SRT output ===
+class WordTable:
+    """Columnar store of Whisper's word timestamps.
+
+    float32 ``start``/``end``/``probability`` columns plus one UTF-8 ``text``
+    buffer with int32 ``offsets`` (word ``i`` is ``text[offsets[i]:offsets[i+1]]``).
+    Rows are kept sorted by (start, end), and words with identical timings are
+    all kept.
+    """
+
+    COLUMNS = ("start", "end", "probability", "offsets", "text")
+
+    def __init__(self, start, end, probability, offsets, text):
+        self.start = start
+        self.end = end
+        self.probability = probability
+        self.offsets = offsets
+        self.text = text
+
+    @classmethod
+    def from_rows(cls, starts, ends, words, probabilities=None):
+        encoded = [word.encode("utf-8") for word in words]
+        # Whisper's timings are only meaningful to the millisecond (SRT precision)
+        start = np.round(np.asarray(starts, dtype=np.float64), 3).astype(np.float32)
+        end = np.round(np.asarray(ends, dtype=np.float64), 3).astype(np.float32)
+        if probabilities is None:
+            probability = np.full(len(encoded), np.nan, dtype=np.float32)
+        else:
+            probability = np.asarray(probabilities, dtype=np.float32)
+        lengths = np.fromiter((len(b) for b in encoded), dtype=np.int32, count=len(encoded))
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        table = cls(start, end, probability, offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8))
+        # Whisper emits words in order; only re-sort when a timing goes backwards
+        if len(start) > 1 and (np.diff(start) < 0).any():
+            table = table.take(np.lexsort((end, start)))
+        return table
+
+    @classmethod
+    def from_segments(cls, segments):
+        starts, ends, words, probabilities = [], [], [], []
+        for segment in segments:
+            for word in segment.get("words", []):
+                starts.append(word["start"])
+                ends.append(word["end"])
+                words.append(word["word"].strip())
+                probabilities.append(word.get("probability", np.nan))
+        return cls.from_rows(starts, ends, words, probabilities)
+
+    @classmethod
+    def concat(cls, tables):
+        tables = [t for t in tables if len(t)]
+        if not tables:
+            return cls.from_rows([], [], [])
+        offsets = [tables[0].offsets]
+        for t in tables[1:]:
+            offsets.append(t.offsets[1:] + offsets[-1][-1])
+        table = cls(
+            np.concatenate([t.start for t in tables]),
+            np.concatenate([t.end for t in tables]),
+            np.concatenate([t.probability for t in tables]),
+            np.concatenate(offsets),
+            np.concatenate([t.text for t in tables]),
+        )
+        if (np.diff(table.start) < 0).any():
+            table = table.take(np.lexsort((table.end, table.start)))
+        return table
+
+    def take(self, order):
+        words = [self.word(i) for i in order]
+        return WordTable.from_rows(
+            self.start[order], self.end[order], words, self.probability[order]
         )
 
+    def __len__(self):
+        return len(self.start)
+
+    def word(self, i):
+        return self.text[self.offsets[i] : self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def rows(self):
+        """Yield ``(start, end, word)`` in time order, as consumed by the splitter."""
+        # Decode the buffer once and map byte offsets to str offsets by counting
+        # UTF-8 lead bytes (anything that is not a 0b10xxxxxx continuation byte)
+        text = self.text.tobytes().decode("utf-8")
+        lead = np.zeros(len(self.text) + 1, dtype=np.int64)
+        np.cumsum((self.text & 0xC0) != 0x80, out=lead[1:])
+        offsets = lead[self.offsets].tolist()
+        for i, (start, end) in enumerate(zip(self.start.tolist(), self.end.tolist())):
+            yield start, end, text[offsets[i] : offsets[i + 1]]
+
+    def save(self, path):
+        np.savez_compressed(path, **{name: getattr(self, name) for name in self.COLUMNS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            columns = {name: data[name] for name in data.files}
+        if "probability" not in columns:
+            columns["probability"] = np.full(len(columns["start"]), np.nan, dtype=np.float32)
+        return cls(**{name: columns[name] for name in cls.COLUMNS})
+
+
+def resplit_project(project_folder, max_words=15, manifest=None):
+    """Rewrite a project's subtitle.srt from its saved words; no re-transcription.
+
+    The manifest (the project's, unless one is passed in) records the new
+    ``max_words``, so a later run doesn't mistake the SRT for its own split.
+    """
+    words_path = os.path.join(project_folder, WORDS_FILE)
+    if not os.path.exists(words_path):
+        raise FileNotFoundError(f"No {WORDS_FILE} in {project_folder}")
+    subtitles = split_subtitles(WordTable.load(words_path), max_words)
+    write_srt(os.path.join(project_folder, "subtitle.srt"), subtitles)
+    if manifest is None:
+        manifest = StageManifest(project_folder)
+    manifest.mark("splitting", max_words=max_words)
+    manifest.mark("srt", max_words=max_words)
     return subtitles
 
 
+def format_timestamp(seconds):
+    # Round (not truncate) to the millisecond: 1.234 is 1.2339999... as a float
+    total_ms = int(round(seconds * 1000))
+    h = total_ms // 3_600_000
+    m = (total_ms % 3_600_000) // 60_000
+    s = (total_ms % 60_000) // 1000
+    ms = total_ms % 1000
+    return f"{h:02}:{m:02}:{s:02},{ms:03}"
+
+
+def format_srt(subtitles, first_index=1):
+    return "".join(
+        f"{idx}\n{format_timestamp(sub['start'])} --> {format_timestamp(sub['end'])}\n{sub['text']}\n\n"
+        for idx, sub in enumerate(subtitles, first_index)
+    )
+
+
+def write_srt(srt_path, subtitles):
+    with open(srt_path, "w", encoding="utf-8") as f:
+        f.write(format_srt(subtitles))
+    write_subtitle_sidecar(srt_path, subtitles)
+
+
+def write_subtitle_sidecar(srt_path, subtitles):
+    """Save the binary subtitle.idx next to the SRT for the GUI to memory-map.
+
+    Best effort: if it can't be replaced, the GUI rebuilds it from the SRT.
+    """
+    SubtitleTrack.from_subtitles(subtitles).save_sidecar(srt_path)
+
+
+class SrtStreamWriter:
+    """Append subtitles to ``subtitle.srt`` as soon as the splitter finishes them.
+
+    Each batch is written with a single write + flush so readers only ever see
+    whole entries.
+    """
+
+    def __init__(self, srt_path, max_words=15):
+        self.srt_path = srt_path
+        self.splitter = SubtitleSplitter(max_words)
+        self.tables = []
+        self.subtitles = []
+        with open(srt_path, "w", encoding="utf-8"):
+            pass
+
+    def _append(self, subtitles):
+        if not subtitles:
+            return
+        with open(self.srt_path, "a", encoding="utf-8") as f:
+            f.write(format_srt(subtitles, len(self.subtitles) + 1))
+            f.flush()
+        self.subtitles.extend(subtitles)
+
+    @property
+    def words(self):
+        return WordTable.concat(self.tables)
+
+    def add_words(self, table):
+        self.tables.append(table)
+        finished = []
+        for start, end, word in table.rows():
+            subtitle = self.splitter.feed(start, end, word)
+            if subtitle is not None:
+                finished.append(subtitle)
+        self._append(finished)
+
+    def close(self):
+        leftover = self.splitter.flush()
+        self._append([leftover] if leftover else [])
+        write_subtitle_sidecar(self.srt_path, self.subtitles)
+
+
+# === Stage checkpoints ===
+class StageManifest:
+    """Finished pipeline stages of one project, kept in ``manifest.json``.
+
+    A stage is only marked done once its output is on disk; ``details`` record
+    what it was produced with (sizes, model, max_words) so a rerun can tell
+    whether the output is still usable.
+    """
+
+    def __init__(self, folder_path, resume=True):
+        self.path = os.path.join(folder_path, MANIFEST_FILE)
+        self.stages = {}
+        if resume and os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.stages = json.load(f).get("stages", {})
+            except ValueError:
+                self.stages = {}  # Torn write; start over
+
+    def get(self, stage):
+        return self.stages.get(stage) or {}
+
+    def done(self, stage, **expected):
+        details = self.get(stage)
+        return details.get("done", False) and all(
+            details.get(key) == value for key, value in expected.items()
+        )
+
+    def mark(self, stage, done=True, **details):
+        self.stages[stage] = dict(details, done=done)
+        self.save()
+
+    def invalidate(self, stage):
+        """Forget ``stage`` and every stage after it."""
+        for name in PIPELINE_STAGES[PIPELINE_STAGES.index(stage) :]:
+            self.stages.pop(name, None)
+        self.save()
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"stages": self.stages}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def window_checkpoint_path(folder_path, index):
+    return os.path.join(folder_path, CHECKPOINT_DIR, f"window_{index:04d}.npz")
+
+
+# === Transcript cache ===
+def transcript_cache_key(audio, model_size, **decode_options):
+    """Content address of a transcript: hash of the 16 kHz PCM + model + options."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(np.ascontiguousarray(audio, dtype=np.float32))
+    digest.update(json.dumps([model_size, decode_options], sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """Finished WordTables shared by every project in an output folder.
+
+    Entries are ``<key>.npz`` files; a hit refreshes the file's mtime, and the
+    least-recently-used entries are deleted once the folder exceeds the budget.
+    Hit/miss counters persist in ``stats.json``. Parallel jobs share the
+    folder, so every write goes through a unique temp file and ``os.replace``,
+    and an entry another job has just evicted counts as gone.
+    """
+
+    def __init__(self, cache_dir, budget_mb=TRANSCRIPT_CACHE_BUDGET_MB):
+        self.cache_dir = cache_dir
+        self.budget_bytes = int(budget_mb * 1024**2)
+        self.stats_path = os.path.join(cache_dir, "stats.json")
+        self.counters = self._read_counters()
+
+    @property
+    def enabled(self):
+        return self.budget_bytes > 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def _temp_path(self, suffix):
+        """A fresh file in the cache folder: parallel jobs never share a temp name."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=suffix, dir=self.cache_dir)
+        os.close(fd)
+        return path
+
+    def _read_counters(self):
+        counters = {"hits": 0, "misses": 0, "evictions": 0}
+        try:
+            with open(self.stats_path, encoding="utf-8") as f:
+                counters.update(json.load(f))
+        except (OSError, ValueError):
+            pass  # Not written yet, or unreadable: start from zero
+        return counters
+
+    def _count(self, name):
+        # Other jobs update the same file: add to what is on disk now
+        self.counters = self._read_counters()
+        self.counters[name] += 1
+        tmp_path = self._temp_path(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.counters, f)
+            os.replace(tmp_path, self.stats_path)
+        except OSError:
+            # Counters are informational; never fail a job over them
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            words = WordTable.load(path)
+        except (OSError, ValueError, KeyError):
+            self._count("misses")
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # Evicted by another job since; the words are already loaded
+        self._count("hits")
+        return words
+
+    def put(self, key, words):
+        if not self.enabled:
+            return
+        tmp_path = self._temp_path(".tmp.npz")
+        words.save(tmp_path)
+        os.replace(tmp_path, self._path(key))
+        self._evict(keep=self._path(key))
+
+    def _entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".npz") and ".tmp" not in name:
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Evicted by another job
+                entries.append((st.st_mtime, st.st_size, path))
+        return sorted(entries)
+
+    def _evict(self, keep=None):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.budget_bytes:
+                break
+            if path == keep:
+                continue
+            total -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue  # Another job evicted it first and counted it
+            self._count("evictions")
+
+    def format_stats(self):
+        hits, misses = self.counters["hits"], self.counters["misses"]
+        entries = self._entries()
+        return (
+            f"🗃️ Transcript cache: hits={hits} misses={misses} "
+            f"hit rate={hits / max(hits + misses, 1):.0%} entries={len(entries)} "
+            f"size={sum(size for _, size, _ in entries) / 1024**2:.1f}/"
+            f"{self.budget_bytes / 1024**2:.0f} MB"
+        )
+
 
 # === Main Function ===
-def run_transcription(youtube_url, model_size, output_folder, log_callback=print, max_words=15):
+def run_transcription(
+    youtube_url,
+    model_size,
+    output_folder,
+    log_callback=print,
+    max_words=15,
+    ingest_mode="pcm",
+    ydl_factory=None,
+    workers=1,
+    stream=False,
+    progress_callback=None,
+    project_callback=None,
+    resume=True,
+    transcript_cache_mb=TRANSCRIPT_CACHE_BUDGET_MB,
+):
+    """Download ``youtube_url`` and write its subtitles; returns the project folder.
+
+    ``log_callback`` receives human-readable status lines. ``progress_callback``
+    receives throttled ProgressEvents (stage, processed, total, unit, rtf, eta).
+    ``project_callback`` is called with the project folder once it exists.
+    With ``stream`` (or ``workers > 1``) the audio is transcribed in windows
+    and subtitle.srt grows as each one finishes; Whisper then starts every
+    window without the context of the previous one. With ``resume``, stages recorded in the project's manifest are skipped and
+    windowed transcription continues after the last finished window. Audio
+    that was transcribed before (any project, same model and options) is
+    served from the transcript cache instead.
+    """
+
     def log(msg):
         if log_callback:
             log_callback(msg)
 
+    progress = ProgressReporter(progress_callback)
+
     # Step 1: Get video info & output path
-    info = yt_dlp.YoutubeDL({"quiet": True}).extract_info(youtube_url, download=False)
+    progress("info")
+    info, info_path = resolve_info(
+        youtube_url, os.path.join(cache_root(output_folder), "info"), ydl_factory, log
+    )
     title_safe = re.sub(r"[\\/*?\"<>|:]", "_", info["title"])
     folder_path = os.path.join(output_folder, title_safe)
     os.makedirs(folder_path, exist_ok=True)
+    if project_callback:
+        project_callback(folder_path)
+    manifest = StageManifest(folder_path, resume)
+    if not manifest.done("info", video_id=info.get("id")):
+        # New project, or another video with the same title: nothing to reuse
+        manifest.invalidate("info")
+        manifest.mark("info", video_id=info.get("id"), url=youtube_url)
     total_duration = info.get("duration") or 0
-    log("⏱️ Video length: " + StreamLogger()._format_time(total_duration))
+    log("⏱️ Video length: " + format_hms(total_duration))
 
     # Step 2: Download video
     video_path = os.path.join(folder_path, f"video.{VIDEO_FORMAT}")
-    log("📥 Downloading video...")
-    ydl_opts = {
-        "format": "bv*+ba/best",
-        "outtmpl": video_path,
-        "merge_output_format": "mp4",
-        "quiet": True,
-        "no_warnings": True,
-        "noplaylist": True,
-        "prefer_ffmpeg": True,
-    }
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        ydl.download([youtube_url])
-    log("✅ Video downloaded.")
+    video_stage = manifest.get("video")
+    if (
+        manifest.done("video")
+        and os.path.exists(video_path)
+        and os.path.getsize(video_path) == video_stage.get("size")
+    ):
+        log("⏭️ Video already downloaded.")
+        download_rate = video_stage.get("rate", 0)
+    else:
+        manifest.invalidate("video")
+        log("📥 Downloading video...")
+        ydl_opts = {
+            "format": "bv*+ba/best",
+            "outtmpl": video_path,
+            "merge_output_format": "mp4",
+            "quiet": True,
+            "no_warnings": True,
+            "noplaylist": True,
+            "prefer_ffmpeg": True,
+            "noprogress": True,
+            "progress_hooks": [progress.ydl_hook],
+        }
+        download_started = time.perf_counter()
+        download_from_info(info_path, ydl_opts, ydl_factory)
+        download_seconds = time.perf_counter() - download_started
+        download_rate = os.path.getsize(video_path) / max(download_seconds, 1e-3)
+        manifest.mark("video", size=os.path.getsize(video_path), rate=download_rate)
+        log("✅ Video downloaded.")
+
+    srt_path = os.path.join(folder_path, "subtitle.srt")
+    words_path = os.path.join(folder_path, WORDS_FILE)
+    if manifest.done("transcription", model_size=model_size) and os.path.exists(
+        words_path
+    ):
+        # Steps 3-4 already finished: at most the subtitles need re-splitting
+        log("⏭️ Transcript already saved.")
+        if not (manifest.done("srt", max_words=max_words) and os.path.exists(srt_path)):
+            progress("subtitles")
+            resplit_project(folder_path, max_words, manifest)
+        log("✅ Subtitles saved.")
+        progress("done")
+        return folder_path
 
     # Step 3: Extract audio
-    audio_path_template = os.path.join(folder_path, "audio.%(ext)s")
-    log("🔊 Extracting audio...")
-    ydl_opts_audio = {
-        "format": "bestaudio/best",
-        "outtmpl": audio_path_template,
-        "quiet": True,
-        "postprocessors": [
-            {
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": AUDIO_FORMAT,
-                "preferredquality": "128",
-            }
-        ],
-    }
-    with yt_dlp.YoutubeDL(ydl_opts_audio) as ydl:
-        ydl.download([youtube_url])
-    audio_file = audio_path_template.replace("%(ext)s", AUDIO_FORMAT)
-    log("✅ Audio extracted.")
+    audio_stage = manifest.get("audio")
+    audio_file = audio_stage.get("file")
+    if (
+        manifest.done("audio", mode=ingest_mode)
+        and audio_file
+        and os.path.exists(audio_file)
+    ):
+        # download leaves a file behind until transcription finishes
+        log("⏭️ Audio already extracted.")
+        audio = audio_file
+    else:
+        log(f"🔊 Extracting audio ({ingest_mode})...")
+        progress("audio")
+        audio, audio_file, ingest_stats = ingest_audio(
+            ingest_mode,
+            info,
+            info_path,
+            video_path,
+            folder_path,
+            download_rate,
+            ydl_factory,
+        )
+        with open(os.path.join(folder_path, "ingest.json"), "w", encoding="utf-8") as f:
+            json.dump(ingest_stats, f, indent=2)
+        manifest.mark("audio", mode=ingest_mode, file=audio_file)
+        log("✅ Audio extracted.")
+        if ingest_mode != "download":
+            log(
+                f"💾 Single-fetch ingest saved an estimated "
+                f"~{ingest_stats['bytes_saved_est'] / 1024**2:.1f} MB "
+                f"(~{ingest_stats['seconds_saved_est']:.1f}s of downloading)"
+            )
 
     # Step 4: Transcribe with Whisper
     if sys.stdout is None:
         sys.stdout = sys.__stdout__
     if sys.stderr is None:
         sys.stderr = sys.__stderr__
+    if isinstance(audio, str):
+        import whisper
+
+        audio = whisper.load_audio(audio)
+    windowed = workers > 1 or stream
+    transcript_cache = TranscriptCache(
+        os.path.join(cache_root(output_folder), "transcripts"), transcript_cache_mb
+    )
+    cache_key = None
+    words = None
+    if transcript_cache.enabled:
+        # Windowing changes Whisper's context, so it is part of the key; the
+        # worker count is not (windows are transcribed the same either way)
+        cache_key = transcript_cache_key(
+            audio,
+            model_size,
+            word_timestamps=True,
+            windows=(
+                [WINDOW_SECONDS, WINDOW_OVERLAP_SECONDS, FIRST_WINDOW_SECONDS]
+                if windowed
+                else None
+            ),
+        )
+        words = transcript_cache.get(cache_key)
+    cache_hit = words is not None
+    if cache_hit:
+        log("⚡ Same audio was transcribed before; reusing the cached transcript.")
+        progress("subtitles")
+        write_srt(srt_path, split_subtitles(words, max_words))
+    elif windowed:
+        # Windowed transcription; finalized subtitles are appended as they come,
+        # and each window's words are checkpointed so a rerun can pick up here
+        windows = plan_windows(len(audio), first_window_seconds=FIRST_WINDOW_SECONDS)
+        start_window = 0
+        if manifest.get("transcription").get("model_size") == model_size and (
+            manifest.get("transcription").get("samples") == len(audio)
+        ):
+            start_window = manifest.get("transcription").get("windows_done", 0)
+        start_window = min(start_window, len(windows))
+        checkpoints = []
+        for index in range(start_window):
+            try:
+                checkpoints.append(WordTable.load(window_checkpoint_path(folder_path, index)))
+            except Exception as e:
+                # Missing or torn checkpoint: redo the transcription from this window
+                log(f"⚠️ Checkpoint of window {index + 1} is unreadable ({e}); redoing it.")
+                start_window = index
+                break
+        if start_window:
+            log(
+                f"♻️ Resuming transcription at window {start_window + 1}/{len(windows)} "
+                f"({format_hms(windows[start_window - 1][3] / SAMPLE_RATE)})"
+            )
+        else:
+            shutil.rmtree(os.path.join(folder_path, CHECKPOINT_DIR), ignore_errors=True)
+            os.makedirs(os.path.join(folder_path, CHECKPOINT_DIR))
+
+        marker_path = os.path.join(folder_path, TRANSCRIBING_MARKER)
+        open(marker_path, "w").close()
+        writer = SrtStreamWriter(srt_path, max_words)
+        try:
+            for table in checkpoints:
+                writer.add_words(table)
+            windows_done = start_window
+            for segments in iter_transcribed_windows(
+                model_size, audio, workers, log, progress, start_window
+            ):
+                table = WordTable.from_segments(segments)
+                table.save(window_checkpoint_path(folder_path, windows_done))
+                windows_done += 1
+                manifest.mark(
+                    "transcription",
+                    done=False,
+                    model_size=model_size,
+                    samples=len(audio),
+                    windows=len(windows),
+                    windows_done=windows_done,
+                )
+                writer.add_words(table)
+            writer.close()
+            words = writer.words
+        except Exception as e:
+            log("❌ Transcription failed:")
+            log(str(e))
+            log(traceback.format_exc())
+            return
+        finally:
+            os.remove(marker_path)
+    else:
+        progress("model")
+        try:
+            model, model_lock = MODEL_POOL.get(model_size, log=log)
+        except Exception as e:
+            log("❌ Failed to load Whisper model:")
+            log(str(e))
+            log(traceback.format_exc())
+            return
+
+        log("📄 Transcribing audio...")
+        audio_seconds = len(audio) / SAMPLE_RATE
+        progress("transcribe", 0, audio_seconds)
+        with model_lock, whisper_progress(
+            lambda seconds: progress("transcribe", min(seconds, audio_seconds), audio_seconds)
+        ):
+            result = model.transcribe(audio, word_timestamps=True, verbose=None)
+        progress("transcribe", audio_seconds, audio_seconds)
+        log(MODEL_POOL.format_stats())
+
+        # Step 5: Generate subtitles
+        progress("subtitles")
+        words = WordTable.from_segments(result["segments"])
+        subtitles = split_subtitles(words, max_words)
+        write_srt(srt_path, subtitles)
+
+    if cache_key and not cache_hit:
+        transcript_cache.put(cache_key, words)
+    if transcript_cache.enabled:
+        log(transcript_cache.format_stats())
+    words.save(words_path)
+    manifest.mark("transcription", model_size=model_size, words=len(words))
+    manifest.mark("splitting", max_words=max_words)
+    manifest.mark("srt", max_words=max_words)
+    shutil.rmtree(os.path.join(folder_path, CHECKPOINT_DIR), ignore_errors=True)
+    if audio_file and os.path.exists(audio_file):
+        os.remove(audio_file)
+    log("✅ Subtitles saved.")
+    progress("done")
+    return folder_path
+
+
+# === Worker process (used by the GUI) ===
+def prewarm(model_size=None, log=None):
+    """Import the transcription stack ahead of the first job, and load
+    ``model_size`` into MODEL_POOL if given; returns the seconds it took."""
+    started = time.perf_counter()
+    import whisper  # pulls in torch
+
+    default_ydl_factory()
+    if model_size:
+        MODEL_POOL.get(model_size, log=log)
+    return time.perf_counter() - started
+
+
+def _lower_process_priority():
+    # Keep the GUI's event loop and VLC ahead of Whisper on the CPU
     try:
-        log(f"🧠 Loading Whisper model ({model_size})...")
-        model = whisper.load_model(model_size)
-    except Exception as e:
-        log("❌ Failed to load Whisper model:")
-        log(str(e))
-        log(traceback.format_exc())
-        return
+        if hasattr(os, "nice"):
+            os.nice(5)
+        elif sys.platform == "win32":
+            import ctypes
+
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), 0x4000)  # below normal
+    except Exception:
+        pass
+
+
+def _lead_process_group():
+    # The GUI cancels a job by killing this process's group, which takes the
+    # ProcessPoolExecutor children along (killing only the worker orphans them).
+    # Not from a terminal: a background group can't read the tty.
+    if hasattr(os, "setpgrp") and not sys.stdin.isatty():
+        try:
+            os.setpgrp()
+        except OSError:
+            pass
+
+
+def _worker_streams():
+    """Return ``(jobs_in, events_out)`` text streams for the worker protocol.
 
-    log("📄 Transcribing audio (verbose=True)...")
-    original_stdout = sys.stdout
-    sys.stdout = StreamLogger(log_callback, total_duration)
+    The protocol gets a private duplicate of stdout, and fd 1 is pointed at
+    stderr, so stray prints from libraries can never corrupt the event stream.
+    """
     try:
-        result = model.transcribe(audio_file, word_timestamps=True, verbose=True)
-    finally:
-        sys.stdout = original_stdout
+        events_out = os.fdopen(os.dup(1), "w", encoding="utf-8", buffering=1)
+        os.dup2(2, 1)
+        sys.stdout = sys.stderr
+    except OSError:
+        # Windowed (PyInstaller) builds may have no usable fd 1
+        events_out = open(1, "w", encoding="utf-8", buffering=1, closefd=False)
+    jobs_in = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    return jobs_in, events_out
 
-    # Step 5: Generate subtitles
-    word_dict = {}
-    for segment in result["segments"]:
-        for word in segment.get("words", []):
-            start = round(word["start"], 3)
-            end = round(word["end"], 3)
-            word_text = word["word"].strip()
-            word_dict[(start, end)] = word_text
 
-    # Use the standalone splitter
-    subtitles = split_subtitles(word_dict, max_words)
+def run_worker(jobs_in=None, events_out=None):
+    """Serve transcription jobs: one JSON job per input line, JSON events out.
 
-    def format_timestamp(seconds):
-        h = int(seconds // 3600)
-        m = int((seconds % 3600) // 60)
-        s = int(seconds % 60)
-        ms = int((seconds % 1) * 1000)
-        return f"{h:02}:{m:02}:{s:02},{ms:03}"
+    Job fields: ``url``, ``model_size``, and optionally ``id``, ``output_folder``,
+    ``max_words``, ``workers``, ``stream``. Events have a ``type`` of ``ready``, ``log``
+    (text), ``progress`` (ProgressEvent fields), ``project`` (folder), and
+    ``done``/``failed`` (with ``error`` if one was raised) at the end of each job.
+    A ``{"prewarm": true, "model_size": ...}`` line only loads the transcription
+    stack and answers with ``prewarmed`` (seconds). The process stays alive between
+    jobs, so MODEL_POOL keeps models warm.
+    """
+    if jobs_in is None or events_out is None:
+        _lead_process_group()
+        jobs_in, events_out = _worker_streams()
+    _lower_process_priority()
 
-    srt_path = os.path.join(folder_path, "subtitle.srt")
-    with open(srt_path, "w", encoding="utf-8") as f:
-        for idx, sub in enumerate(subtitles, 1):
-            f.write(
-                f"{idx}\n{format_timestamp(sub['start'])} --> {format_timestamp(sub['end'])}\n{sub['text']}\n\n"
-            )
+    def emit(event_type, **fields):
+        events_out.write(json.dumps({"type": event_type, **fields}, ensure_ascii=False) + "\n")
+        events_out.flush()
 
-    os.remove(audio_file)
-    log("✅ Subtitles saved.")
-    return folder_path
+    emit("ready", pid=os.getpid())
+    for line in jobs_in:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        if job.get("prewarm"):
+            try:
+                seconds = prewarm(
+                    job.get("model_size"),
+                    log=lambda text: emit("log", job_id=None, text=text),
+                )
+            except Exception as e:
+                emit("log", job_id=None, text=f"❌ Pre-warm failed: {str(e)}")
+                continue
+            emit("prewarmed", model_size=job.get("model_size"), seconds=round(seconds, 2))
+            continue
+        job_id = job.get("id")
+        error = None
+        try:
+            folder = run_transcription(
+                job["url"],
+                job["model_size"],
+                job.get("output_folder", "youtube_videos"),
+                log_callback=lambda text: emit("log", job_id=job_id, text=text),
+                max_words=job.get("max_words", 15),
+                workers=job.get("workers", 1),
+                stream=job.get("stream", False),
+                resume=job.get("resume", True),
+                progress_callback=lambda event: emit(
+                    "progress", job_id=job_id, **event._asdict()
+                ),
+                project_callback=lambda folder: emit(
+                    "project", job_id=job_id, folder=folder
+                ),
+            )
+        except Exception as e:
+            emit("log", job_id=job_id, text=f"❌ Error: {str(e)}")
+            folder, error = None, str(e)
+        if folder:
+            emit("done", job_id=job_id, folder=folder)
+        else:
+            emit("failed", job_id=job_id, folder=None, error=error)
 
 
 # === CLI support ===
-if __name__ == "__main__":
+def main(argv=None):
     import argparse
 
+    argv = sys.argv[1:] if argv is None else argv
+
     def print_line(text):
         sys.__stdout__.write(text + "\n")
         sys.__stdout__.flush()
 
+    def print_progress(event):
+        # Stage changes are already logged; only print measurable progress
+        if event.total:
+            print_line(format_progress(event))
+
+    if argv[:1] == ["worker"]:
+        run_worker()
+        return
+
+    if argv[:1] == ["resplit"]:
+        parser = argparse.ArgumentParser(
+            prog="get_video_and_srt.py resplit",
+            description=f"Re-split a project's subtitles from its saved {WORDS_FILE}.",
+        )
+        parser.add_argument("project_folder", help="e.g. youtube_videos/<video title>")
+        parser.add_argument("--max_words", type=int, default=15)
+        args = parser.parse_args(argv[1:])
+        subtitles = resplit_project(args.project_folder, args.max_words)
+        print_line(f"✂️ Re-split into {len(subtitles)} subtitles.")
+        return
+
+    if argv[:1] == ["queue"]:
+        from job_queue import JobQueue, default_queue_path, run_queue
+
+        parser = argparse.ArgumentParser(
+            prog="get_video_and_srt.py queue",
+            description="Add URLs to the persistent job queue, edit it, and run it.",
+        )
+        parser.add_argument(
+            "urls_file", nargs="?", help="Text file with one URL per line (# comments ok)"
+        )
+        parser.add_argument("--model_size", default="turbo")
+        parser.add_argument("--output_folder", default="youtube_videos")
+        parser.add_argument("--max_words", type=int, default=15)
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument(
+            "--jobs", type=int, default=1, help="Videos transcribed at the same time"
+        )
+        parser.add_argument(
+            "--list", action="store_true", help="Only show the queue, don't run it"
+        )
+        parser.add_argument(
+            "--cancel",
+            type=int,
+            nargs="+",
+            metavar="ID",
+            help="Cancel jobs (running ones are stopped by whoever runs them); "
+            "doesn't run the queue",
+        )
+        parser.add_argument(
+            "--move",
+            type=int,
+            nargs=2,
+            metavar=("ID", "OFFSET"),
+            help="Move a queued job OFFSET places (negative = sooner); doesn't run the queue",
+        )
+        args = parser.parse_args(argv[1:])
+        queue = JobQueue(default_queue_path(args.output_folder))
+        if args.cancel or args.move:
+            for job_id in args.cancel or []:
+                if queue.cancel(job_id) is None:
+                    print_line(f"ℹ️ #{job_id} is not queued or running.")
+                else:
+                    print_line(f"⛔ Cancelled #{job_id}.")
+            if args.move:
+                job_id, offset = args.move
+                if queue.move(job_id, offset):
+                    print_line(f"↕️ Moved #{job_id}.")
+                else:
+                    print_line(f"ℹ️ #{job_id} is not queued, or can't move further.")
+            for job in queue.jobs:
+                print_line(JobQueue.describe(job))
+            return
+
+        recovered = queue.recover()
+        if recovered:
+            print_line(f"🔁 Requeued {recovered} interrupted job(s).")
+        if args.urls_file:
+            with open(args.urls_file, encoding="utf-8") as f:
+                urls = [line.strip() for line in f]
+            for url in urls:
+                if url and not url.startswith("#"):
+                    queue.add(
+                        url,
+                        model_size=args.model_size,
+                        output_folder=args.output_folder,
+                        max_words=args.max_words,
+                        workers=args.workers,
+                    )
+        if not args.list:
+            run_queue(queue, concurrency=args.jobs, log=print_line)
+        for job in queue.jobs:
+            print_line(JobQueue.describe(job))
+        return
+
     parser = argparse.ArgumentParser(description="Download + Transcribe a YouTube video.")
     parser.add_argument("url", help="YouTube URL")
     parser.add_argument(
@@ -267,6 +1577,62 @@ if __name__ == "__main__":
         default="turbo",
     )
     parser.add_argument("--output_folder", default="youtube_videos", help="Output folder")
+    parser.add_argument("--max_words", type=int, default=15)
+    parser.add_argument(
+        "--model_budget_gb",
+        type=float,
+        default=MODEL_POOL_BUDGET_GB,
+        help="Memory budget (GB) for warm Whisper models",
+    )
+    parser.add_argument(
+        "--transcript_cache_mb",
+        type=float,
+        default=TRANSCRIPT_CACHE_BUDGET_MB,
+        help="Disk budget (MB) for cached transcripts of previously seen audio (0 = off)",
+    )
+    parser.add_argument(
+        "--ingest",
+        choices=INGEST_MODES,
+        default="pcm",
+        help="Where Whisper's audio comes from (pcm reuses video.mp4, download fetches it again)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="CPU processes for chunked parallel transcription (1 = sequential)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Transcribe in windows and grow subtitle.srt as each one finishes "
+        "(default: one pass, subtitle.srt written at the end)",
+    )
+    parser.add_argument(
+        "--no_resume",
+        action="store_true",
+        help="Ignore the project's manifest.json and redo every stage",
+    )
+
+    args = parser.parse_args(argv)
+    MODEL_POOL.set_budget(args.model_budget_gb)
+    run_transcription(
+        args.url,
+        args.model_size,
+        args.output_folder,
+        log_callback=print_line,
+        max_words=args.max_words,
+        ingest_mode=args.ingest,
+        workers=args.workers,
+        stream=args.stream,
+        resume=not args.no_resume,
+        transcript_cache_mb=args.transcript_cache_mb,
+        progress_callback=print_progress,
+    )
+
+
+if __name__ == "__main__":
+    import multiprocessing
 
-    args = parser.parse_args()
-    run_transcription(args.url, args.model_size, args.output_folder, log_callback=print_line)
+    multiprocessing.freeze_support()
+    main()
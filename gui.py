@@ -1,9 +1,25 @@
+import time
+
+# Time-to-window is measured from here (see ShadowingApp.report_startup)
+STARTUP_STARTED = time.perf_counter()
+
 import os
 import sys
+import math
 import shutil
 import vlc
-import pysrt
-from PyQt5.QtCore import Qt, QTimer, QProcess, QSettings, pyqtSlot, QMetaObject, Q_ARG
+from PyQt5.QtCore import (
+    Qt,
+    QTimer,
+    QProcess,
+    QSettings,
+    pyqtSlot,
+    QMetaObject,
+    Q_ARG,
+    QAbstractListModel,
+    QModelIndex,
+    QPointF,
+)
 from PyQt5.QtWidgets import (
     QApplication,
     QWidget,
@@ -12,6 +28,7 @@ from PyQt5.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QListWidget,
+    QListView,
     QSlider,
     QStyle,
     QFrame,
@@ -24,14 +41,279 @@ from PyQt5.QtWidgets import (
     QComboBox,
     QCheckBox,
     QGridLayout,
+    QProgressBar,
+    QMenu,
+)
+from PyQt5.QtGui import (
+    QFont,
+    QIcon,
+    QPalette,
+    QColor,
+    QTextCursor,
+    QBrush,
+    QPainter,
+    QPen,
+    QPolygonF,
 )
-from PyQt5.QtGui import QFont, QIcon, QPalette, QColor, QTextCursor
+import json
 import threading
-from get_video_and_srt import run_transcription
+from collections import OrderedDict
+import multiprocessing
+from get_video_and_srt import (
+    run_worker,
+    resplit_project,
+    format_progress,
+    ProgressEvent,
+    TRANSCRIBING_MARKER,
+    WORDS_FILE,
+)
+from profiler import PROFILER, PROFILE_DIR
+from recorder import TakeRecorder, ShadowStream
+from audio_analysis import load_media_audio, resample
+from take_archive import TakeArchive, ARCHIVE_RATE
+from pronunciation import ReferenceFeatures, score_take
+from intonation import ReferencePitch, contour as pitch_contour, relative_contour
+from subtitle_index import SubtitleIndex, SubtitleTrack
+from job_queue import (
+    JobQueue,
+    default_queue_path,
+    kill_worker_tree,
+    worker_payload,
+    CANCELLED,
+    FAILED,
+)
 import sounddevice as sd
-from scipy.io.wavfile import write, read as read_wav
 import numpy as np
-import tempfile
+
+IMPORTS_FINISHED = time.perf_counter()
+
+
+# Frozen builds start the transcription worker by re-running the exe with this flag
+WORKER_FLAG = "--transcription-worker"
+
+
+def worker_arguments():
+    """Arguments for ``sys.executable`` that start the transcription worker."""
+    if getattr(sys, "frozen", False):
+        return [WORKER_FLAG]
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "get_video_and_srt.py")
+    return [script, "worker"]
+
+
+def kill_process_tree(process):
+    """Kill a worker QProcess together with the processes it started."""
+    pid = process.processId()
+    if pid:
+        kill_worker_tree(pid)
+    process.kill()
+
+
+class WorkerSlot:
+    """A transcription worker process and the job it is currently running."""
+
+    def __init__(self, parent):
+        self.process = QProcess(parent)
+        self.process.setProgram(sys.executable)
+        self.process.setArguments(worker_arguments())
+        self.job_id = None
+        self.folder = None
+        self.cancelled = False
+
+
+# Shadow mode: how long after a subtitle's end its take still runs
+SHADOW_TAIL_MS = 300
+
+# Projects kept prepared (parsed media + subtitles) for instant switching
+PREPARED_PROJECTS = 4
+MEDIA_PARSE_TIMEOUT_MS = 5000
+
+
+class PreparedProject:
+    """A project's VLC media and subtitles, prepared off the UI thread.
+
+    ``ready`` is set once the folder has been scanned and the subtitles read;
+    ``duration`` (ms) arrives separately, when VLC has parsed the media.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.subtitle_path = os.path.join(folder, "subtitle.srt")
+        self.media = None
+        self.duration = 0
+        self.track = None
+        self.subtitle_file_size = 0
+        self.srt_stamp = None
+        self.live = False
+        self.archive = None
+        self.video_path = None
+        self.references = None  # ReferenceFeatures, once the audio has been analysed
+        self.pitch = None  # ReferencePitch, likewise
+        self.error = None
+        self.ready = False
+
+    def is_current(self):
+        """False once subtitle.srt has changed since it was read, or if
+        preparing failed (so it is retried). Live projects stay current until
+        transcription finishes; append_new_subtitles follows the growing file."""
+        if self.error:
+            return False
+        if self.live:
+            return os.path.exists(os.path.join(self.folder, TRANSCRIBING_MARKER))
+        try:
+            st = os.stat(self.subtitle_path)
+        except OSError:
+            return False
+        return (st.st_mtime_ns, st.st_size) == self.srt_stamp
+
+
+class SubtitleListModel(QAbstractListModel):
+    """Rows of the subtitle pane, read on demand from the loaded subtitles.
+
+    No per-row objects are created; the view only asks for the rows it lays
+    out or paints. Recorded subtitles get a tinted background, and the
+    latest take's pronunciation score is shown after the text.
+    """
+
+    RECORDED_BRUSH = QBrush(QColor(46, 90, 56))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.track = SubtitleTrack.empty()
+        self.recorded = set()
+        self.scores = {}
+
+    def set_track(self, track):
+        self.beginResetModel()
+        self.track = track
+        self.recorded = set()
+        self.scores = {}
+        self.endResetModel()
+
+    def extend_track(self, track):
+        """Switch to ``track``, which is the current track plus rows at the end."""
+        first = len(self.track)
+        if len(track) == first:
+            return
+        self.beginInsertRows(QModelIndex(), first, len(track) - 1)
+        self.track = track
+        self.endInsertRows()
+
+    def mark_recorded(self, row):
+        if 0 <= row < len(self.track) and row not in self.recorded:
+            self.recorded.add(row)
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.BackgroundRole, Qt.ToolTipRole])
+
+    def set_recorded(self, rows):
+        self.recorded = {row for row in rows if 0 <= row < len(self.track)}
+        if len(self.track):
+            self.dataChanged.emit(
+                self.index(0),
+                self.index(len(self.track) - 1),
+                [Qt.BackgroundRole, Qt.ToolTipRole],
+            )
+
+    def set_scores(self, scores):
+        self.scores = {row: score for row, score in scores.items() if 0 <= row < len(self.track)}
+        if len(self.track):
+            self.dataChanged.emit(
+                self.index(0), self.index(len(self.track) - 1), [Qt.DisplayRole]
+            )
+
+    def set_score(self, row, score):
+        if 0 <= row < len(self.track):
+            self.scores[row] = score
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.track)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            if row in self.scores:
+                return f"{self.track.text(row)}  🎯 {self.scores[row]}"
+            return self.track.text(row)
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignLeft | Qt.AlignTop
+        if row in self.recorded:
+            if role == Qt.BackgroundRole:
+                return self.RECORDED_BRUSH
+            if role == Qt.ToolTipRole:
+                return "🎙️ Recorded (right-click to replay takes)"
+        return None
+
+
+class SubtitleListView(QListView):
+    """QListView with the QListWidget-style row helpers the app uses.
+
+    Rows are word-wrapped, so their heights differ; batched layout measures
+    them a chunk at a time instead of all at once when a project opens.
+    """
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setWordWrap(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(100)
+
+    def currentRow(self):
+        index = self.currentIndex()
+        return index.row() if index.isValid() else -1
+
+    def setCurrentRow(self, row):
+        self.setCurrentIndex(self.model().index(row, 0))
+
+
+class PitchContourView(QWidget):
+    """The current subtitle's pitch contour, original and latest take.
+
+    Each contour is stretched over its voiced part and centred on its
+    speaker's median pitch, so only the melody is compared.
+    """
+
+    SEMITONES = 8  # shown above and below the median
+    REFERENCE_PEN = QPen(QColor(200, 200, 200), 2)
+    TAKE_PEN = QPen(QColor(60, 179, 113), 2)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.contours = []
+        self.setFixedSize(200, 50)
+        self.setToolTip("Pitch of the sentence: original (white), your latest take (green)")
+
+    def set_contours(self, reference, take):
+        self.contours = [
+            (relative_contour(semitones), pen)
+            for semitones, pen in [(reference, self.REFERENCE_PEN), (take, self.TAKE_PEN)]
+            if semitones is not None
+        ]
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(30, 30, 30))
+        painter.setRenderHint(QPainter.Antialiasing)
+        middle = self.height() / 2
+        for semitones, pen in self.contours:
+            if len(semitones) < 2:
+                continue
+            painter.setPen(pen)
+            xs = np.linspace(0, self.width() - 1, len(semitones))
+            ys = middle - np.clip(semitones, -self.SEMITONES, self.SEMITONES) * (
+                (middle - 2) / self.SEMITONES
+            )
+            # Unvoiced frames break the line
+            edges = np.flatnonzero(np.diff(np.r_[0, ~np.isnan(ys), 0].astype(np.int8)))
+            for first, last in zip(edges[::2], edges[1::2]):
+                painter.drawPolyline(
+                    QPolygonF([QPointF(x, y) for x, y in zip(xs[first:last], ys[first:last])])
+                )
+        painter.end()
 
 
 class ClickableSlider(QSlider):
@@ -75,6 +357,13 @@ class ShadowingApp(QWidget):
                 self.record_toggle.setChecked(not self.record_toggle.isChecked())
                 self.toggle_record()
                 return True
+            elif event.key() == Qt.Key_H:
+                self.shadow_toggle.setChecked(not self.shadow_toggle.isChecked())
+                self.toggle_shadow()
+                return True
+            elif event.key() == Qt.Key_O:
+                self.overlay_shadow_take()
+                return True
             elif event.key() == Qt.Key_P:
                 self.auto_play_toggle.setChecked(not self.auto_play_toggle.isChecked())
                 self.toggle_auto_play()
@@ -121,23 +410,50 @@ class ShadowingApp(QWidget):
 
         self.manual_jump = False
 
-        self.instance = vlc.Instance()
+        with PROFILER.measure("vlc.instance"):
+            self.instance = vlc.Instance()
         self.player = self.instance.media_player_new()
 
         self.subtitle_index = 0
-        self.subtitles = []
+        self.subtitles = SubtitleTrack.empty()
+        self.subtitle_lookup = SubtitleIndex([], [])
         self.project_folder = ""
+        # Projects are prepared on a background thread (on click, hover, or as
+        # the next in the list) and shown once ready; see load_project
+        self.prepared_projects = OrderedDict()  # folder -> PreparedProject
+        self.requested_project = None  # (folder, click time) waiting to be shown
         self.is_playing = False
         self.total_duration = 0
         self.target_jump_ms = None
 
-        # Set to track recorded subtitles by index.
-        self.recorded_subtitles = set()
 
         self.poll_timer = QTimer(self)
         self.poll_timer.setInterval(300)
         self.poll_timer.timeout.connect(self.sync_with_video)
 
+        # Subtitle boundaries (loop, auto-pause, record, highlight) are handled by a
+        # single-shot timer armed for the exact next start/end instead of waiting
+        # for the next poll. VLC's time-changed events anchor the playback clock
+        # that the timer is scheduled (and re-scheduled) from.
+        self.playback_rate = 1.0
+        self.time_anchor = (-1, 0.0)  # (media ms, perf_counter) of the last VLC tick
+        self.boundary_target = None
+        self.boundary_timer = QTimer(self)
+        self.boundary_timer.setSingleShot(True)
+        self.boundary_timer.setTimerType(Qt.PreciseTimer)
+        self.boundary_timer.timeout.connect(self.on_boundary_timer)
+        self.player.event_manager().event_attach(
+            vlc.EventType.MediaPlayerTimeChanged, self._on_vlc_time_changed
+        )
+
+        # --- Live transcription state (subtitle.srt grows while transcribing) ---
+        self.project_is_live = False
+        self.subtitle_file_size = 0
+        self.live_timer = QTimer(self)
+        self.live_timer.setInterval(1000)
+        self.live_timer.timeout.connect(self.refresh_live_projects)
+        self.live_timer.start()
+
         # --- Study timer state ---
         self.study_timer = QTimer(self)
         self.study_timer.setInterval(1000)  # 1 second tick
@@ -153,11 +469,12 @@ class ShadowingApp(QWidget):
         )
         self.status_output.textChanged.connect(self._auto_scroll_status_output)
 
-        self.process = QProcess(self)
-        self.process.setProgram(sys.executable)
-        self.process.readyReadStandardOutput.connect(self.update_status_output)
-        self.process.readyReadStandardError.connect(self.update_status_output)
-        self.process.finished.connect(self.on_process_finished)
+        # Transcription jobs are kept in a JobQueue on disk and run by worker
+        # processes (see run_worker) that take JSON jobs on stdin and report
+        # JSON events on stdout; one WorkerSlot per job running in parallel.
+        self.job_queue = JobQueue(default_queue_path("youtube_videos"))
+        self.recovered_jobs = self.job_queue.recover()
+        self.worker_slots = []
 
         self.project_list = QListWidget()
         self.video_frame = QFrame()
@@ -198,9 +515,14 @@ class ShadowingApp(QWidget):
         self.record_status_label.setFont(QFont("Arial", 9))
         self.record_status_label.setStyleSheet("padding-left: 5px;")
 
-        self.subtitle_list = QListWidget()
-        self.subtitle_list.setWordWrap(True)
-        self.subtitle_list.itemClicked.connect(self.jump_to_selected_subtitle)
+        self.subtitle_model = SubtitleListModel(self)
+        self.subtitle_list = SubtitleListView(self.subtitle_model)
+        self.subtitle_list.clicked.connect(self.jump_to_selected_subtitle)
+        self.subtitle_list.selectionModel().currentRowChanged.connect(
+            lambda current, previous: self.show_pitch_contours(current.row())
+        )
+        self.subtitle_list.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.subtitle_list.customContextMenuRequested.connect(self.show_take_menu)
 
         self.play_pause_btn = QPushButton(
             self.style().standardIcon(QStyle.SP_MediaPlay), ""
@@ -251,10 +573,54 @@ class ShadowingApp(QWidget):
 
         self.recording = False
         self.playing_recorded = False
+        self.recorder = TakeRecorder()
+        self.last_take = None  # (int16 samples, samplerate) of the latest recording
+
+        # Shadow mode records while the subtitle plays, through a duplex stream
+        self.shadow_toggle = QPushButton("🗣️ Shadow OFF")
+        self.shadow_toggle.setFixedSize(100, 25)
+        self.shadow_toggle.setStyleSheet("font-size: 12px; padding: 2px;")
+        self.shadow_toggle.setCheckable(True)
+        self.shadow_toggle.setToolTip(
+            "Record your voice while the sentence plays, then play both together"
+        )
+        self.shadow_toggle.clicked.connect(self.toggle_shadow)
+        self.shadow_stream = None
+        self.shadow_latency_ms = float(self.settings.value("shadow_latency_ms", 0))
+        self.shadow_armed = None  # (subtitle index, first media ms heard)
+        # Every take is kept in the project's recordings/ archive
+        self.take_archive = None
+        self.recording_index = 0
+        # Pronunciation scores compare takes with the original audio's features
+        self.reference_features = None
+        self.reference_jobs = {}  # folder -> error message (None while running/ok)
+        # Intonation: the original's pitch next to the latest take's
+        self.reference_pitch = None
+        self.take_contours = {}  # take id -> semitone contour
+        self.pitch_view = PitchContourView()
+        self.calibrate_button = QPushButton("🎚️ Calibrate")
+        self.calibrate_button.setToolTip(
+            "Measure the audio round-trip latency (plays a few clicks; use speakers)"
+        )
+        self.calibrate_button.clicked.connect(self.calibrate_shadow_latency)
+        self.overlay_button = QPushButton("🎧 Overlay")
+        self.overlay_button.setToolTip(
+            "O: Replay the subtitle with your shadowing take on top"
+        )
+        self.overlay_button.clicked.connect(self.overlay_shadow_take)
         self.just_finished_recording = False  # flag to prevent immediate re-trigger
 
         self.init_ui()
         self.load_projects()
+        if PROFILER.enabled:
+            self.init_profiler_overlay()
+        self.refresh_job_list()
+        if self.job_queue.pending():
+            self.status_output.append(
+                f"🕒 Resuming {len(self.job_queue.pending())} queued job(s) "
+                f"({self.recovered_jobs} interrupted)."
+            )
+            self.dispatch_jobs()
 
     def init_ui(self):
         control_layout = QHBoxLayout()
@@ -308,6 +674,16 @@ class ShadowingApp(QWidget):
         model_label.setFixedWidth(140)
         model_row.addWidget(model_label)
         model_row.addWidget(self.model_selector)
+        self.prewarm_checkbox = QCheckBox("🔥 Pre-warm")
+        self.prewarm_checkbox.setChecked(
+            str(self.settings.value("prewarm", "false")).lower() == "true"
+        )
+        self.prewarm_checkbox.setToolTip(
+            "After startup, load Whisper and this model in the background "
+            "so the first transcription starts sooner"
+        )
+        self.prewarm_checkbox.toggled.connect(self.toggle_prewarm)
+        model_row.addWidget(self.prewarm_checkbox)
         status_layout.addLayout(model_row)
 
         # --- YouTube URL row ---
@@ -328,13 +704,73 @@ class ShadowingApp(QWidget):
         self.max_words_selector.setToolTip(
             "Maximum number of words before a subtitle may split"
         )
+        self.resplit_button = QPushButton("✂️ Re-split")
+        self.resplit_button.setFixedSize(100, 25)
+        self.resplit_button.setToolTip(
+            "Re-split the current video's subtitles with this max words value"
+        )
+        self.resplit_button.clicked.connect(self.resplit_current_project)
         max_row = QHBoxLayout()
         max_label = QLabel("🧾 Max Words per Subtitle:")
         max_label.setFixedWidth(140)
         max_row.addWidget(max_label)
         max_row.addWidget(self.max_words_selector)
+        max_row.addWidget(self.resplit_button)
         status_layout.addLayout(max_row)
 
+        # --- CPU workers row ---
+        self.workers_selector = QComboBox()
+        self.workers_selector.addItems(
+            [str(i) for i in range(1, (os.cpu_count() or 1) + 1)]
+        )
+        self.workers_selector.setCurrentText("1")  # 1 = sequential
+        self.workers_selector.setToolTip(
+            "CPU processes for chunked parallel transcription (1 = sequential)"
+        )
+        workers_row = QHBoxLayout()
+        workers_label = QLabel("⚙️ CPU Workers:")
+        workers_label.setFixedWidth(140)
+        workers_row.addWidget(workers_label)
+        workers_row.addWidget(self.workers_selector)
+        status_layout.addLayout(workers_row)
+
+        # --- Parallel jobs row ---
+        self.parallel_jobs_selector = QComboBox()
+        self.parallel_jobs_selector.addItems(["1", "2", "3", "4"])
+        self.parallel_jobs_selector.setCurrentText(
+            str(self.settings.value("parallel_jobs", "1"))
+        )
+        self.parallel_jobs_selector.setToolTip(
+            "Videos transcribed at the same time (each job loads its own model)"
+        )
+        self.parallel_jobs_selector.currentTextChanged.connect(self.dispatch_jobs)
+        parallel_row = QHBoxLayout()
+        parallel_label = QLabel("🧵 Parallel Jobs:")
+        parallel_label.setFixedWidth(140)
+        parallel_row.addWidget(parallel_label)
+        parallel_row.addWidget(self.parallel_jobs_selector)
+        status_layout.addLayout(parallel_row)
+
+        # --- Job queue (saved in youtube_videos/.cache/jobs.json) ---
+        self.job_list = QListWidget()
+        self.job_list.setFixedHeight(90)
+        job_buttons_row = QHBoxLayout()
+        job_buttons_row.addWidget(QLabel("🗂️ Jobs:"))
+        job_buttons_row.addStretch()
+        for text, tooltip, handler in [
+            ("⬆️ Up", "Move the selected queued job up", lambda: self.move_selected_job(-1)),
+            ("⬇️ Down", "Move the selected queued job down", lambda: self.move_selected_job(1)),
+            ("⛔ Cancel", "Cancel the selected job (or the running one)", self.cancel_selected_job),
+            ("🧹 Clear", "Remove finished jobs from the list", self.clear_finished_jobs),
+        ]:
+            button = QPushButton(text)
+            button.setFixedSize(70, 25)
+            button.setToolTip(tooltip)
+            button.clicked.connect(handler)
+            job_buttons_row.addWidget(button)
+        status_layout.addLayout(job_buttons_row)
+        status_layout.addWidget(self.job_list)
+
         # --- Status output area ---
         status_header_row = QHBoxLayout()
         status_header_row.addWidget(QLabel("📄 Status:"))
@@ -350,6 +786,17 @@ class ShadowingApp(QWidget):
         status_layout.addLayout(status_header_row)
         status_layout.addWidget(self.status_output)
 
+        # --- Transcription progress (fed by run_transcription's progress events) ---
+        self.progress_label = QLabel("")
+        self.progress_label.setStyleSheet("color: gray;")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setFixedHeight(14)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.hide()
+        status_layout.addWidget(self.progress_label)
+        status_layout.addWidget(self.progress_bar)
+
         status_widget.setLayout(status_layout)
 
         projects_header_layout = QHBoxLayout()
@@ -418,6 +865,13 @@ class ShadowingApp(QWidget):
         toggles_grid.addWidget(self.record_toggle, 2, 0, alignment=Qt.AlignLeft)
         toggles_grid.addWidget(record_hint, 2, 1, alignment=Qt.AlignLeft)
 
+        # Shadow row
+        shadow_hint = QLabel("H: Toggle Shadow")
+        shadow_hint.setStyleSheet("font-size: 10px; color: gray;")
+        shadow_hint.setWordWrap(True)
+        toggles_grid.addWidget(self.shadow_toggle, 3, 0, alignment=Qt.AlignLeft)
+        toggles_grid.addWidget(shadow_hint, 3, 1, alignment=Qt.AlignLeft)
+
         left_controls_layout.addLayout(toggles_grid)
 
         # Add a slim vertical separator between toggles and the right column
@@ -470,6 +924,14 @@ class ShadowingApp(QWidget):
         font_row.addStretch()
         gain_font_layout.addLayout(font_row)
 
+        # Shadow mode calibration / overlay playback
+        shadow_row = QHBoxLayout()
+        shadow_row.setContentsMargins(10, 0, 0, 0)
+        shadow_row.addWidget(self.calibrate_button)
+        shadow_row.addWidget(self.overlay_button)
+        shadow_row.addStretch()
+        gain_font_layout.addLayout(shadow_row)
+
         # Put the recording indicator beneath the gain/font controls (right column)
         gain_font_layout.addWidget(self.record_status_label)
 
@@ -494,6 +956,7 @@ class ShadowingApp(QWidget):
         # Part 1: ONLY the running subtitle
         subtitle_only_layout = QHBoxLayout()
         subtitle_only_layout.addWidget(self.subtitle_display, 1)
+        subtitle_only_layout.addWidget(self.pitch_view)
         video_display_layout.addLayout(subtitle_only_layout)
 
         video_display_widget = QWidget()
@@ -590,6 +1053,10 @@ class ShadowingApp(QWidget):
         self.setLayout(main_layout)
 
         self.project_list.itemClicked.connect(self.load_project)
+        self.project_list.setMouseTracking(True)
+        self.project_list.itemEntered.connect(
+            lambda item: self.preload_project(self.project_path(item))
+        )
         self.play_pause_btn.clicked.connect(self.toggle_play_pause)
         self.skip_back_btn.clicked.connect(lambda: self.seek_relative(-5000))
         self.skip_forward_btn.clicked.connect(lambda: self.seek_relative(5000))
@@ -611,6 +1078,10 @@ class ShadowingApp(QWidget):
         self.sync_with_video()
 
     def toggle_record(self):
+        if self.record_toggle.isChecked() and self.shadow_toggle.isChecked():
+            # Recording after the subtitle and shadowing over it exclude each other
+            self.shadow_toggle.setChecked(False)
+            self.toggle_shadow()
         self.record_toggle.setText(
             "🎙️ Record ON" if self.record_toggle.isChecked() else "🎙️ Record OFF"
         )
@@ -622,7 +1093,278 @@ class ShadowingApp(QWidget):
         # Force sync update so the bottom subtitle remains in sync.
         self.sync_with_video()
 
-    def record_after_subtitle(self, subtitle):
+    def toggle_shadow(self):
+        on = self.shadow_toggle.isChecked()
+        if on and self.record_toggle.isChecked():
+            self.record_toggle.setChecked(False)
+            self.toggle_record()
+        if on and self.shadow_stream is None:
+            try:
+                self.shadow_stream = ShadowStream()
+                self.shadow_stream.start()
+            except Exception as e:
+                self.shadow_stream = None
+                self.shadow_toggle.setChecked(False)
+                self.status_output.append(f"❌ Could not open the audio device: {e}")
+                on = False
+            else:
+                self.status_output.append(
+                    f"🗣️ Shadowing: speak along, takes are kept per subtitle "
+                    f"(latency {self.shadow_latency_ms:.0f} ms)."
+                )
+                if not self.shadow_latency_ms:
+                    self.status_output.append(
+                        "💡 Press 🎚️ Calibrate once so takes line up with the video."
+                    )
+        elif not on and self.shadow_stream is not None:
+            self.shadow_stream.close()
+            self.shadow_stream = None
+        self.shadow_armed = None
+        self.shadow_toggle.setText("🗣️ Shadow ON" if on else "🗣️ Shadow OFF")
+        self.shadow_toggle.setStyleSheet(
+            "font-size: 12px; padding: 2px; background-color: #8A2BE2; color: white;"
+            if on
+            else "font-size: 12px; padding: 2px;"
+        )
+
+    def track_shadow_take(self, current_ms):
+        """Shadow mode: arm while the current subtitle plays; once playback passes
+        its end, cut the take out of the stream's input afterwards."""
+        stream = self.shadow_stream
+        i = self.subtitle_index
+        if stream is None or not self.is_playing or stream.playing:
+            self.shadow_armed = None  # Paused, or an overlay is playing
+            return
+        if not 0 <= i < len(self.subtitles):
+            return
+        start_ms, end_ms = self.subtitles.start(i), self.subtitles.end(i)
+        armed = self.shadow_armed
+        if armed is None or armed[0] != i or current_ms < armed[1]:
+            # (Re-)arm from where playback is now, e.g. after a loop jump back
+            self.shadow_armed = (i, current_ms) if start_ms <= current_ms < end_ms else None
+            return
+        if current_ms < end_ms:
+            return
+        self.shadow_armed = None
+        # Map media times to perf_counter times at the current speed
+        now, rate = time.perf_counter(), self.playback_rate
+        first_ms = armed[1]
+        started = now - (current_ms - first_ms) / rate / 1000
+        ended = now - (current_ms - end_ms - SHADOW_TAIL_MS) / rate / 1000
+        folder = self.project_folder
+        # Cut it once the tail (plus the round trip) has actually been recorded
+        delay_ms = (ended - now) * 1000 + self.shadow_latency_ms + 100
+        QTimer.singleShot(
+            max(int(delay_ms), 0),
+            lambda: self.store_shadow_take(folder, i, first_ms, started, ended, rate),
+        )
+
+    def store_shadow_take(self, folder, index, first_ms, started, ended, rate):
+        if self.shadow_stream is None or folder != self.project_folder:
+            return
+        samplerate = self.shadow_stream.samplerate
+        samples = self.shadow_stream.take(started, ended, self.shadow_latency_ms / 1000)
+        # Pad the front if shadowing began mid-subtitle, so sample 0 stays the start
+        lead = int(round((first_ms - self.subtitles.start(index)) / rate / 1000 * samplerate))
+        samples = np.concatenate([np.zeros(lead, dtype=np.int16), samples])
+        take = self.archive_take(
+            index, samples, samplerate, kind="shadow", rate=rate, latency_ms=self.shadow_latency_ms
+        )
+        if take:
+            self.subtitle_model.mark_recorded(index)
+            self.record_status_label.setText(f"🗣️ Take saved{self.score_text(take)}")
+
+    def archive_take(self, index, samples, samplerate, **meta):
+        """Score a take for subtitle ``index`` and append it to the project's archive."""
+        if self.take_archive is None or not 0 <= index < len(self.subtitles):
+            return None
+        start_ms, end_ms = self.subtitles.start(index), self.subtitles.end(index)
+        score = self.score_recording(start_ms, end_ms, samples, samplerate)
+        if score is not None:
+            self.subtitle_model.set_score(index, score)
+        try:
+            take = self.take_archive.append(
+                samples,
+                samplerate,
+                start_ms=start_ms,
+                end_ms=end_ms,
+                text=self.subtitles.text(index),
+                score=score,
+                **meta,
+            )
+        except OSError as e:
+            self.status_output.append(f"❌ Could not save the take: {e}")
+            return None
+        with PROFILER.measure("take.pitch"):
+            self.take_contours[take["id"]] = pitch_contour(samples, samplerate)
+        if index == self.subtitle_list.currentRow():
+            self.show_pitch_contours(index)
+        return take
+
+    def score_recording(self, start_ms, end_ms, samples, samplerate):
+        """Pronunciation score of a take against the original audio, or None."""
+        if self.reference_features is None:
+            return None
+        with PROFILER.measure("take.score"):
+            try:
+                return score_take(
+                    samples, samplerate, self.reference_features.span(start_ms, end_ms)
+                )
+            except Exception as e:
+                self.status_output.append(f"⚠️ Could not score the take: {e}")
+                return None
+
+    @staticmethod
+    def score_text(take):
+        if take is None or take.get("score") is None:
+            return ""
+        return f" · 🎯 {take['score']}"
+
+    def show_pitch_contours(self, row):
+        """Show the pitch of subtitle ``row``: the original's from the project's
+        contour cache, and its latest take's."""
+        reference = take_contour = None
+        if 0 <= row < len(self.subtitles):
+            if self.reference_pitch is not None:
+                reference = self.reference_pitch.span(
+                    self.subtitles.start(row), self.subtitles.end(row)
+                )
+            takes = self.takes_for_row(row)
+            if takes:
+                take_contour = self.take_contour(takes[-1])
+        self.pitch_view.set_contours(reference, take_contour)
+
+    def take_contour(self, take):
+        # Takes from earlier sessions are decoded on first view
+        if take["id"] not in self.take_contours:
+            try:
+                audio = self.take_archive.read(take)
+            except Exception:
+                return None
+            self.take_contours[take["id"]] = pitch_contour(audio, ARCHIVE_RATE)
+        return self.take_contours[take["id"]]
+
+    def takes_for_row(self, row):
+        if self.take_archive is None:
+            return []
+        return self.take_archive.by_subtitle(self.subtitle_lookup).get(row, [])
+
+    def show_take_menu(self, pos):
+        row = self.subtitle_list.indexAt(pos).row()
+        takes = self.takes_for_row(row)
+        if not takes:
+            return
+        menu = QMenu(self)
+        for take in reversed(takes):  # Newest first
+            label = (
+                f"{'🗣️' if take['kind'] == 'shadow' else '🎙️'} "
+                f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(take['created']))} · "
+                f"{take['sample_count'] / ARCHIVE_RATE:.1f}s{self.score_text(take)}"
+            )
+            menu.addAction(f"▶️ {label}", lambda take=take: self.play_archived_take(take))
+            if take["kind"] == "shadow":
+                menu.addAction(
+                    f"🎧 {label} over the video",
+                    lambda take=take: self.overlay_shadow_take(take),
+                )
+        menu.exec_(self.subtitle_list.viewport().mapToGlobal(pos))
+
+    def play_archived_take(self, take):
+        try:
+            audio = self.take_archive.read(take)
+            sd.play(np.clip(audio * self.record_gain(), -32768, 32767).astype(np.int16), ARCHIVE_RATE)
+        except Exception as e:
+            self.status_output.append(f"❌ Playback error: {str(e)}")
+
+    def calibrate_shadow_latency(self):
+        if self.is_playing:
+            self.toggle_play_pause()  # The video's audio would drown the clicks
+        stream = self.shadow_stream
+        if stream is None:
+            try:
+                stream = ShadowStream()
+                stream.start()
+            except Exception as e:
+                self.status_output.append(f"❌ Could not open the audio device: {e}")
+                return
+        self.calibrate_button.setEnabled(False)
+        self.status_output.append("🎚️ Calibrating: listen for four clicks...")
+
+        def run():
+            try:
+                self.calibration_result = (stream.calibrate(), None)
+            except Exception as e:
+                self.calibration_result = (None, str(e))
+            if stream is not self.shadow_stream:
+                stream.close()
+            QMetaObject.invokeMethod(self, "on_calibration_finished", Qt.QueuedConnection)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    @pyqtSlot()
+    def on_calibration_finished(self):
+        latency_ms, error = self.calibration_result
+        self.calibrate_button.setEnabled(True)
+        if error:
+            self.status_output.append(f"❌ Calibration failed: {error}")
+            return
+        self.shadow_latency_ms = latency_ms
+        self.settings.setValue("shadow_latency_ms", latency_ms)
+        self.status_output.append(f"🎚️ Round-trip latency: {latency_ms:.0f} ms")
+
+    def overlay_shadow_take(self, take=None):
+        """Replay a subtitle with a shadowing take (by default the current
+        subtitle's latest) mixed in."""
+        if take is None:
+            shadow_takes = [
+                t for t in self.takes_for_row(self.subtitle_index) if t["kind"] == "shadow"
+            ]
+            take = shadow_takes[-1] if shadow_takes else None
+        if take is None:
+            self.status_output.append("⚠️ No shadowing take for this subtitle yet.")
+            return
+        if self.shadow_stream is None:
+            self.status_output.append("⚠️ Turn on 🗣️ Shadow to play takes over the video.")
+            return
+        audio = resample(self.take_archive.read(take), ARCHIVE_RATE, self.shadow_stream.samplerate)
+        # Takes line up with the video at the speed they were recorded at
+        if take["rate"] != self.playback_rate:
+            self.speed_slider.setValue(int(round(take["rate"] * 10)))
+        self.shadow_armed = None
+        self.player.set_time(take["start_ms"])
+        if not self.is_playing:
+            self.toggle_play_pause()
+        self.start_overlay(take, audio)
+
+    def start_overlay(self, take, audio, retries=40):
+        # Wait for VLC to land on the subtitle, then start the take where it is now
+        current_ms = self.playback_position()
+        if not take["start_ms"] <= current_ms < take["start_ms"] + 1000 and retries:
+            QTimer.singleShot(25, lambda: self.start_overlay(take, audio, retries - 1))
+            return
+        if self.shadow_stream is None:
+            return
+        samplerate = self.shadow_stream.samplerate
+        offset = int((current_ms - take["start_ms"]) / take["rate"] / 1000 * samplerate)
+        samples = audio[max(offset, 0) :]
+        gain = self.record_gain()
+        self.shadow_stream.play(np.clip(samples * gain, -32768, 32767).astype(np.int16))
+        self.record_status_label.setText("🎧 Overlay...")
+        QTimer.singleShot(
+            int(len(samples) / samplerate * 1000),
+            lambda: self.record_status_label.setText(""),
+        )
+
+    def record_gain(self):
+        # Get the gain factor from the dropdown. Defaults to 10 if conversion fails.
+        try:
+            return float(self.gain_selector.currentText())
+        except Exception:
+            return 10.0
+
+    def record_after_subtitle(self, index, late_ms=0):
+        # late_ms: how far playback had already run past the subtitle end
+        detected = time.perf_counter()
         self.recording = True
         self.record_status_label.setText("🔴 Recording...")
         # Pause video before recording.
@@ -630,52 +1372,39 @@ class ShadowingApp(QWidget):
             self.player.pause()
             self.is_playing = False
             self.play_pause_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
-        duration = (
-            (subtitle.end.ordinal - subtitle.start.ordinal) * 1.1 / 1000.0
-        ) + 2.0  # seconds
-        samplerate = 44100
-        self.temp_wav_file = tempfile.NamedTemporaryFile(
-            suffix=".wav", delete=False
-        ).name
-
-        def record_and_play():
-            try:
-                audio = sd.rec(
-                    int(duration * samplerate),
-                    samplerate=samplerate,
-                    channels=1,
-                    dtype="int16",
-                )
-                sd.wait()  # Wait until recording is finished.
-                write(self.temp_wav_file, samplerate, audio)
-                self.recording = False
-                self.playing_recorded = True
-                QMetaObject.invokeMethod(
-                    self,
-                    "play_recorded_audio_wrapper",
-                    Qt.QueuedConnection,
-                    Q_ARG(str, self.temp_wav_file),
-                )
-            except Exception as e:
-                self.recording = False
-                self.record_status_label.setText("⚠️ Rec Failed")
-                self.status_output.append(f"❌ Recording error: {str(e)}")
+        subtitle_seconds = (self.subtitles.end(index) - self.subtitles.start(index)) / 1000.0
+        self.recording_index = index
+        try:
+            # The take ends once the learner has spoken and gone quiet; the old
+            # fixed length (subtitle * 1.1 + 2 s) is now only the upper bound
+            self.recorder.start(
+                max_seconds=subtitle_seconds * 1.1 + 2.0,
+                min_seconds=subtitle_seconds * 0.5,
+                on_finished=self._on_take_recorded,
+            )
+        except Exception as e:
+            self.recording = False
+            self.record_status_label.setText("⚠️ Rec Failed")
+            self.status_output.append(f"❌ Recording error: {str(e)}")
+            return
+        PROFILER.record("record.start_delay", late_ms / 1000 + time.perf_counter() - detected)
 
-        threading.Thread(target=record_and_play).start()
+    def _on_take_recorded(self, take, samplerate):
+        # Called on the audio thread when the take has ended
+        self.last_take = (take, samplerate)
+        self.recording = False
+        self.playing_recorded = True
+        QMetaObject.invokeMethod(self, "play_recorded_audio_wrapper", Qt.QueuedConnection)
 
-    @pyqtSlot(str)
-    def play_recorded_audio_wrapper(self, filepath):
-        self.record_status_label.setText("🔊 Playing...")
-        self.play_recorded_audio(filepath)
+    @pyqtSlot()
+    def play_recorded_audio_wrapper(self):
+        take = self.archive_take(self.recording_index, *self.last_take, kind="after")
+        self.record_status_label.setText(f"🔊 Playing...{self.score_text(take)}")
+        self.play_recorded_audio(*self.last_take)
 
-    def play_recorded_audio(self, filepath):
+    def play_recorded_audio(self, data, samplerate):
         try:
-            samplerate, data = read_wav(filepath)
-            # Get the gain factor from the dropdown. Defaults to 10 if conversion fails.
-            try:
-                gain = float(self.gain_selector.currentText())
-            except Exception:
-                gain = 10.0
+            gain = self.record_gain()
             # Increase volume by applying the selected gain factor.
             data = np.clip(data * gain, -32768, 32767).astype(np.int16)
             playback_duration = int((data.shape[0] / samplerate) * 1000)
@@ -690,17 +1419,17 @@ class ShadowingApp(QWidget):
         self.just_finished_recording = True
         QTimer.singleShot(1000, lambda: setattr(self, "just_finished_recording", False))
         self.record_status_label.setText("")
-        # Mark the current subtitle as recorded.
-        self.recorded_subtitles.add(self.subtitle_index)
+        # Mark the recorded subtitle (its take is in the archive by now).
+        self.subtitle_model.mark_recorded(self.recording_index)
         # Update subtitle display and list without advancing if loop is on.
         if 0 <= self.subtitle_index < len(self.subtitles):
             self.subtitle_display.setText(
-                self.subtitles[self.subtitle_index].text.strip()
+                self.subtitles.text(self.subtitle_index)
             )
             self.subtitle_list.setCurrentRow(self.subtitle_index)
             # Only set player time here if loop is on; for other cases we handle below
             if self.loop_current:
-                self.player.set_time(self.subtitles[self.subtitle_index].start.ordinal)
+                self.player.set_time(self.subtitles.start(self.subtitle_index))
 
         # Apply auto play logic after recording
         if not self.auto_play_enabled:
@@ -708,7 +1437,7 @@ class ShadowingApp(QWidget):
                 # Jump back to start of current subtitle and pause
                 if 0 <= self.subtitle_index < len(self.subtitles):
                     self.player.set_time(
-                        self.subtitles[self.subtitle_index].start.ordinal
+                        self.subtitles.start(self.subtitle_index)
                     )
             else:
                 # Loop is off: jump to start of next subtitle (if exists)
@@ -716,11 +1445,11 @@ class ShadowingApp(QWidget):
                 if next_idx < len(self.subtitles):
                     self.subtitle_index = next_idx
                     self.subtitle_display.setText(
-                        self.subtitles[self.subtitle_index].text.strip()
+                        self.subtitles.text(self.subtitle_index)
                     )
                     self.subtitle_list.setCurrentRow(self.subtitle_index)
                     self.player.set_time(
-                        self.subtitles[self.subtitle_index].start.ordinal
+                        self.subtitles.start(self.subtitle_index)
                     )
             # Pause the video
             if self.is_playing:
@@ -737,11 +1466,11 @@ class ShadowingApp(QWidget):
                 if self.subtitle_index < len(self.subtitles) - 1:
                     self.subtitle_index += 1
                     self.subtitle_display.setText(
-                        self.subtitles[self.subtitle_index].text.strip()
+                        self.subtitles.text(self.subtitle_index)
                     )
                     self.subtitle_list.setCurrentRow(self.subtitle_index)
                     self.player.set_time(
-                        self.subtitles[self.subtitle_index].start.ordinal
+                        self.subtitles.start(self.subtitle_index)
                     )
             if not self.is_playing:
                 self.player.play()
@@ -763,11 +1492,14 @@ class ShadowingApp(QWidget):
             # Stop and clear current playback and subtitles
             self.player.stop()
             self.player.set_media(None)
-            self.subtitle_list.clear()
+            self.take_archive = None
+            self.reference_features = None
+            self.reference_pitch = None
+            self.set_subtitle_track(SubtitleTrack.empty())  # Unmaps subtitle.idx
             self.subtitle_display.setText("--")
             self.project_folder = ""
-            self.subtitles = []
             self.subtitle_index = 0
+        self.prepared_projects.pop(project_path, None)
         confirm = QMessageBox.question(
             self,
             "Delete YouTube Video",
@@ -793,32 +1525,245 @@ class ShadowingApp(QWidget):
             self.status_output.append(f"🔄 Processing: {url}")
             self.status_output.append(f"🧠 Using Whisper model: {model_size}")
 
-            def background_task():
-                try:
-                    max_words = int(self.max_words_selector.currentText())
-                    run_transcription(
-                        url,
-                        model_size,
-                        "youtube_videos",
-                        log_callback=self.status_output.append,
-                        max_words=max_words,
+            self.job_queue.add(
+                url,
+                model_size=model_size,
+                output_folder="youtube_videos",
+                max_words=int(self.max_words_selector.currentText()),
+                workers=int(self.workers_selector.currentText()),
+                stream=True,  # The project can be opened while it is transcribing
+            )
+            if len(self.job_queue.pending()) > self.free_slot_count():
+                self.status_output.append(
+                    f"🕒 Queued ({len(self.job_queue.pending())} waiting)"
+                )
+            self.dispatch_jobs()
+
+    def report_startup(self):
+        """Log time-to-window; runs on the first event-loop pass after show()."""
+        PROFILER.record("startup.imports", IMPORTS_FINISHED - STARTUP_STARTED)
+        PROFILER.record("startup.window", time.perf_counter() - STARTUP_STARTED)
+        heavy = [name for name in ("whisper", "torch", "yt_dlp") if name in sys.modules]
+        self.status_output.append(
+            f"🚀 Window ready in {time.perf_counter() - STARTUP_STARTED:.2f}s "
+            f"(imports {IMPORTS_FINISHED - STARTUP_STARTED:.2f}s, transcription stack "
+            + (f"loaded: {', '.join(heavy)})" if heavy else "not loaded)")
+        )
+        if self.prewarm_checkbox.isChecked():
+            self.prewarm_worker()
+
+    def toggle_prewarm(self, checked):
+        self.settings.setValue("prewarm", checked)
+        if checked:
+            self.prewarm_worker()
+
+    def prewarm_worker(self):
+        """Start a worker that imports Whisper and loads the selected model now."""
+        if self.worker_slots:
+            return  # A worker is already running (and warm after its first job)
+        slot = self.create_worker_slot()
+        slot.process.start()
+        if not slot.process.waitForStarted(5000):
+            self.status_output.append("❌ Could not start the transcription worker.")
+            return
+        request = {"prewarm": True, "model_size": self.model_selector.currentText()}
+        slot.process.write((json.dumps(request) + "\n").encode("utf-8"))
+
+    def init_profiler_overlay(self):
+        """Small always-on-top panel with live timing percentiles (profile mode)."""
+        self.profiler_overlay = QLabel(self)
+        self.profiler_overlay.setFont(QFont("Courier New", 8))
+        self.profiler_overlay.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 180); color: #7CFC00; padding: 4px;"
+        )
+        self.profiler_overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.profiler_timer = QTimer(self)
+        self.profiler_timer.setInterval(1000)
+        self.profiler_timer.timeout.connect(self.update_profiler_overlay)
+        self.profiler_timer.start()
+        self.status_output.append(
+            f"⏱️ Profiling on: timings are saved to {PROFILE_DIR}/ when the app closes."
+        )
+
+    def update_profiler_overlay(self):
+        self.profiler_overlay.setText(PROFILER.format_overlay() + "\n(ms)")
+        self.profiler_overlay.adjustSize()
+        self.profiler_overlay.move(self.width() - self.profiler_overlay.width() - 10, 10)
+        self.profiler_overlay.raise_()
+        self.profiler_overlay.show()
+
+    def free_slot_count(self):
+        busy = sum(1 for slot in self.worker_slots if slot.job_id is not None)
+        return max(0, int(self.parallel_jobs_selector.currentText()) - busy)
+
+    def dispatch_jobs(self):
+        """Start queued jobs until every allowed worker slot is busy."""
+        limit = int(self.parallel_jobs_selector.currentText())
+        while self.job_queue.pending():
+            slot = next((s for s in self.worker_slots if s.job_id is None), None)
+            if slot is None:
+                if len(self.worker_slots) >= limit:
+                    break
+                slot = self.create_worker_slot()
+            elif self.worker_slots.index(slot) >= limit:
+                break
+            if slot.process.state() == QProcess.NotRunning:
+                slot.process.start()
+                if not slot.process.waitForStarted(5000):
+                    self.status_output.append(
+                        "❌ Could not start the transcription worker."
                     )
-                    self.status_output.append("✅ Done. Refreshing list...")
-                    self.load_projects()
-                except Exception as e:
-                    self.status_output.append(f"❌ Error: {str(e)}")
+                    break
+            job = self.job_queue.claim_next()
+            slot.job_id = job["id"]
+            slot.folder = None
+            slot.cancelled = False
+            slot.process.write((json.dumps(worker_payload(job)) + "\n").encode("utf-8"))
+        self.refresh_job_list()
+
+    def create_worker_slot(self):
+        slot = WorkerSlot(self)
+        slot.process.readyReadStandardOutput.connect(
+            lambda: self.update_status_output(slot)
+        )
+        slot.process.readyReadStandardError.connect(
+            lambda: self.update_status_output(slot)
+        )
+        slot.process.finished.connect(lambda: self.on_process_finished(slot))
+        self.worker_slots.append(slot)
+        return slot
+
+    def refresh_job_list(self):
+        selected = self.selected_job_id()
+        self.job_list.clear()
+        for job in self.job_queue.jobs:
+            item = QListWidgetItem(JobQueue.describe(job))
+            item.setData(Qt.UserRole, job["id"])
+            if job.get("error"):
+                item.setToolTip(job["error"])
+            self.job_list.addItem(item)
+            if job["id"] == selected:
+                self.job_list.setCurrentItem(item)
+
+    def selected_job_id(self):
+        item = self.job_list.currentItem()
+        return item.data(Qt.UserRole) if item else None
+
+    def move_selected_job(self, offset):
+        job_id = self.selected_job_id()
+        if job_id is not None and self.job_queue.move(job_id, offset):
+            self.refresh_job_list()
+
+    def cancel_selected_job(self):
+        job_id = self.selected_job_id()
+        if job_id is None:
+            # Nothing selected: cancel the oldest running job
+            running = [slot.job_id for slot in self.worker_slots if slot.job_id]
+            job_id = min(running) if running else None
+        if job_id is None or self.job_queue.cancel(job_id) is None:
+            self.status_output.append("ℹ️ No transcription to cancel.")
+            return
+        slot = next((s for s in self.worker_slots if s.job_id == job_id), None)
+        if slot is not None:
+            slot.cancelled = True
+            kill_process_tree(slot.process)
+        else:
+            self.status_output.append(
+                f"⛔ Cancelled: {self.job_queue.get(job_id)['url']}"
+            )
+        self.refresh_job_list()
+
+    def clear_finished_jobs(self):
+        self.job_queue.clear_finished()
+        self.refresh_job_list()
 
-            threading.Thread(target=background_task).start()
+    def show_progress(self, percent, text):
+        self.progress_label.setText(text)
+        self.progress_bar.show()
+        if percent < 0:
+            self.progress_bar.setRange(0, 0)  # busy indicator
+        else:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(percent)
 
-    def on_process_finished(self):
+    def finish_job(self, slot, text):
+        self.status_output.append(text)
+        slot.job_id = None
+        slot.folder = None
+        if not any(s.job_id is not None for s in self.worker_slots):
+            self.progress_bar.hide()
+            self.progress_label.setText("")
         self.load_projects()
+        self.dispatch_jobs()
+
+    def handle_worker_event(self, slot, event):
+        job_id = event.pop("job_id", None)
+        job = self.job_queue.get(job_id)
+        state = job and job["state"]
+        self.job_queue.apply_event(job_id, event)
+        if job and job["state"] != state:
+            self.refresh_job_list()
+        if job and job["state"] == CANCELLED and not slot.cancelled:
+            # Cancelled from the command line (``queue --cancel``)
+            slot.cancelled = True
+            kill_process_tree(slot.process)
+            return
+        kind = event.pop("type")
+        prefix = f"[#{job_id}] " if len(self.worker_slots) > 1 else ""
+        if kind == "log":
+            self.status_output.append(prefix + event["text"])
+        elif kind == "progress":
+            progress = ProgressEvent(**event)
+            percent = (
+                int(progress.processed / progress.total * 100) if progress.total else -1
+            )
+            self.show_progress(percent, prefix + format_progress(progress))
+        elif kind == "project":
+            slot.folder = event["folder"]
+        elif kind == "prewarmed":
+            self.status_output.append(
+                f"🔥 Whisper ({event['model_size']}) pre-warmed in {event['seconds']:.1f}s"
+            )
+        elif kind == "done":
+            self.finish_job(slot, f"✅ {prefix}Done. Refreshing list...")
+        elif kind == "failed":
+            self.finish_job(slot, f"❌ {prefix}Transcription failed.")
+
+    def on_process_finished(self, slot):
+        if slot.job_id is None:
+            self.load_projects()
+            return
+        if slot.cancelled:
+            # A killed worker can't clean up after itself
+            if slot.folder:
+                marker = os.path.join(slot.folder, TRANSCRIBING_MARKER)
+                if os.path.exists(marker):
+                    os.remove(marker)
+            slot.cancelled = False
+            job = self.job_queue.get(slot.job_id)
+            self.finish_job(slot, f"⛔ Cancelled: {job['url'] if job else slot.job_id}")
+        else:
+            self.job_queue.update(
+                slot.job_id, state=FAILED, error="worker stopped unexpectedly"
+            )
+            self.finish_job(slot, "❌ Transcription worker stopped unexpectedly.")
 
-    def update_status_output(self):
-        data = (
-            self.process.readAllStandardOutput() + self.process.readAllStandardError()
+    def update_status_output(self, slot):
+        errors = bytes(slot.process.readAllStandardError()).decode(
+            "utf-8", errors="replace"
         )
-        text = str(data, encoding="utf-8")
-        self.status_output.append(text)
+        if errors.strip():
+            self.status_output.append(errors.strip())
+        while slot.process.canReadLine():
+            line = bytes(slot.process.readLine()).decode("utf-8", errors="replace")
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                self.status_output.append(line.strip())
+                continue
+            self.handle_worker_event(slot, event)
 
     def toggle_play_pause(self):
         if self.is_playing:
@@ -831,7 +1776,9 @@ class ShadowingApp(QWidget):
             if not self.auto_play_enabled:
                 self.auto_play_paused_for_subtitle = False
         self.is_playing = not self.is_playing
+        self.schedule_next_boundary()
 
+    @PROFILER.timed("load_projects")
     def load_projects(self):
         existing_projects = {
             self.project_list.item(i).text() for i in range(self.project_list.count())
@@ -851,43 +1798,312 @@ class ShadowingApp(QWidget):
             if self.project_list.item(i).text() not in updated_projects:
                 self.project_list.takeItem(i)
 
+    def project_path(self, item):
+        return os.path.join("youtube_videos", item.text())
+
     def load_project(self, item):
-        project_title = item.text()
-        self.project_folder = os.path.join("youtube_videos", project_title)
-        video_file = next(
-            (f for f in os.listdir(self.project_folder) if f.startswith("video")), None
+        folder = self.project_path(item)
+        self.requested_project = (folder, time.perf_counter())
+        prepared = self.prepare_project(folder)
+        if prepared.ready:
+            self.show_prepared_project(prepared)
+        else:
+            self.subtitle_display.setText("⏳ Loading...")
+
+    def prepare_project(self, folder):
+        """Start preparing ``folder`` in the background unless it already is
+        (or was, and is still current); returns its PreparedProject."""
+        prepared = self.prepared_projects.get(folder)
+        if prepared is not None and (not prepared.ready or prepared.is_current()):
+            self.prepared_projects.move_to_end(folder)
+            return prepared
+        prepared = PreparedProject(folder)
+        if folder == self.project_folder:
+            # Keep appending through the open archive, never a second instance
+            prepared.archive = self.take_archive
+        self.prepared_projects[folder] = prepared
+        for old in list(self.prepared_projects):
+            if len(self.prepared_projects) <= PREPARED_PROJECTS:
+                break
+            if old != self.project_folder:
+                del self.prepared_projects[old]
+        threading.Thread(
+            target=self._prepare_project_files, args=(prepared,), daemon=True
+        ).start()
+        return prepared
+
+    def preload_project(self, folder):
+        """Prepare a project the user is likely to open next (hovered, or below
+        the one just opened). The open project is left alone."""
+        if folder != self.project_folder:
+            self.prepare_project(folder)
+
+    def _prepare_project_files(self, prepared):
+        # Runs on a background thread; the result is picked up by on_project_prepared
+        try:
+            video_file = next(
+                (f for f in os.listdir(prepared.folder) if f.startswith("video")), None
+            )
+            if not video_file:
+                prepared.error = "⚠️ No video found"
+            else:
+                media = self.instance.media_new(os.path.join(prepared.folder, video_file))
+                media.event_manager().event_attach(
+                    vlc.EventType.MediaParsedChanged,
+                    lambda event: QMetaObject.invokeMethod(
+                        self,
+                        "on_media_parsed",
+                        Qt.QueuedConnection,
+                        Q_ARG(str, prepared.folder),
+                    ),
+                )
+                # Set before parsing starts: the parsed event may fire right away
+                prepared.media = media
+                media.parse_with_options(
+                    vlc.MediaParseFlag.local, MEDIA_PARSE_TIMEOUT_MS
+                )
+                prepared.live = os.path.exists(
+                    os.path.join(prepared.folder, TRANSCRIBING_MARKER)
+                )
+                st = os.stat(prepared.subtitle_path)
+                with PROFILER.measure("srt.parse"):
+                    prepared.track, prepared.subtitle_file_size = self.read_subtitle_track(
+                        prepared.subtitle_path, prepared.live
+                    )
+                prepared.srt_stamp = (st.st_mtime_ns, st.st_size)
+                if prepared.archive is None:
+                    # Read-only: the project may never be opened
+                    prepared.archive = TakeArchive(prepared.folder, repair=False)
+                prepared.video_path = os.path.join(prepared.folder, video_file)
+                prepared.references = ReferenceFeatures.load(prepared.folder)
+                prepared.pitch = ReferencePitch.load(prepared.folder)
+        except Exception as e:
+            prepared.error = f"❌ Failed to load project: {e}"
+        prepared.ready = True
+        QMetaObject.invokeMethod(
+            self, "on_project_prepared", Qt.QueuedConnection, Q_ARG(str, prepared.folder)
         )
-        subtitle_path = os.path.join(self.project_folder, "subtitle.srt")
-        if not video_file:
-            self.subtitle_display.setText("⚠️ No video found")
+
+    @pyqtSlot(str)
+    def on_project_prepared(self, folder):
+        prepared = self.prepared_projects.get(folder)
+        requested = self.requested_project and self.requested_project[0] == folder
+        # A stale notification may arrive after the folder was re-requested
+        if prepared is not None and prepared.ready and requested:
+            self.show_prepared_project(prepared)
+
+    @pyqtSlot(str)
+    def on_media_parsed(self, folder):
+        prepared = self.prepared_projects.get(folder)
+        if prepared is None or prepared.media is None:
+            return
+        prepared.duration = max(prepared.media.get_duration(), 0)
+        if folder == self.project_folder:
+            if prepared.duration:
+                self.set_total_duration(prepared.duration)
+            else:
+                # Parsing failed or timed out; ask the player once it is running
+                QTimer.singleShot(1000, self.set_total_duration)
+
+    def show_prepared_project(self, prepared):
+        folder, requested_at = self.requested_project
+        self.requested_project = None
+        if prepared.error:
+            self.subtitle_display.setText(prepared.error)
             return
-        video_path = os.path.join(self.project_folder, video_file)
-        media = self.instance.media_new(video_path)
-        self.player.set_media(media)
+        self.project_folder = folder
+        self.player.set_media(prepared.media)
         if sys.platform.startswith("linux"):
             self.player.set_xwindow(self.video_frame.winId())
         elif sys.platform == "win32":
             self.player.set_hwnd(self.video_frame.winId())
         elif sys.platform == "darwin":
             self.player.set_nsobject(int(self.video_frame.winId()))
-        self.subtitles = pysrt.open(subtitle_path)
-        # Reset recorded subtitles when loading a new project.
-        self.recorded_subtitles = set()
+        self.project_is_live = prepared.live
+        self.subtitle_file_size = prepared.subtitle_file_size
+        self.take_archive = prepared.archive
+        try:
+            self.take_archive.repair()
+        except OSError as e:
+            self.status_output.append(f"⚠️ Could not repair the takes archive: {e}")
+        self.reference_features = prepared.references
+        self.reference_pitch = prepared.pitch
+        self.take_contours = {}
+        if self.reference_features is None or self.reference_pitch is None:
+            self.analyse_reference_audio(prepared)
+        # Recorded markers and scores come from this project's take archive
+        self.set_subtitle_track(prepared.track)
+        if self.take_archive.takes:
+            self.status_output.append(
+                f"🎙️ {len(self.take_archive.takes)} takes recorded for this video "
+                f"({self.take_archive.size_bytes() / 1e6:.1f} MB)."
+            )
+        if self.project_is_live:
+            self.status_output.append(
+                "⏳ Still transcribing — new subtitles will appear as they are ready."
+            )
         self.auto_play_paused_for_subtitle = False  # Reset pause flag for new project
-        self.subtitle_list.clear()
-        for sub in self.subtitles:
-            item = QListWidgetItem(sub.text.strip())
-            item.setTextAlignment(Qt.AlignLeft | Qt.AlignTop)
-            self.subtitle_list.addItem(item)
         self.subtitle_index = 0
         self.player.play()
         self.is_playing = True
         self.play_pause_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaPause))
         self.poll_timer.start()
-        QTimer.singleShot(1000, self.set_total_duration)
+        # Known from the first frame if VLC has already parsed the media
+        if prepared.duration:
+            self.set_total_duration(prepared.duration)
+        PROFILER.record("project.load", time.perf_counter() - requested_at)
+        # Get the next project ready too, in case it is opened next
+        next_item = self.project_list.item(self.project_list.currentRow() + 1)
+        if next_item is not None:
+            self.preload_project(self.project_path(next_item))
+
+    @staticmethod
+    def read_subtitle_track(subtitle_path, live):
+        """A project's subtitles and the SRT bytes they cover. Finished projects
+        come from the memory-mapped subtitle.idx; a live SRT is still growing, so
+        it is parsed in memory and followed by append_new_subtitles."""
+        if live:
+            with open(subtitle_path, "rb") as f:
+                return SubtitleTrack.from_srt_bytes(f.read())
+        return SubtitleTrack.open(subtitle_path), os.path.getsize(subtitle_path)
+
+    def set_subtitle_track(self, track):
+        # Row numbers may have changed, so the recorded markers are re-matched
+        self.subtitles = track
+        self.subtitle_lookup = SubtitleIndex.from_track(track)
+        self.subtitle_model.set_track(track)
+        if self.take_archive is not None:
+            takes = self.take_archive.by_subtitle(self.subtitle_lookup)
+            self.subtitle_model.set_recorded(takes)
+            self.subtitle_model.set_scores(
+                {
+                    row: row_takes[-1]["score"]
+                    for row, row_takes in takes.items()
+                    if row_takes[-1].get("score") is not None
+                }
+            )
+
+    def analyse_reference_audio(self, prepared):
+        """Compute a project's reference features and pitch contour on a
+        background thread (once; they are saved in the project folder)."""
+        if prepared.folder in self.reference_jobs:
+            return
+        self.reference_jobs[prepared.folder] = None
+        self.status_output.append(
+            "🧮 Analysing the original audio for pronunciation scores and intonation..."
+        )
+
+        def run():
+            try:
+                with PROFILER.measure("reference.analyse"):
+                    samples = load_media_audio(prepared.video_path)
+                    if prepared.references is None:
+                        ReferenceFeatures.build(prepared.folder, samples)
+                    if prepared.pitch is None:
+                        ReferencePitch.build(prepared.folder, samples)
+            except Exception as e:
+                self.reference_jobs[prepared.folder] = str(e)
+            QMetaObject.invokeMethod(
+                self,
+                "on_reference_audio_analysed",
+                Qt.QueuedConnection,
+                Q_ARG(str, prepared.folder),
+            )
+
+        threading.Thread(target=run, daemon=True).start()
+
+    @pyqtSlot(str)
+    def on_reference_audio_analysed(self, folder):
+        error = self.reference_jobs.pop(folder, None)
+        if error:
+            self.status_output.append(
+                f"⚠️ No pronunciation scores or intonation for this video: {error}"
+            )
+            return
+        references = ReferenceFeatures.load(folder)
+        pitch = ReferencePitch.load(folder)
+        prepared = self.prepared_projects.get(folder)
+        if prepared is not None:
+            prepared.references, prepared.pitch = references, pitch
+        if folder == self.project_folder:
+            self.reference_features, self.reference_pitch = references, pitch
+            self.status_output.append("🎯 Pronunciation scores and intonation are ready.")
+            self.show_pitch_contours(self.subtitle_list.currentRow())
+
+    def resplit_current_project(self):
+        if not self.project_folder:
+            self.status_output.append("⚠️ Select a YouTube video first.")
+            return
+        if self.project_is_live:
+            self.status_output.append("⚠️ Wait until transcription has finished.")
+            return
+        if not os.path.exists(os.path.join(self.project_folder, WORDS_FILE)):
+            self.status_output.append(
+                f"⚠️ No {WORDS_FILE} for this video (transcribed by an older version)."
+            )
+            return
+        max_words = int(self.max_words_selector.currentText())
+        # Unmap the old subtitle.idx so it can be replaced (Windows locks mapped files)
+        self.set_subtitle_track(SubtitleTrack.empty())
+        self.prepared_projects.pop(self.project_folder, None)
+        resplit_project(self.project_folder, max_words)
+
+        # Hot-reload the list and keep following the current playback position
+        subtitle_path = os.path.join(self.project_folder, "subtitle.srt")
+        with PROFILER.measure("srt.parse"):
+            track, self.subtitle_file_size = self.read_subtitle_track(subtitle_path, False)
+        self.set_subtitle_track(track)
+        self.auto_play_paused_for_subtitle = False
+        current_ms = self.player.get_time()
+        self.subtitle_index = max(self.subtitle_lookup.first_ending_after(current_ms), 0)
+        if self.subtitles:
+            self.subtitle_list.setCurrentRow(self.subtitle_index)
+            self.subtitle_display.setText(
+                self.subtitles.text(self.subtitle_index)
+            )
+        self.status_output.append(
+            f"✂️ Re-split into {len(self.subtitles)} subtitles (max {max_words} words)."
+        )
 
-    def set_total_duration(self):
-        self.total_duration = self.player.get_length()
+    def refresh_live_projects(self):
+        if any(slot.job_id is not None for slot in self.worker_slots):
+            self.load_projects()
+        if self.project_folder and self.project_is_live:
+            # Check the marker first so the final batch is still picked up below
+            self.project_is_live = os.path.exists(
+                os.path.join(self.project_folder, TRANSCRIBING_MARKER)
+            )
+            self.append_new_subtitles()
+            if not self.project_is_live:
+                self.status_output.append("✅ Transcription finished.")
+
+    def append_new_subtitles(self):
+        subtitle_path = os.path.join(self.project_folder, "subtitle.srt")
+        try:
+            size = os.path.getsize(subtitle_path)
+        except OSError:
+            return
+        if size == self.subtitle_file_size:
+            return
+        if size < self.subtitle_file_size:
+            # Rewritten from scratch (e.g. a rerun); start over
+            with open(subtitle_path, "rb") as f:
+                track, self.subtitle_file_size = SubtitleTrack.from_srt_bytes(f.read())
+            self.set_subtitle_track(track)
+            return
+        # Parse only the bytes added since the last complete entry we read;
+        # the writer may be mid-append, so a trailing partial entry waits
+        with open(subtitle_path, "rb") as f:
+            f.seek(self.subtitle_file_size)
+            new_track, consumed = SubtitleTrack.from_srt_bytes(f.read())
+        self.subtitle_file_size += consumed
+        if len(new_track):
+            self.subtitles = self.subtitles.concat(new_track)
+            self.subtitle_model.extend_track(self.subtitles)
+            self.subtitle_lookup = SubtitleIndex.from_track(self.subtitles)
+
+    def set_total_duration(self, duration=None):
+        self.total_duration = duration or self.player.get_length()
         self.slider.setMaximum(self.total_duration)
 
     def format_time(self, ms):
@@ -917,17 +2133,68 @@ class ShadowingApp(QWidget):
             f"⏱ {self.format_hms(self.study_elapsed_seconds)}"
         )
 
-    def sync_with_video(self):
+    def _on_vlc_time_changed(self, event):
+        # Called on a VLC thread: record the tick and let the GUI thread reschedule
+        self.time_anchor = (event.u.new_time, time.perf_counter())
+        QMetaObject.invokeMethod(self, "schedule_next_boundary", Qt.QueuedConnection)
+
+    def playback_position(self):
+        """Current media time in ms, interpolated between VLC's coarse time updates."""
         current_ms = self.player.get_time()
+        anchor_ms, anchor_at = self.time_anchor
+        if self.is_playing and current_ms == anchor_ms:
+            # VLC hasn't ticked since anchor_ms; extrapolate (capped, in case it stalls)
+            elapsed_ms = (time.perf_counter() - anchor_at) * 1000 * self.playback_rate
+            current_ms += int(min(elapsed_ms, 500))
+        return current_ms
+
+    @pyqtSlot()
+    def schedule_next_boundary(self):
+        """Arm boundary_timer for the next subtitle start/end, corrected for speed."""
+        if not self.is_playing:
+            self.boundary_timer.stop()
+            return
+        current_ms = self.playback_position()
+        if (
+            self.boundary_timer.isActive()
+            and self.boundary_target is not None
+            and self.boundary_target <= current_ms
+        ):
+            # A VLC tick overtook the pending boundary; handle it now, not skip it
+            self.on_boundary_timer()
+            return
+        boundary = self.subtitle_lookup.next_boundary(current_ms)
+        if boundary is None:
+            self.boundary_timer.stop()
+            return
+        self.boundary_target = boundary
+        delay_ms = math.ceil((boundary - current_ms) / (self.playback_rate or 1.0))
+        self.boundary_timer.start(max(0, delay_ms))
+
+    def on_boundary_timer(self):
+        if self.boundary_target is not None:
+            PROFILER.record(
+                "boundary.latency",
+                max(0, self.playback_position() - self.boundary_target) / 1000,
+            )
+        self.sync_with_video()
+        self.schedule_next_boundary()
+
+    @PROFILER.timed("sync_with_video")
+    def sync_with_video(self):
+        current_ms = self.playback_position()
         if not self.slider_was_pressed:
             self.slider.setValue(current_ms)
-            self.slider_label.setText(
-                f"{self.format_time(current_ms)} / {self.format_time(self.total_duration)}"
-            )
+            label = f"{self.format_time(current_ms)} / {self.format_time(self.total_duration)}"
+            if label != self.slider_label.text():
+                self.slider_label.setText(label)
 
         if self.manual_jump:
             return
 
+        # ---- Shadow mode: cut the take once the subtitle has been spoken over ----
+        self.track_shadow_take(current_ms)
+
         # ---- Auto Play Pause (check previous subtitle end) ----
         if (
             not self.auto_play_enabled
@@ -935,8 +2202,7 @@ class ShadowingApp(QWidget):
             and 0 <= self.subtitle_index < len(self.subtitles)
             and not self.auto_play_paused_for_subtitle
         ):
-            prev_sub = self.subtitles[self.subtitle_index]
-            if current_ms >= prev_sub.end.ordinal:
+            if current_ms >= self.subtitles.end(self.subtitle_index):
                 # Pause
                 if self.is_playing:
                     self.player.pause()
@@ -947,16 +2213,16 @@ class ShadowingApp(QWidget):
                 # Jump logic
                 if self.loop_current:
                     # Loop: jump back to start of same subtitle
-                    self.player.set_time(prev_sub.start.ordinal)
+                    self.player.set_time(self.subtitles.start(self.subtitle_index))
                 else:
                     # Not looping: jump to next subtitle start if exists
                     next_idx = self.subtitle_index + 1
                     if next_idx < len(self.subtitles):
-                        self.player.set_time(self.subtitles[next_idx].start.ordinal)
+                        self.player.set_time(self.subtitles.start(next_idx))
                         self.subtitle_index = next_idx
                         self.subtitle_list.setCurrentRow(next_idx)
                         self.subtitle_display.setText(
-                            self.subtitles[next_idx].text.strip()
+                            self.subtitles.text(next_idx)
                         )
                 self.auto_play_paused_for_subtitle = True
                 return
@@ -966,10 +2232,9 @@ class ShadowingApp(QWidget):
         if self.loop_current and not self.record_toggle.isChecked():
             # If we have a valid subtitle
             if 0 <= self.subtitle_index < len(self.subtitles):
-                sub = self.subtitles[self.subtitle_index]
                 # If we've passed the end of the current subtitle, rewind to its start
-                if current_ms >= sub.end.ordinal:
-                    self.player.set_time(sub.start.ordinal)
+                if current_ms >= self.subtitles.end(self.subtitle_index):
+                    self.player.set_time(self.subtitles.start(self.subtitle_index))
                     # If auto play is disabled, pause after jumping back
                     if (
                         not self.auto_play_enabled
@@ -987,27 +2252,26 @@ class ShadowingApp(QWidget):
             and not self.just_finished_recording
         ):
             if 0 <= self.subtitle_index < len(self.subtitles):
-                sub = self.subtitles[self.subtitle_index]
-                if current_ms >= sub.end.ordinal:
-                    self.player.set_time(sub.end.ordinal)
-                    self.record_after_subtitle(sub)
+                end_ms = self.subtitles.end(self.subtitle_index)
+                if current_ms >= end_ms:
+                    self.player.set_time(end_ms)
+                    self.record_after_subtitle(
+                        self.subtitle_index, late_ms=current_ms - end_ms
+                    )
                     return
 
         # ---- 3. Advance subtitle_index and handle auto play logic ----
         if not self.record_toggle.isChecked():
-            subtitle_changed = False
-            for i, sub in enumerate(self.subtitles):
-                if sub.start.ordinal <= current_ms < sub.end.ordinal:
-                    # Check if we moved to a new subtitle
-                    if self.subtitle_index != i:
-                        self.auto_play_paused_for_subtitle = False
-                    self.subtitle_index = i
-                    self.subtitle_list.setCurrentRow(i)
-                    self.subtitle_display.setText(sub.text.strip())
-                    break
-            else:
-                # We're not in any subtitle range - no additional auto play logic needed here
-                pass
+            i = self.subtitle_lookup.active_at(current_ms)
+            # Touch the widgets only when the active subtitle actually changes
+            if i >= 0 and (
+                i != self.subtitle_index or self.subtitle_list.currentRow() != i
+            ):
+                if self.subtitle_index != i:
+                    self.auto_play_paused_for_subtitle = False
+                self.subtitle_index = i
+                self.subtitle_list.setCurrentRow(i)
+                self.subtitle_display.setText(self.subtitles.text(i))
 
     def slider_pressed(self):
         self.slider_was_pressed = True
@@ -1025,7 +2289,9 @@ class ShadowingApp(QWidget):
     def change_speed(self, value):
         rate = value / 10.0
         self.player.set_rate(rate)
+        self.playback_rate = rate
         self.speed_label.setText(f"Speed: {int(rate * 100)}%")
+        self.schedule_next_boundary()
 
     def change_subtitle_font_size(self, size_str):
         try:
@@ -1036,15 +2302,18 @@ class ShadowingApp(QWidget):
         except ValueError:
             pass
 
-    def wait_for_seek(self, target_ms, retries=10):
+    def wait_for_seek(self, target_ms, retries=10, started=None):
+        started = started or time.perf_counter()
+
         def check_seek():
             cur = self.player.get_time()
             if abs(cur - target_ms) < 500 or retries <= 0:  # allow 0.5s slack
                 self.manual_jump = False
                 self.target_jump_ms = None
+                PROFILER.record("seek.settle", time.perf_counter() - started)
             else:
                 QTimer.singleShot(
-                    50, lambda: self.wait_for_seek(target_ms, retries - 1)
+                    50, lambda: self.wait_for_seek(target_ms, retries - 1, started)
                 )
 
         QTimer.singleShot(50, check_seek)
@@ -1056,26 +2325,24 @@ class ShadowingApp(QWidget):
 
         index = self.subtitle_list.currentRow()
         if 0 <= index < len(self.subtitles):
-            sub = self.subtitles[index]
+            start_ms = self.subtitles.start(index)
             self.manual_jump = True
-            self.target_jump_ms = sub.start.ordinal
+            self.target_jump_ms = start_ms
             self.auto_play_paused_for_subtitle = False  # Reset pause flag when jumping
 
             state = self.player.get_state()
             if state in [vlc.State.Ended, vlc.State.Stopped]:
                 self.player.stop()
                 self.player.play()
-                QTimer.singleShot(
-                    200, lambda: self._seek_and_update_subtitle(index, sub)
-                )
+                QTimer.singleShot(200, lambda: self._seek_and_update_subtitle(index))
             else:
-                self._seek_and_update_subtitle(index, sub)
-            self.wait_for_seek(sub.start.ordinal)
+                self._seek_and_update_subtitle(index)
+            self.wait_for_seek(start_ms)
 
-    def _seek_and_update_subtitle(self, index, sub):
-        self.player.set_time(sub.start.ordinal)
+    def _seek_and_update_subtitle(self, index):
+        self.player.set_time(self.subtitles.start(index))
         self.subtitle_index = index
-        self.subtitle_display.setText(sub.text.strip())
+        self.subtitle_display.setText(self.subtitles.text(index))
         self.subtitle_list.setCurrentRow(index)
 
     def seek_relative(self, offset_ms):
@@ -1085,18 +2352,18 @@ class ShadowingApp(QWidget):
     def repeat_subtitle(self):
         if 0 <= self.subtitle_index < len(self.subtitles):
             self.auto_play_paused_for_subtitle = False  # Reset pause flag
-            self.player.set_time(self.subtitles[self.subtitle_index].start.ordinal)
+            self.player.set_time(self.subtitles.start(self.subtitle_index))
             self.subtitle_display.setText(
-                self.subtitles[self.subtitle_index].text.strip()
+                self.subtitles.text(self.subtitle_index)
             )
 
     def prev_subtitle(self):
         if self.subtitle_index > 0:
             self.subtitle_index -= 1
             self.auto_play_paused_for_subtitle = False  # Reset pause flag
-            self.player.set_time(self.subtitles[self.subtitle_index].start.ordinal)
+            self.player.set_time(self.subtitles.start(self.subtitle_index))
             self.subtitle_display.setText(
-                self.subtitles[self.subtitle_index].text.strip()
+                self.subtitles.text(self.subtitle_index)
             )
             self.subtitle_list.setCurrentRow(self.subtitle_index)
 
@@ -1104,9 +2371,9 @@ class ShadowingApp(QWidget):
         if self.subtitle_index < len(self.subtitles) - 1:
             self.subtitle_index += 1
             self.auto_play_paused_for_subtitle = False  # Reset pause flag
-            self.player.set_time(self.subtitles[self.subtitle_index].start.ordinal)
+            self.player.set_time(self.subtitles.start(self.subtitle_index))
             self.subtitle_display.setText(
-                self.subtitles[self.subtitle_index].text.strip()
+                self.subtitles.text(self.subtitle_index)
             )
             self.subtitle_list.setCurrentRow(self.subtitle_index)
 
@@ -1128,6 +2395,19 @@ class ShadowingApp(QWidget):
 
     def closeEvent(self, event):
         self.settings.setValue("geometry", self.saveGeometry())
+        self.settings.setValue("parallel_jobs", self.parallel_jobs_selector.currentText())
+        self.recorder.close()
+        if self.shadow_stream is not None:
+            self.shadow_stream.close()
+        # The window is going away; the startup message says where this goes
+        PROFILER.export()
+        # Running jobs stay "downloading"/"transcribing" on disk and are
+        # requeued by JobQueue.recover() on the next start.
+        for slot in self.worker_slots:
+            if slot.process.state() != QProcess.NotRunning:
+                slot.job_id = None
+                kill_process_tree(slot.process)
+                slot.process.waitForFinished(2000)
 
     # -------------------
     # THEME: Dark (always on)
@@ -1171,8 +2451,13 @@ class ShadowingApp(QWidget):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    if sys.argv[1:2] == [WORKER_FLAG]:
+        run_worker()
+        sys.exit(0)
     app = QApplication(sys.argv)
     win = ShadowingApp()
     win.show()
+    QTimer.singleShot(0, win.report_startup)
     app.installEventFilter(win)
     sys.exit(app.exec_())
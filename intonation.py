@@ -0,0 +1,135 @@
+"""Pitch (F0) contours for intonation practice.
+
+``yin`` is the YIN pitch tracker, vectorized over frames: the difference
+function of every frame in a block comes from one batched FFT
+autocorrelation, and the threshold search is done with array masks. The
+original audio's contour is a ``ReferenceTrack`` of one byte per 10 ms frame
+(quarter-semitone steps, 0 = unvoiced) in ``reference_pitch.npy``, so a
+subtitle's contour is a slice of a memory-mapped array, like the pronunciation
+features.
+"""
+
+import numpy as np
+
+from audio_analysis import (
+    ANALYSIS_RATE,
+    FRAMES_PER_SECOND,
+    HOP,
+    MIN_LEVEL_DB,
+    ReferenceTrack,
+    resample,
+)
+
+WINDOW = 400  # YIN integration window, 25 ms
+F0_MIN = 60.0
+F0_MAX = 500.0
+THRESHOLD = 0.15  # YIN's absolute threshold on the normalized difference
+BLOCK_SECONDS = 20  # the whole track is tracked a block at a time
+CODE_BASE_HZ = 50.0  # code 1; each further code is a quarter semitone up
+CODE_STEPS = 4  # codes per semitone
+
+_TAU_MIN = int(ANALYSIS_RATE / F0_MAX)
+_TAU_MAX = int(np.ceil(ANALYSIS_RATE / F0_MIN))
+_SPAN = WINDOW + _TAU_MAX  # samples one frame looks at
+_N_FFT = 1 << int(np.ceil(np.log2(_SPAN)))
+
+
+def yin(samples, count=None):
+    """F0 in Hz (NaN where unvoiced) of 16 kHz int16 ``samples``, one value per
+    frame starting at ``i * HOP``. ``count`` frames (default: every whole
+    ``WINDOW``); missing samples past the end count as silence."""
+    if count is None:
+        count = max((len(samples) - WINDOW) // HOP + 1, 0)
+    if count <= 0:
+        return np.zeros(0, dtype=np.float32)
+    x = np.zeros((count - 1) * HOP + _SPAN, dtype=np.float32)
+    available = min(len(samples), len(x))
+    x[:available] = np.asarray(samples[:available], dtype=np.float32) / 32768.0
+    step = x.strides[0]
+    frames = np.lib.stride_tricks.as_strided(x, (count, _SPAN), (HOP * step, step))
+
+    # r[t] = sum over the window of x[j] * x[j + t], for every frame at once
+    head = np.zeros((count, _N_FFT), dtype=np.float32)
+    head[:, :WINDOW] = frames[:, :WINDOW]
+    r = np.fft.irfft(
+        np.fft.rfft(frames, _N_FFT) * np.conj(np.fft.rfft(head)), _N_FFT
+    )[:, : _TAU_MAX + 1]
+    energy = np.zeros((count, _SPAN + 1), dtype=np.float32)
+    np.cumsum(frames * frames, axis=1, out=energy[:, 1:])
+    lags = np.arange(_TAU_MAX + 1)
+    shifted = energy[:, WINDOW + lags] - energy[:, lags]
+    diff = np.maximum(energy[:, WINDOW, None] + shifted - 2 * r, 0)
+
+    # Cumulative mean normalized difference
+    normalized = np.ones_like(diff)
+    running = np.cumsum(diff[:, 1:], axis=1)
+    normalized[:, 1:] = diff[:, 1:] * lags[1:] / np.maximum(running, 1e-12)
+
+    # First dip under the threshold, at its local minimum
+    search = normalized[:, _TAU_MIN:_TAU_MAX]
+    dips = (search < THRESHOLD) & (search <= normalized[:, _TAU_MIN + 1 :])
+    tau = dips.argmax(axis=1) + _TAU_MIN
+    rows = np.arange(count)
+    before, at, after = (normalized[rows, tau + k] for k in (-1, 0, 1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        offset = np.nan_to_num(0.5 * (before - after) / (before - 2 * at + after))
+    level = 10 * np.log10(np.maximum(energy[:, WINDOW] / WINDOW, 1e-12))
+    f0 = ANALYSIS_RATE / (tau + np.clip(offset, -1, 1))
+    return np.where(dips.any(axis=1) & (level > MIN_LEVEL_DB), f0, np.nan).astype(np.float32)
+
+
+def encode(f0):
+    """F0 (Hz, NaN = unvoiced) -> uint8 codes."""
+    steps = np.round(CODE_STEPS * 12 * np.log2(np.nan_to_num(f0, nan=CODE_BASE_HZ) / CODE_BASE_HZ))
+    return np.where(np.isnan(f0), 0, np.clip(steps, 0, 254) + 1).astype(np.uint8)
+
+
+def decode(codes):
+    """uint8 codes -> semitones above ``CODE_BASE_HZ`` (NaN = unvoiced)."""
+    codes = np.asarray(codes)
+    return np.where(codes > 0, (codes.astype(np.float32) - 1) / CODE_STEPS, np.nan)
+
+
+def track_pitch(samples):
+    """Codes of a whole 16 kHz audio track, ``BLOCK_SECONDS`` at a time."""
+    block = BLOCK_SECONDS * FRAMES_PER_SECOND
+    total = max((len(samples) - WINDOW) // HOP + 1, 0)
+    out = np.zeros(total, dtype=np.uint8)
+    for first in range(0, total, block):
+        count = min(block, total - first)
+        start = first * HOP
+        out[first : first + count] = encode(
+            yin(samples[start : start + (count - 1) * HOP + _SPAN], count)
+        )
+    return out
+
+
+def contour(samples, samplerate):
+    """Semitone contour of a take (any samplerate), like a reference slice."""
+    return decode(encode(yin(resample(samples, samplerate, ANALYSIS_RATE))))
+
+
+def relative_contour(semitones):
+    """A contour for display: unvoiced ends trimmed, octave-jump blips removed
+    (median of three) and shifted so the speaker's median pitch is 0."""
+    semitones = np.asarray(semitones, dtype=np.float32)
+    voiced = np.flatnonzero(~np.isnan(semitones))
+    if len(voiced) < 3:
+        return np.zeros(0, dtype=np.float32)
+    s = semitones[voiced[0] : voiced[-1] + 1]
+    neighbours = np.stack([np.r_[s[:1], s[:-1]], s, np.r_[s[1:], s[-1:]]])
+    smoothed = s.copy()
+    known = ~np.isnan(s)
+    smoothed[known] = np.nanmedian(neighbours[:, known], axis=0)
+    return smoothed - np.median(smoothed[known])
+
+
+class ReferencePitch(ReferenceTrack):
+    """Pitch codes of a project's whole audio track, looked up by time."""
+
+    FILE = "reference_pitch.npy"
+    compute = staticmethod(track_pitch)
+
+    def span(self, start_ms, end_ms):
+        """Semitone contour between two times of the track."""
+        return decode(super().span(start_ms, end_ms))
@@ -0,0 +1,298 @@
+"""Persistent transcription job queue shared by the GUI and the CLI.
+
+Jobs live in ``<output_folder>/.cache/jobs.json`` so they survive restarts.
+Each job is run by a transcription worker process (``get_video_and_srt.py
+worker``), and its state follows the progress events that worker reports.
+Several processes may hold the same queue (the GUI, a CLI run, ``queue
+--cancel``): every change first picks up what the others have saved.
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+QUEUED = "queued"
+DOWNLOADING = "downloading"
+TRANSCRIBING = "transcribing"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATES = (DOWNLOADING, TRANSCRIBING)
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+# Worker progress stage -> job state
+STAGE_STATES = {
+    "info": DOWNLOADING,
+    "download": DOWNLOADING,
+    "audio": DOWNLOADING,
+    "model": TRANSCRIBING,
+    "transcribe": TRANSCRIBING,
+    "subtitles": TRANSCRIBING,
+}
+
+STATE_ICONS = {
+    QUEUED: "🕒",
+    DOWNLOADING: "📥",
+    TRANSCRIBING: "🧠",
+    DONE: "✅",
+    FAILED: "❌",
+    CANCELLED: "⛔",
+}
+
+
+def default_queue_path(output_folder="youtube_videos"):
+    return os.path.join(output_folder, ".cache", "jobs.json")
+
+
+class JobQueue:
+    """Ordered list of job dicts, saved to ``path`` after every state change.
+
+    A job looks like ``{"id", "url", "state", "options", "folder", "error",
+    "created", "updated"}``; ``options`` are passed through to the worker
+    (model_size, max_words, workers, output_folder).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.jobs = []
+        self.next_id = 1
+        self._lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        """Read the saved queue. Jobs this instance already holds are updated
+        in place, so references to them stay valid."""
+        with self._lock:
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                known = {job["id"]: job for job in self.jobs}
+                jobs = []
+                for saved in data.get("jobs", []):
+                    job = known.get(saved["id"])
+                    if job is None:
+                        job = saved
+                    else:
+                        job.clear()
+                        job.update(saved)
+                    jobs.append(job)
+                self.jobs = jobs
+                self.next_id = max(self.next_id, data.get("next_id", len(jobs) + 1))
+
+    def save(self):
+        with self._lock:
+            folder = os.path.dirname(self.path) or "."
+            os.makedirs(folder, exist_ok=True)
+            # A temp name of our own: other processes save the same queue
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=folder)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"next_id": self.next_id, "jobs": self.jobs}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def recover(self):
+        """Requeue jobs that were running when the app stopped; returns how many."""
+        with self._lock:
+            self.load()
+            interrupted = [job for job in self.jobs if job["state"] in ACTIVE_STATES]
+            for job in interrupted:
+                job["state"] = QUEUED
+                job["updated"] = time.time()
+            if interrupted:
+                self.save()
+            return len(interrupted)
+
+    def add(self, url, **options):
+        with self._lock:
+            self.load()
+            now = time.time()
+            job = {
+                "id": self.next_id,
+                "url": url,
+                "state": QUEUED,
+                "options": options,
+                "folder": None,
+                "error": None,
+                "created": now,
+                "updated": now,
+            }
+            self.next_id += 1
+            self.jobs.append(job)
+            self.save()
+            return job
+
+    def get(self, job_id):
+        return next((job for job in self.jobs if job["id"] == job_id), None)
+
+    def pending(self):
+        return [job for job in self.jobs if job["state"] == QUEUED]
+
+    def active(self):
+        return [job for job in self.jobs if job["state"] in ACTIVE_STATES]
+
+    def claim_next(self):
+        """Mark the first queued job as downloading and return it (or None)."""
+        with self._lock:
+            self.load()
+            job = next(iter(self.pending()), None)
+            if job:
+                self.update(job["id"], state=DOWNLOADING)
+            return job
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            self.load()
+            job = self.get(job_id)
+            if job is None:
+                return None
+            job.update(fields, updated=time.time())
+            self.save()
+            return job
+
+    def apply_event(self, job_id, event):
+        """Fold a worker event into the job's state; saves only on changes.
+        A job cancelled elsewhere stays cancelled: check for ``CANCELLED``
+        afterwards to stop its worker."""
+        self.load()
+        job = self.get(job_id)
+        if job is None or job["state"] in FINISHED_STATES:
+            return job
+        kind = event.get("type")
+        if kind == "progress":
+            state = STAGE_STATES.get(event.get("stage"))
+            if state and state != job["state"]:
+                self.update(job_id, state=state)
+        elif kind == "project":
+            self.update(job_id, folder=event.get("folder"))
+        elif kind == "done":
+            self.update(job_id, state=DONE, folder=event.get("folder") or job["folder"])
+        elif kind == "failed":
+            self.update(job_id, state=FAILED, error=event.get("error"))
+        return job
+
+    def move(self, job_id, offset):
+        """Move a queued job ``offset`` places among the queued jobs."""
+        with self._lock:
+            self.load()
+            pending = self.pending()
+            job = self.get(job_id)
+            if job not in pending:
+                return False
+            target = min(max(pending.index(job) + offset, 0), len(pending) - 1)
+            if target == pending.index(job):
+                return False
+            self.jobs.remove(job)
+            anchor = pending[target]
+            index = self.jobs.index(anchor) + (1 if offset > 0 else 0)
+            self.jobs.insert(index, job)
+            self.save()
+            return True
+
+    def cancel(self, job_id):
+        """Cancel a job and return its previous state; running jobs must also be
+        stopped by whoever runs them."""
+        with self._lock:
+            self.load()
+            job = self.get(job_id)
+            if job is None or job["state"] in FINISHED_STATES:
+                return None
+            previous = job["state"]
+            self.update(job_id, state=CANCELLED)
+            return previous
+
+    def clear_finished(self):
+        with self._lock:
+            self.load()
+            self.jobs = [job for job in self.jobs if job["state"] not in FINISHED_STATES]
+            self.save()
+
+    @staticmethod
+    def describe(job):
+        return f"{STATE_ICONS.get(job['state'], '')} #{job['id']} {job['state']}: {job['url']}"
+
+
+def kill_worker_tree(pid):
+    """Kill a worker process together with the processes it started, such as
+    the ProcessPoolExecutor children of a multi-worker transcription."""
+    try:
+        if sys.platform == "win32":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(pid)],
+                capture_output=True,
+                creationflags=subprocess.CREATE_NO_WINDOW,
+            )
+        else:
+            os.killpg(pid, signal.SIGKILL)  # The worker leads its own group
+    except (OSError, subprocess.SubprocessError):
+        pass
+
+
+def worker_payload(job):
+    """The JSON job line a worker process expects."""
+    return {"id": job["id"], "url": job["url"], **job["options"]}
+
+
+# === CLI runner ===
+def run_queue(queue, concurrency=1, log=print):
+    """Run queued jobs on ``concurrency`` worker processes until none are left."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "get_video_and_srt.py")
+    log_lock = threading.Lock()
+
+    def say(text):
+        with log_lock:
+            log(text)
+
+    def drive_worker():
+        worker = None
+        try:
+            while True:
+                job = queue.claim_next()
+                if job is None:
+                    return
+                if worker is None or worker.poll() is not None:
+                    worker = subprocess.Popen(
+                        [sys.executable, script, "worker"],
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        text=True,
+                        encoding="utf-8",
+                        bufsize=1,
+                    )
+                say(f"▶️ #{job['id']} {job['url']}")
+                worker.stdin.write(json.dumps(worker_payload(job)) + "\n")
+                worker.stdin.flush()
+                for line in worker.stdout:
+                    event = json.loads(line)
+                    current = queue.apply_event(job["id"], event)
+                    if current is None or current["state"] == CANCELLED:
+                        # Cancelled from another process (e.g. ``queue --cancel``)
+                        kill_worker_tree(worker.pid)
+                        worker.kill()
+                        worker.wait()
+                        worker = None
+                        break
+                    if event["type"] == "log":
+                        say(f"[#{job['id']}] {event['text']}")
+                    if event["type"] in ("done", "failed"):
+                        break
+                else:
+                    queue.update(job["id"], state=FAILED, error="worker exited")
+                say(JobQueue.describe(queue.get(job["id"]) or dict(job, state=CANCELLED)))
+        finally:
+            if worker is not None and worker.poll() is None:
+                worker.stdin.close()
+                worker.wait()
+
+    threads = [
+        threading.Thread(target=drive_worker, daemon=True)
+        for _ in range(max(1, min(concurrency, len(queue.pending()))))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
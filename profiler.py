@@ -0,0 +1,161 @@
+"""Opt-in timing instrumentation for the shadowing GUI.
+
+Enable with ``SHADOWING_PROFILE=1`` or ``python gui.py --profile``. Timings are
+collected into per-metric histograms, shown live by the GUI's overlay, and
+written to ``profiles/session_<time>.json`` / ``.csv`` when the app closes.
+When profiling is off, ``timed`` returns the function unchanged and
+``measure``/``record`` return immediately.
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+
+PROFILE_ENV = "SHADOWING_PROFILE"
+PROFILE_FLAG = "--profile"
+PROFILE_DIR = os.environ.get("SHADOWING_PROFILE_DIR", "profiles")
+
+# Upper bucket edges in ms (1-2-5 series); the last bucket is open-ended
+BUCKET_EDGES_MS = [0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+MAX_SAMPLES = 50_000  # raw samples kept per metric for percentiles and CSV
+
+
+class Histogram:
+    """Exact count/total/min/max and bucket counts, plus recent raw samples."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_EDGES_MS) + 1)
+        self.samples = deque(maxlen=MAX_SAMPLES)  # (session offset s, ms)
+
+    def add(self, ms, offset):
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        index = next(
+            (i for i, edge in enumerate(BUCKET_EDGES_MS) if ms <= edge),
+            len(BUCKET_EDGES_MS),
+        )
+        self.buckets[index] += 1
+        self.samples.append((offset, ms))
+
+    def percentile(self, q):
+        values = sorted(ms for _, ms in self.samples)
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / max(self.count, 1), 3),
+            "min_ms": round(self.min_ms if self.count else 0.0, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": {
+                label: n for label, n in zip(bucket_labels(), self.buckets) if n
+            },
+        }
+
+
+def bucket_labels():
+    return [f"<={edge}ms" for edge in BUCKET_EDGES_MS] + [f">{BUCKET_EDGES_MS[-1]}ms"]
+
+
+class Profiler:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.time()
+        self._clock_started = time.perf_counter()
+        self.metrics = {}
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        offset = time.perf_counter() - self._clock_started
+        self.metrics.setdefault(name, Histogram()).add(seconds * 1000, offset)
+
+    @contextmanager
+    def measure(self, name):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def timed(self, name):
+        """Decorator that records every call of the function under ``name``."""
+
+        def decorate(func):
+            if not self.enabled:
+                return func
+
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - started)
+
+            wrapper.__name__ = func.__name__
+            wrapper.__doc__ = func.__doc__
+            return wrapper
+
+        return decorate
+
+    def summary(self):
+        return {name: hist.summary() for name, hist in sorted(self.metrics.items())}
+
+    def format_overlay(self):
+        lines = [f"{'metric':<20}{'n':>6}{'p50':>9}{'p95':>9}{'max':>9}"]
+        for name, st in self.summary().items():
+            lines.append(
+                f"{name:<20}{st['count']:>6}{st['p50_ms']:>9.1f}"
+                f"{st['p95_ms']:>9.1f}{st['max_ms']:>9.1f}"
+            )
+        return "\n".join(lines)
+
+    def export(self, folder=PROFILE_DIR):
+        """Write this session's summary (JSON) and raw samples (CSV); returns the paths."""
+        if not self.metrics:
+            return None
+        os.makedirs(folder, exist_ok=True)
+        stem = os.path.join(
+            folder, "session_" + time.strftime("%Y%m%d_%H%M%S", time.localtime(self.started))
+        )
+        with open(stem + ".json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "started": self.started,
+                    "duration_s": round(time.time() - self.started, 3),
+                    "bucket_edges_ms": BUCKET_EDGES_MS,
+                    "metrics": self.summary(),
+                },
+                f,
+                indent=2,
+            )
+        with open(stem + ".csv", "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["metric", "offset_s", "ms"])
+            for name, hist in sorted(self.metrics.items()):
+                for offset, ms in hist.samples:
+                    writer.writerow([name, f"{offset:.3f}", f"{ms:.3f}"])
+        return stem + ".json", stem + ".csv"
+
+
+PROFILER = Profiler(
+    enabled=os.environ.get(PROFILE_ENV, "") not in ("", "0")
+    or PROFILE_FLAG in sys.argv
+)
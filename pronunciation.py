@@ -0,0 +1,149 @@
+"""Pronunciation scores: how close a take sounds to the original sentence.
+
+Both are turned into MFCC frames (25 ms windows every 10 ms, all frames of a
+signal in one batched FFT) and aligned with dynamic time warping. The
+original's frames are a ``ReferenceTrack`` (``reference_mfcc.npy``), so scoring
+a take only featurizes the take.
+"""
+
+import numpy as np
+
+from audio_analysis import ANALYSIS_RATE, HOP, MIN_LEVEL_DB, ReferenceTrack, resample
+
+WINDOW = 400  # 25 ms
+N_FFT = 512
+N_MELS = 40
+N_MFCC = 13
+BLOCK_SECONDS = 60  # the whole track is featurized a block at a time
+SILENCE_DB = 35.0  # frames this far below the loudest are trimmed off both ends
+MIN_FRAMES = 10  # less voiced audio than this (100 ms) isn't scored
+
+
+def mel_filterbank(n_mels=N_MELS, n_fft=N_FFT, samplerate=ANALYSIS_RATE):
+    """Triangular mel filters, shape ``(n_mels, n_fft // 2 + 1)``."""
+    mels = np.linspace(0, 2595 * np.log10(1 + samplerate / 2 / 700), n_mels + 2)
+    hz = 700 * (10 ** (mels / 2595) - 1)
+    bins = np.fft.rfftfreq(n_fft, 1 / samplerate)
+    lower, center, upper = hz[:-2, None], hz[1:-1, None], hz[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0, np.minimum(rising, falling)).astype(np.float32)
+
+
+def dct_matrix(n_out=N_MFCC, n_in=N_MELS):
+    """Orthonormal DCT-II rows."""
+    k = np.arange(n_out)[:, None]
+    n = np.arange(n_in)[None, :]
+    dct = np.sqrt(2 / n_in) * np.cos(np.pi * k * (2 * n + 1) / (2 * n_in))
+    dct[0] /= np.sqrt(2)
+    return dct.astype(np.float32)
+
+
+_HANN = np.hanning(WINDOW).astype(np.float32)
+_MEL = mel_filterbank().T
+_DCT = dct_matrix().T
+
+
+def mfcc(samples):
+    """MFCC frames ``(n_frames, N_MFCC)`` of 16 kHz int16 ``samples``; frame
+    ``i`` covers samples ``i * HOP`` to ``i * HOP + WINDOW``."""
+    x = np.ascontiguousarray(samples, dtype=np.float32) / 32768.0
+    count = (len(x) - WINDOW) // HOP + 1
+    if count <= 0:
+        return np.zeros((0, N_MFCC), dtype=np.float32)
+    step = x.strides[0]
+    frames = np.lib.stride_tricks.as_strided(x, (count, WINDOW), (HOP * step, step))
+    power = np.abs(np.fft.rfft(frames * _HANN, N_FFT)) ** 2
+    return np.log(power @ _MEL + 1e-6) @ _DCT
+
+
+def track_mfcc(samples):
+    """``mfcc`` of a whole audio track, ``BLOCK_SECONDS`` at a time so the
+    frames never all sit in memory at once; stored as float16."""
+    block = BLOCK_SECONDS * ANALYSIS_RATE
+    count = max((len(samples) - WINDOW) // HOP + 1, 0)
+    out = np.zeros((count, N_MFCC), dtype=np.float16)
+    for first in range(0, count, block // HOP):
+        start = first * HOP
+        frames = mfcc(samples[start : start + block + WINDOW - HOP])
+        out[first : first + len(frames)] = frames
+    return out
+
+
+class ReferenceFeatures(ReferenceTrack):
+    """MFCC frames of a project's whole audio track, looked up by time."""
+
+    FILE = "reference_mfcc.npy"
+    compute = staticmethod(track_mfcc)
+
+
+def voiced(frames):
+    """``frames`` without the quiet frames at either end (by c0, the log energy)."""
+    if not len(frames):
+        return frames
+    # c0 is sqrt(N_MELS) times the mean log (natural) mel energy
+    floor = frames[:, 0].max() - np.sqrt(N_MELS) * SILENCE_DB / 10 * np.log(10)
+    loud = np.flatnonzero(frames[:, 0] > floor)
+    return frames[loud[0] : loud[-1] + 1]
+
+
+def _normalized(frames):
+    # Drop c0 (loudness) and normalize each coefficient over the utterance,
+    # so microphone and level differences don't count against the learner
+    x = np.asarray(frames[:, 1:], dtype=np.float32)
+    return (x - x.mean(axis=0)) / (x.std(axis=0) + 1e-6)
+
+
+def dtw_cost(cost):
+    """Total cost of the best path through a ``(n, m)`` cost matrix from the
+    first to the last cell, with diagonal steps weighted twice (so every path
+    weighs ``n + m``).
+
+    Each row is solved at once: with ``C`` the row's running cost sum,
+    ``D[j] = min(best[j], D[j-1] + c[j])`` unrolls to
+    ``C[j] + min over k <= j of (best[k] - C[k])``, a ``minimum.accumulate``.
+    """
+    n, m = cost.shape
+    previous = np.full(m + 1, np.inf)
+    previous[0] = 0.0
+    for i in range(n):
+        c = cost[i]
+        best = np.minimum(previous[:-1] + 2 * c, previous[1:] + c)
+        running = np.cumsum(c)
+        row = running + np.minimum.accumulate(best - running)
+        previous[0] = np.inf
+        previous[1:] = row
+    return previous[-1]
+
+
+def peak_level_db(samples):
+    """Level (dBFS) of the loudest ``HOP``-sample stretch of int16 ``samples``."""
+    n = len(samples) // HOP
+    if not n:
+        return -np.inf
+    frames = samples[: n * HOP].reshape(n, HOP).astype(np.float32) / 32768.0
+    return 10 * np.log10(max(np.mean(frames * frames, axis=1).max(), 1e-12))
+
+
+def score_take(samples, samplerate, reference):
+    """0-100 similarity of a take to its ``reference`` frames, or None if
+    either has too little voiced audio.
+
+    The DTW cost is compared with aligning against the reference played
+    backwards (same sounds, wrong order): 100 means the frames match exactly,
+    0 means the take is no closer than that.
+    """
+    samples = resample(samples, samplerate, ANALYSIS_RATE)
+    if peak_level_db(samples) < MIN_LEVEL_DB:
+        return None
+    take = voiced(mfcc(samples))
+    reference = voiced(np.asarray(reference, dtype=np.float32))
+    if len(take) < MIN_FRAMES or len(reference) < MIN_FRAMES:
+        return None
+    a, b = _normalized(take), _normalized(reference)
+    squared = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2 * a @ b.T
+    cost = np.sqrt(np.maximum(squared, 0))
+    chance = dtw_cost(cost[:, ::-1])
+    if not chance:
+        return None
+    return int(round(100 * max(0.0, 1 - dtw_cost(cost) / chance)))
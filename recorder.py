@@ -0,0 +1,248 @@
+"""Microphone takes recorded straight into memory.
+
+A callback-driven ``sd.InputStream`` copies each audio block into a buffer
+that is allocated once and reused for every take. An energy VAD runs on each
+block as it arrives (one vectorized RMS per 20 ms frame), so the take ends as
+soon as the learner has spoken and then stayed silent for a moment, instead
+of always running to its maximum length.
+
+For shadowing over the video, ``ShadowStream`` keeps a low-latency duplex
+stream open instead, and takes are cut out of its input afterwards.
+"""
+
+import time
+
+import numpy as np
+import sounddevice as sd
+
+SAMPLERATE = 44100
+FRAME_MS = 20  # VAD frame
+FRAMES_PER_BLOCK = 5  # stream callback every 100 ms
+SPEECH_DB = -42.0  # frame RMS in dBFS above which a frame counts as speech
+TRAILING_SILENCE_MS = 800  # silence after speech that ends a take
+
+
+def frame_levels_db(samples, frame_len):
+    """RMS level (dBFS) of each whole ``frame_len`` frame of int16 ``samples``."""
+    n = len(samples) // frame_len
+    frames = samples[: n * frame_len].reshape(n, frame_len).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1)) / 32768.0
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+class TakeRecorder:
+    """Records one take at a time into a reusable buffer.
+
+    ``start`` returns immediately; ``on_finished(take, samplerate)`` is called
+    from the audio thread with a copy of the recorded samples once the take
+    ends (trailing silence, maximum length, or ``stop``). ``start``, ``stop``
+    and ``close`` are meant to be called from one (the GUI) thread.
+    """
+
+    def __init__(self, samplerate=SAMPLERATE, max_seconds=30):
+        self.samplerate = samplerate
+        self.frame_len = samplerate * FRAME_MS // 1000
+        self.buffer = np.zeros(int(max_seconds * samplerate), dtype=np.int16)
+        self.stream = None
+
+    def start(self, max_seconds, on_finished, min_seconds=0.0):
+        """Start a take of at most ``max_seconds``; silence can only end it after
+        ``min_seconds`` (so a slow start isn't cut off)."""
+        self.close()
+        capacity = int(max_seconds * self.samplerate)
+        if capacity > len(self.buffer):
+            self.buffer = np.zeros(capacity, dtype=np.int16)
+        self.capacity = capacity
+        self.min_samples = int(min_seconds * self.samplerate)
+        self.length = 0
+        self.heard_speech = False
+        self.trailing_silence = 0  # samples since the last speech frame
+        self.on_finished = on_finished
+        self.stream = sd.InputStream(
+            samplerate=self.samplerate,
+            channels=1,
+            dtype="int16",
+            blocksize=self.frame_len * FRAMES_PER_BLOCK,
+            callback=self._on_block,
+            finished_callback=self._on_stream_finished,
+        )
+        self.stream.start()
+
+    def stop(self):
+        """End the current take early; ``on_finished`` still gets what was recorded."""
+        if self.stream is not None and self.stream.active:
+            self.stream.stop()
+
+    def close(self):
+        # Streams are closed here rather than from their own finished callback,
+        # which runs on PortAudio's thread
+        if self.stream is not None:
+            self.stream.close(ignore_errors=True)
+            self.stream = None
+
+    def _on_block(self, indata, frames, time_info, status):
+        block = indata[: self.capacity - self.length, 0]
+        self.buffer[self.length : self.length + len(block)] = block
+        self.length += len(block)
+
+        levels = frame_levels_db(block, self.frame_len)
+        voiced = np.flatnonzero(levels > SPEECH_DB)
+        if len(voiced):
+            self.heard_speech = True
+            self.trailing_silence = len(block) - (voiced[-1] + 1) * self.frame_len
+        else:
+            self.trailing_silence += len(block)
+
+        if self.length >= self.capacity or (
+            self.heard_speech
+            and self.length >= self.min_samples
+            and self.trailing_silence >= TRAILING_SILENCE_MS * self.samplerate // 1000
+        ):
+            raise sd.CallbackStop
+
+    def _on_stream_finished(self):
+        self.on_finished(self.buffer[: self.length].copy(), self.samplerate)
+
+
+# === Full-duplex shadowing ===
+SHADOW_BUFFER_SECONDS = 60  # input history kept for cutting out takes
+CALIBRATION_CLICKS = 4
+CALIBRATION_GAP_S = 0.4  # between clicks; also the longest latency we can measure
+CALIBRATION_MIN_PEAK = 8.0  # click peak vs. median correlation to count as heard
+
+
+def click_train(samplerate):
+    """``CALIBRATION_CLICKS`` short 2 kHz bursts, ``CALIBRATION_GAP_S`` apart."""
+    n = int(0.005 * samplerate)
+    t = np.arange(n) / samplerate
+    click = 0.5 * np.hanning(n) * np.sin(2 * np.pi * 2000 * t)
+    gap = int(CALIBRATION_GAP_S * samplerate)
+    train = np.zeros(gap * CALIBRATION_CLICKS, dtype=np.float32)
+    for k in range(CALIBRATION_CLICKS):
+        train[k * gap : k * gap + n] = click
+    return (train * 32767).astype(np.int16), click
+
+
+class ShadowStream:
+    """A low-latency duplex stream for recording while the video plays.
+
+    The input runs continuously into a ring buffer holding the last
+    ``seconds``, and every block is stamped with the ``perf_counter`` time it
+    arrived, so a take can be cut out afterwards for any stretch of time.
+    The output plays takes back (and calibration clicks) through the same
+    stream, so input and output sample counts share one clock.
+    """
+
+    def __init__(self, samplerate=SAMPLERATE, seconds=SHADOW_BUFFER_SECONDS):
+        self.samplerate = samplerate
+        self.ring = np.zeros(int(seconds * samplerate), dtype=np.int16)
+        self.written = 0  # input samples received so far
+        self.clock = (0, time.perf_counter())  # (written, arrival time) of the last block
+        self.output = None
+        self.output_pos = 0
+        self.output_started_at = None  # input sample index when the output started
+        self.stream = None
+
+    def start(self):
+        self.stream = sd.Stream(
+            samplerate=self.samplerate,
+            channels=1,
+            dtype="int16",
+            latency="low",
+            callback=self._on_block,
+        )
+        self.stream.start()
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close(ignore_errors=True)
+            self.stream = None
+
+    @property
+    def playing(self):
+        return self.output is not None
+
+    def play(self, samples):
+        """Play int16 ``samples``, replacing whatever is playing."""
+        self.output_pos = 0
+        self.output_started_at = None
+        self.output = samples
+
+    def stop_playback(self):
+        self.output = None
+
+    def _on_block(self, indata, outdata, frames, time_info, status):
+        arrived = time.perf_counter()
+        pos = self.written % len(self.ring)
+        first = min(frames, len(self.ring) - pos)
+        self.ring[pos : pos + first] = indata[:first, 0]
+        self.ring[: frames - first] = indata[first:, 0]
+
+        outdata.fill(0)
+        output = self.output
+        if output is not None:
+            if self.output_started_at is None:
+                self.output_started_at = self.written
+            chunk = output[self.output_pos : self.output_pos + frames]
+            outdata[: len(chunk), 0] = chunk
+            self.output_pos += len(chunk)
+            if self.output_pos >= len(output):
+                self.output = None
+
+        self.written += frames
+        self.clock = (self.written, arrived)
+
+    def index_at(self, when):
+        """Input sample index that arrived at ``perf_counter`` time ``when``."""
+        written, arrived = self.clock
+        return written - int(round((arrived - when) * self.samplerate))
+
+    def samples(self, first, last):
+        """Input samples ``first:last`` (indices since the stream started); the
+        part that has already left the ring buffer comes back as silence."""
+        oldest = max(self.written - len(self.ring), 0)
+        last = min(last, self.written)
+        lost = min(max(oldest - first, 0), max(last - first, 0))
+        kept = np.arange(first + lost, last) % len(self.ring)
+        return np.concatenate([np.zeros(lost, dtype=np.int16), self.ring[kept]])
+
+    def take(self, started, ended, latency_s=0.0):
+        """What the microphone heard between two ``perf_counter`` times, shifted
+        by the round-trip ``latency_s`` (the voice reaches us that much later)."""
+        return self.samples(
+            self.index_at(started + latency_s), self.index_at(ended + latency_s)
+        )
+
+    def calibrate(self):
+        """Measure the round-trip latency in ms by playing clicks and finding
+        them in the input. Blocks for about two seconds; needs speakers (or the
+        headphones held to the microphone)."""
+        train, click = click_train(self.samplerate)
+        self.play(train)
+        deadline = time.perf_counter() + len(train) / self.samplerate + 2.0
+        while self.playing or self.output_started_at is None:
+            if time.perf_counter() > deadline:
+                break
+            time.sleep(0.02)
+        if self.output_started_at is None:
+            raise RuntimeError("the audio stream isn't running")
+        gap = int(CALIBRATION_GAP_S * self.samplerate)
+        # Wait until the last click's window has been recorded too
+        end = self.output_started_at + len(train) + gap
+        while self.written < end and time.perf_counter() < deadline + 1.0:
+            time.sleep(0.02)
+        heard = self.samples(self.output_started_at, end).astype(np.float32)
+
+        # Cross-correlate with the click (via FFT) and find one peak per click
+        n = len(heard) + len(click)
+        corr = np.fft.irfft(np.fft.rfft(heard, n) * np.conj(np.fft.rfft(click, n)), n)
+        corr = np.abs(corr[: len(heard)])
+        windows = corr[: gap * CALIBRATION_CLICKS].reshape(CALIBRATION_CLICKS, gap)
+        lags = windows.argmax(axis=1)
+        peaks = windows.max(axis=1)
+        if np.median(peaks) < CALIBRATION_MIN_PEAK * max(np.median(corr), 1e-9):
+            raise RuntimeError(
+                "the clicks weren't picked up by the microphone; "
+                "use speakers and turn the volume up"
+            )
+        return float(np.median(lags)) / self.samplerate * 1000
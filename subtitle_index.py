@@ -0,0 +1,256 @@
+"""Compact subtitle storage and time index for the GUI's playback hot path.
+
+``subtitle.srt`` stays the interchange format. Next to it, ``subtitle.idx``
+holds the same subtitles as int32 start/end columns (ms) plus one UTF-8 text
+blob with int32 offsets, stamped with the SRT's mtime and size. The GUI
+memory-maps it instead of parsing the SRT, and rebuilds it whenever the SRT
+has changed since.
+"""
+
+import os
+import re
+from bisect import bisect_right
+
+import numpy as np
+
+SIDECAR_FILE = "subtitle.idx"
+
+# 32-byte header; the four columns follow it back to back
+_SIDECAR_MAGIC = b"SUBIDX1\n"
+_HEADER = np.dtype(
+    [
+        ("magic", "S8"),
+        ("count", "<u4"),
+        ("blob_bytes", "<u4"),
+        ("srt_mtime_ns", "<i8"),
+        ("srt_size", "<i8"),
+    ]
+)
+
+_SRT_TIMING = re.compile(
+    r"(\d+):(\d+):(\d+)[,.](\d+)\s*-->\s*(\d+):(\d+):(\d+)[,.](\d+)"
+)
+_SRT_ENTRY_END = re.compile(rb"\r?\n\r?\n")
+
+
+def _ms(h, m, s, ms):
+    return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + int(ms)
+
+
+def parse_srt(text):
+    """``(start_ms, end_ms, text)`` for every entry of an SRT document."""
+    rows = []
+    text = text.lstrip("\ufeff").replace("\r\n", "\n")
+    for block in re.split(r"\n[ \t]*\n", text):
+        lines = block.strip("\n").split("\n")
+        # The timing line follows the index; tolerate a missing index
+        for k, line in enumerate(lines[:2]):
+            match = _SRT_TIMING.search(line)
+            if match:
+                groups = match.groups()
+                rows.append(
+                    (_ms(*groups[:4]), _ms(*groups[4:]), "\n".join(lines[k + 1 :]).strip())
+                )
+                break
+    return rows
+
+
+def sidecar_path(srt_path):
+    return os.path.join(os.path.dirname(srt_path), SIDECAR_FILE)
+
+
+class SubtitleTrack:
+    """Subtitles as columns: ``start_ms``/``end_ms`` (int32) and a UTF-8 ``blob``
+    where subtitle ``i`` is ``blob[offsets[i]:offsets[i+1]]`` (already stripped).
+
+    The columns are plain arrays or views into a memory-mapped sidecar.
+    """
+
+    def __init__(self, start_ms, end_ms, offsets, blob):
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.offsets = offsets
+        self.blob = blob
+
+    @classmethod
+    def from_rows(cls, rows):
+        encoded = [text.strip().encode("utf-8") for _, _, text in rows]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int32)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(
+            np.array([row[0] for row in rows], dtype=np.int32),
+            np.array([row[1] for row in rows], dtype=np.int32),
+            offsets,
+            np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        )
+
+    @classmethod
+    def from_subtitles(cls, subtitles):
+        """From the splitter's ``{"start", "end", "text"}`` dicts (seconds)."""
+        return cls.from_rows(
+            [
+                (int(round(sub["start"] * 1000)), int(round(sub["end"] * 1000)), sub["text"])
+                for sub in subtitles
+            ]
+        )
+
+    @classmethod
+    def from_srt_bytes(cls, data):
+        """Parse the complete entries of a (possibly still growing) SRT file.
+
+        Returns ``(track, consumed)``; ``consumed`` is the number of bytes up to
+        the end of the last complete entry, where the next read should resume.
+        """
+        ends = [match.end() for match in _SRT_ENTRY_END.finditer(data)]
+        consumed = ends[-1] if ends else 0
+        return cls.from_rows(parse_srt(data[:consumed].decode("utf-8"))), consumed
+
+    @classmethod
+    def empty(cls):
+        return cls.from_rows([])
+
+    def __len__(self):
+        return len(self.start_ms)
+
+    def start(self, i):
+        return int(self.start_ms[i])
+
+    def end(self, i):
+        return int(self.end_ms[i])
+
+    def text(self, i):
+        return self.blob[self.offsets[i] : self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def concat(self, other):
+        return SubtitleTrack(
+            np.concatenate([self.start_ms, other.start_ms]),
+            np.concatenate([self.end_ms, other.end_ms]),
+            np.concatenate([self.offsets, other.offsets[1:] + self.offsets[-1]]),
+            np.concatenate([self.blob, other.blob]),
+        )
+
+    # --- Sidecar file ---
+    def save_sidecar(self, srt_path):
+        """Write ``subtitle.idx`` for ``srt_path`` as it is now; returns False if
+        the file couldn't be replaced (e.g. it is mapped by a reader on Windows)."""
+        st = os.stat(srt_path)
+        header = np.zeros(1, dtype=_HEADER)
+        header[0] = (_SIDECAR_MAGIC, len(self), len(self.blob), st.st_mtime_ns, st.st_size)
+        path = sidecar_path(srt_path)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                for column, dtype in [
+                    (header, _HEADER),
+                    (self.start_ms, "<i4"),
+                    (self.end_ms, "<i4"),
+                    (self.offsets, "<i4"),
+                    (self.blob, "u1"),
+                ]:
+                    f.write(np.ascontiguousarray(column, dtype=dtype).tobytes())
+            os.replace(tmp_path, path)
+            return True
+        except OSError:
+            return False
+
+    @classmethod
+    def load_sidecar(cls, srt_path):
+        """Memory-map the sidecar of ``srt_path``; None if missing or out of date."""
+        path = sidecar_path(srt_path)
+        try:
+            st = os.stat(srt_path)
+            data = np.memmap(path, dtype=np.uint8, mode="r")
+        except (OSError, ValueError):
+            return None
+        if len(data) < _HEADER.itemsize:
+            return None
+        header = data[: _HEADER.itemsize].view(_HEADER)[0]
+        if (
+            header["magic"] != _SIDECAR_MAGIC
+            or header["srt_mtime_ns"] != st.st_mtime_ns
+            or header["srt_size"] != st.st_size
+        ):
+            return None
+        count, blob_bytes = int(header["count"]), int(header["blob_bytes"])
+        columns = []
+        offset = _HEADER.itemsize
+        for length, dtype in [(count, "<i4"), (count, "<i4"), (count + 1, "<i4")]:
+            columns.append(data[offset : offset + 4 * length].view(dtype))
+            offset += 4 * length
+        blob = data[offset : offset + blob_bytes]
+        if len(blob) != blob_bytes:
+            return None
+        return cls(*columns, blob)
+
+    @classmethod
+    def open(cls, srt_path):
+        """The subtitles of ``srt_path``: from its sidecar when that is current,
+        otherwise parsed from the SRT (and the sidecar rewritten)."""
+        track = cls.load_sidecar(srt_path)
+        if track is None:
+            with open(srt_path, "rb") as f:
+                track = cls.from_rows(parse_srt(f.read().decode("utf-8")))
+            track.save_sidecar(srt_path)
+        return track
+
+
+class SubtitleIndex:
+    """Start/end times (ms) of the loaded subtitles, sorted for O(log n) lookups.
+
+    NumPy builds the sorted columns once; per-tick lookups bisect plain lists,
+    which is cheaper than a ``np.searchsorted`` call for a single value.
+    Positions returned are indices into the subtitle list the index was built
+    from, even if that list was not in time order.
+    """
+
+    def __init__(self, starts, ends):
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        self.order = np.argsort(starts, kind="stable")
+        self.starts = starts[self.order]
+        self.ends = ends[self.order]
+        # Running max of ends: if it is <= t, no subtitle up to here is still on
+        max_end = np.maximum.accumulate(self.ends) if len(ends) else self.ends
+        self._starts = self.starts.tolist()
+        self._ends = self.ends.tolist()
+        self._max_end = max_end.tolist()
+        self._order = self.order.tolist()
+        self._sorted_ends = np.sort(ends).tolist()
+
+    @classmethod
+    def from_track(cls, track):
+        return cls(track.start_ms, track.end_ms)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def active_at(self, ms):
+        """Index of the subtitle showing at ``ms`` (start <= ms < end), or -1.
+
+        With overlapping subtitles the latest-starting one wins.
+        """
+        i = bisect_right(self._starts, ms) - 1
+        if i < 0 or self._max_end[i] <= ms:
+            return -1
+        while self._ends[i] <= ms:
+            i -= 1  # Only reached when subtitles overlap
+        return self._order[i]
+
+    def next_boundary(self, ms):
+        """Earliest subtitle start or end strictly after ``ms``, or None."""
+        candidates = []
+        i = bisect_right(self._starts, ms)
+        if i < len(self._starts):
+            candidates.append(self._starts[i])
+        j = bisect_right(self._sorted_ends, ms)
+        if j < len(self._sorted_ends):
+            candidates.append(self._sorted_ends[j])
+        return min(candidates) if candidates else None
+
+    def first_ending_after(self, ms):
+        """Index of the first subtitle (in time order) still running or upcoming
+        at ``ms``; the last subtitle if all have ended, -1 if there are none."""
+        if not self._starts:
+            return -1
+        i = min(bisect_right(self._max_end, ms), len(self._starts) - 1)
+        return self._order[i]
@@ -0,0 +1,167 @@
+"""Per-project archive of the learner's recordings.
+
+All takes of a project are appended to one container, ``recordings/takes.bin``,
+instead of being written as loose WAV files. Each chunk is a small header, the
+take's JSON metadata and its audio: downsampled to 16 kHz (plenty for speech),
+mu-law encoded to 8 bits and zlib-compressed, about a tenth of the size of a
+44.1 kHz int16 WAV. ``recordings/takes.json`` indexes the chunks by byte
+offset, so a single take can be read without touching the others. If the index
+is lost or out of date, it is rebuilt by walking the chunk headers.
+"""
+
+import json
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from audio_analysis import resample
+
+ARCHIVE_DIR = "recordings"
+CONTAINER_FILE = "takes.bin"
+INDEX_FILE = "takes.json"
+ARCHIVE_RATE = 16000
+MU = 255
+
+# magic, metadata length, payload length
+_CHUNK_HEADER = struct.Struct("<4sII")
+_CHUNK_MAGIC = b"TAKE"
+
+
+def mulaw_encode(samples):
+    """int16 samples -> uint8 mu-law codes."""
+    x = samples.astype(np.float32) / 32768.0
+    y = np.sign(x) * np.log1p(MU * np.abs(x)) / np.log1p(MU)
+    return np.round((y + 1) * 127.5).astype(np.uint8)
+
+
+def mulaw_decode(codes):
+    """uint8 mu-law codes -> int16 samples."""
+    y = codes.astype(np.float32) / 127.5 - 1
+    x = np.sign(y) * np.expm1(np.abs(y) * np.log1p(MU)) / MU
+    return np.clip(x * 32768.0, -32768, 32767).astype(np.int16)
+
+
+class TakeArchive:
+    """The takes of one project, in recording order.
+
+    Each take's metadata holds at least ``id``, ``created``, ``sample_count`` (at
+    ``ARCHIVE_RATE``), and the subtitle it belongs to as ``start_ms``/``end_ms``
+    /``text``, so takes can be matched to subtitles again after a re-split.
+    Chunk ``offset``/``length`` are added by the archive.
+
+    With ``repair=False`` loading never writes: a stale index is rebuilt in
+    memory only, and a torn last chunk is left for ``repair`` to cut off once
+    the archive is actually used.
+    """
+
+    def __init__(self, project_folder, repair=True):
+        self.folder = os.path.join(project_folder, ARCHIVE_DIR)
+        self.container_path = os.path.join(self.folder, CONTAINER_FILE)
+        self.index_path = os.path.join(self.folder, INDEX_FILE)
+        self.takes = []
+        self.stale = False
+        self.load(repair)
+
+    def load(self, repair=True):
+        size = self.size_bytes()
+        index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, encoding="utf-8") as f:
+                    index = json.load(f)
+            except ValueError:
+                index = {}
+        if index.get("container_size") == size:
+            self.takes = index.get("takes", [])
+            self.stale = False
+        else:
+            self.takes = self._scan(size)
+            self.stale = bool(self.takes or size)
+            if repair:
+                self.repair()
+
+    def repair(self):
+        """After a load that found the index out of date: cut off a truncated
+        last chunk (e.g. the app died mid-write) and save the rebuilt index."""
+        if not self.stale:
+            return
+        end = self.takes[-1]["offset"] + self.takes[-1]["length"] if self.takes else 0
+        if self.size_bytes() > end:
+            with open(self.container_path, "r+b") as f:
+                f.truncate(end)
+        self.save_index()
+        self.stale = False
+
+    def _scan(self, size):
+        """Rebuild the index from the chunk headers, up to the last whole chunk."""
+        takes = []
+        if not size:
+            return takes
+        with open(self.container_path, "rb") as f:
+            offset = 0
+            while offset + _CHUNK_HEADER.size <= size:
+                f.seek(offset)
+                magic, meta_len, payload_len = _CHUNK_HEADER.unpack(f.read(_CHUNK_HEADER.size))
+                length = _CHUNK_HEADER.size + meta_len + payload_len
+                if magic != _CHUNK_MAGIC or offset + length > size:
+                    break
+                meta = json.loads(f.read(meta_len).decode("utf-8"))
+                meta.update(offset=offset, length=length)
+                takes.append(meta)
+                offset += length
+        return takes
+
+    def save_index(self):
+        size = self.size_bytes()
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"container_size": size, "takes": self.takes}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def append(self, samples, samplerate, **meta):
+        """Compress and append a take; returns its metadata."""
+        self.repair()  # Never write after a torn chunk
+        audio = resample(samples, samplerate, ARCHIVE_RATE)
+        payload = zlib.compress(mulaw_encode(audio).tobytes(), 6)
+        meta = dict(
+            meta,
+            id=(self.takes[-1]["id"] + 1) if self.takes else 1,
+            created=time.time(),
+            sample_count=len(audio),
+        )
+        meta_bytes = json.dumps(meta).encode("utf-8")
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self.container_path, "ab") as f:
+            offset = f.tell()
+            f.write(_CHUNK_HEADER.pack(_CHUNK_MAGIC, len(meta_bytes), len(payload)))
+            f.write(meta_bytes)
+            f.write(payload)
+        meta.update(offset=offset, length=_CHUNK_HEADER.size + len(meta_bytes) + len(payload))
+        self.takes.append(meta)
+        self.save_index()
+        return meta
+
+    def read(self, take):
+        """Decoded int16 samples of a take, at ``ARCHIVE_RATE``."""
+        with open(self.container_path, "rb") as f:
+            f.seek(take["offset"])
+            chunk = f.read(take["length"])
+        _, meta_len, _ = _CHUNK_HEADER.unpack_from(chunk)
+        payload = chunk[_CHUNK_HEADER.size + meta_len :]
+        return mulaw_decode(np.frombuffer(zlib.decompress(payload), dtype=np.uint8))
+
+    def by_subtitle(self, lookup):
+        """{subtitle row: [takes, oldest first]} using a SubtitleIndex of the
+        current subtitles."""
+        rows = {}
+        for take in self.takes:
+            row = lookup.active_at((take["start_ms"] + take["end_ms"]) // 2)
+            if row >= 0:
+                rows.setdefault(row, []).append(take)
+        return rows
+
+    def size_bytes(self):
+        return os.path.getsize(self.container_path) if os.path.exists(self.container_path) else 0
@@ -0,0 +1,47 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import get_video_and_srt as backend  # noqa: E402
+import job_queue  # noqa: E402
+from job_queue import CANCELLED, DOWNLOADING, QUEUED, JobQueue, default_queue_path  # noqa: E402
+
+
+def make_queue(tmp_path, count):
+    queue = JobQueue(default_queue_path(str(tmp_path)))
+    for index in range(count):
+        queue.add(f"https://example.com/{index + 1}")
+    return queue
+
+
+def no_run(*args, **kwargs):
+    raise AssertionError("the queue must not run")
+
+
+def test_queue_command_moves_and_cancels_without_running(tmp_path, monkeypatch):
+    make_queue(tmp_path, 3)
+    monkeypatch.setattr(job_queue, "run_queue", no_run)
+
+    backend.main(["queue", "--output_folder", str(tmp_path), "--move", "3", "-2"])
+    backend.main(["queue", "--output_folder", str(tmp_path), "--cancel", "1", "5"])
+
+    queue = JobQueue(default_queue_path(str(tmp_path)))
+    assert [job["id"] for job in queue.jobs] == [3, 1, 2]
+    assert [job["state"] for job in queue.jobs] == [QUEUED, CANCELLED, QUEUED]
+
+
+def test_cancel_from_another_instance_is_seen(tmp_path):
+    gui = make_queue(tmp_path, 2)
+    first = gui.claim_next()
+    cli = JobQueue(gui.path)
+
+    assert cli.cancel(first["id"]) == DOWNLOADING
+    assert cli.cancel(2) == QUEUED
+
+    # The running job's worker reports progress: it stays cancelled, so
+    # the runner knows to stop it, and nothing is left to claim.
+    job = gui.apply_event(first["id"], {"type": "progress", "stage": "transcribe"})
+    assert job is first
+    assert first["state"] == CANCELLED
+    assert gui.claim_next() is None
@@ -0,0 +1,37 @@
+import os
+import sys
+import types
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import get_video_and_srt as backend  # noqa: E402
+
+
+class FakeModel:
+    def parameters(self):
+        return []
+
+    def buffers(self):
+        return []
+
+    def transcribe(self, audio, **options):
+        return {"segments": [{"start": 0.0, "end": 0.5, "words": [{"start": 0.0, "end": 0.5, "word": "w"}]}]}
+
+
+def test_one_pool_lookup_per_windowed_run(monkeypatch):
+    fake_whisper = types.SimpleNamespace(load_model=lambda *args, **kwargs: FakeModel())
+    monkeypatch.setitem(sys.modules, "whisper", fake_whisper)
+    monkeypatch.setattr(backend.ModelPool, "default_device", staticmethod(lambda: "cpu"))
+    pool = backend.ModelPool()
+    monkeypatch.setattr(backend, "MODEL_POOL", pool)
+
+    audio = np.zeros(backend.SAMPLE_RATE * 700, dtype=np.float32)
+    assert len(backend.plan_windows(len(audio), first_window_seconds=backend.FIRST_WINDOW_SECONDS)) == 3
+    for _ in range(2):
+        windows = list(backend.iter_transcribed_windows("base", audio, log=lambda message: None))
+        assert len(windows) == 3
+
+    # The second run reuses the first run's model; windows don't count as hits
+    assert (pool.loads, pool.hits) == (1, 1)
@@ -0,0 +1,28 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from get_video_and_srt import ProgressReporter  # noqa: E402
+
+
+def test_unknown_total_is_throttled():
+    events = []
+    progress = ProgressReporter(events.append, min_interval=60)
+    for processed in range(1000):
+        progress("download", processed, 0, "B")
+    assert len(events) == 1
+
+
+def test_stage_change_and_completion_bypass_throttle():
+    events = []
+    progress = ProgressReporter(events.append, min_interval=60)
+    progress("download", 0, 100, "B")
+    progress("download", 50, 100, "B")
+    progress("download", 100, 100, "B")
+    progress("audio")
+    assert [(e.stage, e.processed) for e in events] == [
+        ("download", 0),
+        ("download", 100),
+        ("audio", 0),
+    ]
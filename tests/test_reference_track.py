@@ -0,0 +1,47 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_analysis import FRAMES_PER_SECOND, ReferenceTrack  # noqa: E402
+from intonation import ReferencePitch  # noqa: E402
+from pronunciation import ReferenceFeatures  # noqa: E402
+
+
+def tone(seconds, hz=150.0, rate=16000):
+    t = np.arange(int(seconds * rate)) / rate
+    return (8000 * np.sin(2 * np.pi * hz * t)).astype(np.int16)
+
+
+def test_missing_reference_loads_as_none(tmp_path):
+    assert ReferenceFeatures.load(str(tmp_path)) is None
+    assert ReferencePitch.load(str(tmp_path)) is None
+
+
+def test_references_share_the_cache_layout(tmp_path):
+    folder = str(tmp_path)
+    samples = tone(3)
+    features = ReferenceFeatures.build(folder, samples)
+    pitch = ReferencePitch.build(folder, samples)
+    assert sorted(os.listdir(folder)) == ["reference_mfcc.npy", "reference_pitch.npy"]
+    assert isinstance(features.frames, np.memmap)
+    assert isinstance(pitch.frames, np.memmap)
+
+    # Both are sliced by time on the same 10 ms grid
+    assert len(features.span(1000, 1500)) == FRAMES_PER_SECOND // 2
+    contour = pitch.span(1000, 1500)
+    assert len(contour) == FRAMES_PER_SECOND // 2
+    # A 150 Hz tone is about 19.6 semitones above the 50 Hz code base
+    assert np.allclose(contour, 19.5, atol=0.5)
+
+
+def test_subclass_only_names_file_and_compute(tmp_path):
+    class Levels(ReferenceTrack):
+        FILE = "reference_levels.npy"
+        compute = staticmethod(lambda samples: np.abs(samples[::160]).astype(np.int16))
+
+    track = Levels.build(str(tmp_path), tone(1))
+    assert Levels.load(str(tmp_path)).frames.shape == (100,)
+    assert len(track.span(0, 250)) == 25
@@ -0,0 +1,56 @@
+import os
+import sys
+
+import yt_dlp
+from yt_dlp.extractor.common import InfoExtractor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from get_video_and_srt import INFO_CACHE_TTL, resolve_info  # noqa: E402
+
+
+class LocalIE(InfoExtractor):
+    """Stand-in for YouTube: ``local://<id>`` URLs, extracted without any network."""
+
+    IE_NAME = "local"
+    _VALID_URL = r"local://(?P<id>\w+)"
+    calls = 0
+
+    def _real_extract(self, url):
+        LocalIE.calls += 1
+        video_id = self._match_id(url)
+        return {"id": video_id, "title": f"Video {video_id}", "url": "file:///dev/null", "ext": "mp4"}
+
+
+def local_ydl_factory(opts):
+    ydl = yt_dlp.YoutubeDL(opts, auto_init=False)
+    ydl.add_info_extractor(LocalIE())
+    return ydl
+
+
+def test_info_is_extracted_once_per_video(tmp_path, monkeypatch):
+    monkeypatch.setattr(LocalIE, "calls", 0)
+    cache_dir = str(tmp_path)
+    logs = []
+
+    info, info_path = resolve_info("local://abc", cache_dir, local_ydl_factory, logs.append)
+    assert (info["id"], info["title"], LocalIE.calls) == ("abc", "Video abc", 1)
+    assert os.path.basename(info_path) == "Local_abc.info.json"
+    assert not logs
+
+    # Another URL form of the same video is a cache hit: no extractor call
+    info, cached_path = resolve_info("local://abc?t=30", cache_dir, local_ydl_factory, logs.append)
+    assert (info["id"], cached_path, LocalIE.calls) == ("abc", info_path, 1)
+    assert logs == ["📦 Using cached video info (Local_abc)"]
+
+    resolve_info("local://xyz", cache_dir, local_ydl_factory)
+    assert LocalIE.calls == 2
+
+
+def test_expired_info_is_extracted_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(LocalIE, "calls", 0)
+    _, info_path = resolve_info("local://abc", str(tmp_path), local_ydl_factory)
+    old = os.path.getmtime(info_path) - INFO_CACHE_TTL - 1
+    os.utime(info_path, (old, old))
+    resolve_info("local://abc", str(tmp_path), local_ydl_factory)
+    assert LocalIE.calls == 2
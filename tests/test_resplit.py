@@ -0,0 +1,34 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from get_video_and_srt import (  # noqa: E402
+    WORDS_FILE,
+    StageManifest,
+    WordTable,
+    resplit_project,
+)
+
+
+def make_project(tmp_path, count=30):
+    words = WordTable.from_rows(
+        [i * 0.5 for i in range(count)],
+        [i * 0.5 + 0.4 for i in range(count)],
+        [f"word{i}" for i in range(count)],
+    )
+    words.save(str(tmp_path / WORDS_FILE))
+    manifest = StageManifest(str(tmp_path))
+    manifest.mark("transcription", model_size="base", words=count)
+    manifest.mark("splitting", max_words=15)
+    manifest.mark("srt", max_words=15)
+    return str(tmp_path)
+
+
+def test_resplit_records_max_words_in_manifest(tmp_path):
+    folder = make_project(tmp_path)
+    resplit_project(folder, max_words=3)
+    manifest = StageManifest(folder)
+    assert manifest.done("srt", max_words=3)
+    assert not manifest.done("srt", max_words=15)
+    assert manifest.done("transcription", model_size="base")
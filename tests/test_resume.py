@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import get_video_and_srt as backend  # noqa: E402
+
+WINDOWS = 3
+
+
+def fake_windows(model_size, audio, workers, log, progress, start_window):
+    fake_windows.started_at = start_window
+    for index in range(start_window, WINDOWS):
+        yield [{"words": [{"start": index * 10.0, "end": index * 10.0 + 0.5, "word": f"w{index}."}]}]
+
+
+def run_with_checkpoints(tmp_path, monkeypatch, prepare_checkpoints):
+    output = str(tmp_path)
+    info_dir = os.path.join(output, ".cache", "info")
+    os.makedirs(info_dir)
+    with open(os.path.join(info_dir, "key.info.json"), "w") as f:
+        json.dump({"id": "vid", "title": "Video", "duration": 30}, f)
+    folder = os.path.join(output, "Video")
+    os.makedirs(os.path.join(folder, backend.CHECKPOINT_DIR))
+    with open(os.path.join(folder, "video.mp4"), "wb") as f:
+        f.write(b"video")
+    audio = np.zeros(16000, dtype=np.float32)
+    manifest = backend.StageManifest(folder)
+    manifest.mark("info", video_id="vid", url="url")
+    manifest.mark("video", size=5, rate=1)
+    manifest.mark(
+        "transcription",
+        done=False,
+        model_size="base",
+        samples=len(audio),
+        windows=WINDOWS,
+        windows_done=2,
+    )
+    prepare_checkpoints(folder)
+
+    monkeypatch.setattr(backend, "video_cache_key", lambda url, ydl: "key")
+    monkeypatch.setattr(
+        backend, "ingest_audio", lambda *args: (audio, None, {"bytes_saved_est": 0, "seconds_saved_est": 0})
+    )
+    monkeypatch.setattr(backend, "plan_windows", lambda *args, **kwargs: [(0, 0, 0, 0)] * WINDOWS)
+    monkeypatch.setattr(backend, "iter_transcribed_windows", fake_windows)
+    logs = []
+    result = backend.run_transcription(
+        "url", "base", output, log_callback=logs.append, stream=True, transcript_cache_mb=0
+    )
+    with open(os.path.join(folder, "subtitle.srt"), encoding="utf-8") as f:
+        return result, f.read(), logs
+
+
+def test_missing_checkpoint_is_redone(tmp_path, monkeypatch):
+    def only_first(folder):
+        table = backend.WordTable.from_rows([0.0], [0.5], ["w0."])
+        table.save(backend.window_checkpoint_path(folder, 0))
+
+    result, srt, logs = run_with_checkpoints(tmp_path, monkeypatch, only_first)
+    assert result
+    assert fake_windows.started_at == 1
+    assert all(f"w{i}." in srt for i in range(WINDOWS))
+    assert any("Checkpoint of window 2" in line for line in logs)
+
+
+def test_truncated_checkpoint_is_redone(tmp_path, monkeypatch):
+    def truncated(folder):
+        with open(backend.window_checkpoint_path(folder, 0), "wb") as f:
+            f.write(b"PK\x03\x04")
+
+    result, srt, logs = run_with_checkpoints(tmp_path, monkeypatch, truncated)
+    assert result
+    assert fake_windows.started_at == 0
+    assert all(f"w{i}." in srt for i in range(WINDOWS))
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from take_archive import ARCHIVE_RATE, TakeArchive  # noqa: E402
+
+
+def torn_archive(tmp_path):
+    """An archive with two takes and half of a third, as if the app died mid-write."""
+    archive = TakeArchive(str(tmp_path))
+    for i in range(3):
+        archive.append(np.full(1600, 1000 * i, dtype=np.int16), ARCHIVE_RATE, start_ms=i, end_ms=i + 1)
+    whole = archive.takes[1]["offset"] + archive.takes[1]["length"]
+    with open(archive.container_path, "r+b") as f:
+        f.truncate(whole + 10)
+    return archive, whole
+
+
+def test_read_only_load_leaves_files_alone(tmp_path):
+    archive, whole = torn_archive(tmp_path)
+    with open(archive.index_path, "rb") as f:
+        index = f.read()
+
+    preview = TakeArchive(str(tmp_path), repair=False)
+    assert [take["id"] for take in preview.takes] == [1, 2]
+    assert preview.size_bytes() == whole + 10
+    with open(archive.index_path, "rb") as f:
+        assert f.read() == index
+
+    preview.repair()
+    assert preview.size_bytes() == whole
+    assert [take["id"] for take in TakeArchive(str(tmp_path)).takes] == [1, 2]
+
+
+def test_append_repairs_first(tmp_path):
+    _, whole = torn_archive(tmp_path)
+    archive = TakeArchive(str(tmp_path), repair=False)
+    take = archive.append(np.full(800, 7, dtype=np.int16), ARCHIVE_RATE, start_ms=5, end_ms=6)
+    assert take["offset"] == whole
+    reloaded = TakeArchive(str(tmp_path))
+    assert [t["id"] for t in reloaded.takes] == [1, 2, 3]
+    assert (reloaded.read(reloaded.takes[-1]) == archive.read(take)).all()
+
+
+def test_default_load_still_repairs(tmp_path):
+    _, whole = torn_archive(tmp_path)
+    assert TakeArchive(str(tmp_path)).size_bytes() == whole
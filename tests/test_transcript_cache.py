@@ -0,0 +1,67 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import get_video_and_srt as backend  # noqa: E402
+from get_video_and_srt import TranscriptCache, WordTable  # noqa: E402
+
+
+def make_words(count=200):
+    return WordTable.from_rows(
+        [i * 0.5 for i in range(count)],
+        [i * 0.5 + 0.4 for i in range(count)],
+        [f"word{i}" for i in range(count)],
+    )
+
+
+def test_two_caches_share_counters(tmp_path):
+    folder = str(tmp_path)
+    first = TranscriptCache(folder, budget_mb=1)
+    second = TranscriptCache(folder, budget_mb=1)
+
+    first.put("a", make_words())
+    assert len(second.get("a")) == 200
+    assert first.get("b") is None
+    assert second.get("b") is None
+
+    # Neither job's updates overwrite the other's
+    assert TranscriptCache(folder).counters == {"hits": 1, "misses": 2, "evictions": 0}
+    assert sorted(os.listdir(folder)) == ["a.npz", "stats.json"]
+
+
+def test_unreadable_stats_start_from_zero(tmp_path):
+    # What a reader could see while another job was still writing the file
+    (tmp_path / "stats.json").write_text('{"hits": 4, "mis')
+    cache = TranscriptCache(str(tmp_path), budget_mb=1)
+    assert cache.counters == {"hits": 0, "misses": 0, "evictions": 0}
+    assert cache.get("a") is None
+    assert TranscriptCache(str(tmp_path)).counters["misses"] == 1
+
+
+def test_entry_evicted_by_another_cache(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    first = TranscriptCache(folder, budget_mb=1)
+    second = TranscriptCache(folder, budget_mb=1)
+    first.put("a", make_words())
+
+    # get: the entry disappears between loading it and refreshing its mtime
+    load = WordTable.load
+
+    def load_then_evict(path):
+        words = load(path)
+        os.remove(path)
+        return words
+
+    monkeypatch.setattr(backend.WordTable, "load", load_then_evict)
+    assert len(second.get("a")) == 200
+    monkeypatch.setattr(backend.WordTable, "load", load)
+
+    # _evict: the other job already removed an entry this one listed
+    first.put("a", make_words())
+    stale = first._entries()
+    os.remove(stale[0][2])
+    second.budget_bytes = 0
+    monkeypatch.setattr(second, "_entries", lambda: stale)
+    second._evict()
+    assert TranscriptCache(folder).counters["evictions"] == 0
@@ -0,0 +1,71 @@
+import os
+import sys
+import types
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import get_video_and_srt as backend  # noqa: E402
+
+SEGMENT_FRAMES = 3000  # whisper.audio.N_FRAMES: Whisper decodes 30 s at a time
+
+
+class FakeModel:
+    """Advances ``whisper.transcribe``'s tqdm bar the way the real loop does."""
+
+    def parameters(self):
+        return []
+
+    def buffers(self):
+        return []
+
+    def transcribe(self, audio, **options):
+        content_frames = len(audio) // 160
+        seek = 0
+        with sys.modules["whisper.transcribe"].tqdm.tqdm(total=content_frames) as pbar:
+            while seek < content_frames:
+                previous_seek = seek
+                seek += SEGMENT_FRAMES
+                pbar.update(min(content_frames, seek) - previous_seek)
+        return {"segments": []}
+
+
+def install_fake_whisper(monkeypatch):
+    transcribe_module = types.ModuleType("whisper.transcribe")
+    transcribe_module.tqdm = None  # replaced by whisper_progress
+    fake_whisper = types.ModuleType("whisper")
+    fake_whisper.load_model = lambda *args, **kwargs: FakeModel()
+    fake_whisper.transcribe = transcribe_module
+    monkeypatch.setitem(sys.modules, "whisper", fake_whisper)
+    monkeypatch.setitem(sys.modules, "whisper.transcribe", transcribe_module)
+    monkeypatch.setattr(backend.ModelPool, "default_device", staticmethod(lambda: "cpu"))
+    monkeypatch.setattr(backend, "MODEL_POOL", backend.ModelPool())
+
+
+def test_progress_within_a_window(monkeypatch):
+    install_fake_whisper(monkeypatch)
+    audio = np.zeros(backend.SAMPLE_RATE * 700, dtype=np.float32)
+    events = []
+
+    def progress(stage, processed=0, total=0):
+        if stage == "transcribe":
+            events.append((processed, total))
+
+    list(backend.iter_transcribed_windows("base", audio, log=lambda m: None, progress=progress))
+
+    processed = [p for p, _ in events]
+    assert processed == sorted(processed)
+    assert events[-1] == (700, 700)
+    # 3 windows (30 s, 600 s, the rest): far more than one event per window
+    assert len(events) > 20
+    assert any(100 < p < 600 for p in processed)
+
+
+def test_progress_outside_the_block_is_not_reported(monkeypatch):
+    install_fake_whisper(monkeypatch)
+    seen = []
+    with backend.whisper_progress(seen.append):
+        FakeModel().transcribe(np.zeros(backend.SAMPLE_RATE * 60))
+    FakeModel().transcribe(np.zeros(backend.SAMPLE_RATE * 60))
+    assert seen == [30, 60]